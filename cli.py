@@ -7,40 +7,111 @@ a text file, accepting method parameters from the user.
 import argparse
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-import numpy as np
+from src.client import default_socket_path, request, server_available
+from src.defaults import (
+    CI_METHODS,
+    DEFAULT_N_RESAMPLES,
+    DEFAULT_N_STABILITY_RESAMPLES,
+    DEFAULT_STABILITY_MAX_EXCEEDANCES,
+    DEFAULT_SUBSAMPLE_FRACTION,
+    EXECUTOR_BACKENDS,
+    GAMMA_DEFAULT,
+    KPSS_REGRESSIONS,
+    MOS_AUTO,
+    MOS_DEFAULT,
+    RESAMPLING_METHODS,
+)
 
-from src.tailid import MOS_DEFAULT, tail_id
-from src.threshold_selection import select_threshold
+if TYPE_CHECKING:
+    from src.ingest import Predicate
+    from src.kpss import KPSSResult
+    from src.synthetic import GPDComponent
 
+# Exit code of runs the time budget stopped early: their outcome is partial
+# and carries no scenario verdict.
+EXIT_PARTIAL = 3
 
-def load_data_from_file(file_path: str) -> np.ndarray:
-    """Load numerical data from a text file.
+# Modules depending on NumPy and SciPy are imported inside the functions
+# that use them, so that forwarding a run to the analysis daemon does not
+# pay for importing them.
 
-    The file should contain one numerical value per line.
 
-    Args:
-        file_path: Path to the text file containing the data.
+def _parse_mos(text: str) -> Union[int, str]:
+    """Parse a MoS threshold: a non-negative integer or ``auto``."""
+    if text == MOS_AUTO:
+        return text
+    try:
+        mos = int(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"expected an integer or {MOS_AUTO!r}, got {text!r}"
+        ) from e
+    if mos < 0:
+        raise argparse.ArgumentTypeError("MoS must be non-negative")
+    return mos
 
-    Returns:
-        NumPy array of floating-point values.
 
-    Raises:
-        FileNotFoundError: If the file does not exist.
-        ValueError: If the file contains invalid data.
+def _add_analysis_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the data file and TailID parameter arguments to a parser.
+
+    Args:
+        parser: Parser to extend.
     """
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Data file not found: {file_path}")
+    parser.add_argument(
+        "data_file",
+        type=str,
+        help="Path to the text file containing sample data",
+    )
 
-    try:
-        data = np.loadtxt(file_path, dtype=np.float64)
-        if data.ndim == 0:
-            data = np.array([float(data)])
-        return data
-    except ValueError as e:
-        raise ValueError(f"Invalid data in file {file_path}: {e}") from e
+    parser.add_argument(
+        "--p_c1",
+        type=float,
+        required=True,
+        help=(
+            "Candidate percentile (0 < p_c1 < 1). "
+            "Defines the starting point for the candidate set."
+        ),
+    )
+
+    parser.add_argument(
+        "--n_candidates",
+        type=int,
+        required=True,
+        help="Number of candidate thresholds to evaluate for p_m selection",
+    )
+
+    parser.add_argument(
+        "--gamma",
+        type=float,
+        default=GAMMA_DEFAULT,
+        help=(
+            f"Confidence level (0 < gamma < 1). "
+            f"Controls detection sensitivity (default: {GAMMA_DEFAULT})"
+        ),
+    )
+
+    parser.add_argument(
+        "--mos",
+        type=_parse_mos,
+        default=MOS_DEFAULT,
+        help=(
+            f"Minimum of Samples threshold for scenario classification, "
+            f"or '{MOS_AUTO}' to estimate it by simulation from the fitted "
+            f"tail (default: {MOS_DEFAULT})"
+        ),
+    )
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -60,6 +131,22 @@ def create_parser() -> argparse.ArgumentParser:
 Examples:
   python cli.py data.txt --p_c1 0.95 --n_candidates 31
   python cli.py data.txt --p_c1 0.95 --n_candidates 51 --gamma 0.999
+  python cli.py generate trace.npy --n 1000000 --tail 10,2,0.1,0.01
+
+Subcommands:
+  generate    Write a synthetic mixture trace (see generate --help)
+  trace       Summarize an NDJSON fit trace written with --trace
+  window      Run TailID over sliding or tumbling windows of a trace
+  components  Detect the mixture components of a tail level by level
+  groups      Run TailID per task of a multi-column CSV/TSV log
+  stability   Report how stable the scenario is over resamples of a trace
+  serve       Run an analysis daemon that later runs are forwarded to
+  submit      Split a campaign manifest into a shared job queue
+  worker      Run jobs from a campaign queue
+  merge       Merge the results of a campaign queue into one report
+
+  To analyse a data file named like a subcommand, write it as ./NAME or
+  start the arguments with --, e.g. python cli.py -- trace --p_c1 0.95 ...
 
 Data file format:
   The input file should contain one numerical value per line.
@@ -68,117 +155,1551 @@ Data file format:
     4.56
     7.89
     ...
+  Files with a .npy suffix are loaded as 1-D NumPy arrays.
 """,
     )
 
+    _add_analysis_arguments(parser)
+
+    parser.add_argument(
+        "--ci-method",
+        choices=CI_METHODS,
+        default="asymptotic",
+        help=(
+            "How EVI confidence intervals are computed "
+            "(default: asymptotic)"
+        ),
+    )
+
     parser.add_argument(
-        "data_file",
+        "--n-resamples",
+        type=int,
+        default=DEFAULT_N_RESAMPLES,
+        help=(
+            f"Bootstrap resamples per confidence interval "
+            f"(default: {DEFAULT_N_RESAMPLES})"
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Workers for threshold selection, bootstrap resampling "
+            "(confidence intervals and pWCET bands) and MoS simulation; "
+            "1 runs inline (default: 1)"
+        ),
+    )
+
+    parser.add_argument(
+        "--executor",
+        choices=EXECUTOR_BACKENDS,
+        default="auto",
+        help=(
+            "Worker pool backend: threads share the data without copies, "
+            "processes run Python code in parallel; auto picks threads for "
+            "large traces and free-threaded Python (default: auto)"
+        ),
+    )
+
+    parser.add_argument(
+        "--eqmae-subsample",
+        type=int,
+        metavar="N",
+        help=(
+            "Approximate the EQMAE of candidate thresholds with more than N "
+            "exceedances on N thinned order statistics (default: exact)"
+        ),
+    )
+
+    parser.add_argument(
+        "--eqmae-recheck",
+        type=int,
+        default=0,
+        metavar="K",
+        help=(
+            "With --eqmae-subsample, score the K best candidates again "
+            "exactly (default: 0)"
+        ),
+    )
+
+    parser.add_argument(
+        "--kpss",
+        nargs="?",
+        const="c",
+        choices=KPSS_REGRESSIONS,
+        metavar="REGRESSION",
+        help=(
+            "Also run the KPSS stationarity test on the data, around a "
+            "level (c, the default) or a linear trend (ct), and report the "
+            "combined verdict"
+        ),
+    )
+
+    parser.add_argument(
+        "--pwcet",
         type=str,
-        help="Path to the text file containing sample data",
+        metavar="PATH",
+        help=(
+            "Write the pWCET curve at exceedance probabilities 1e-3 to "
+            "1e-15 to PATH as a .npz array file (Scenarios 1 and 2)"
+        ),
     )
 
     parser.add_argument(
-        "--p_c1",
+        "--pwcet-confidence",
         type=float,
-        required=True,
+        metavar="LEVEL",
         help=(
-            "Candidate percentile (0 < p_c1 < 1). "
-            "Defines the starting point for the candidate set."
+            "Also compute bootstrap confidence bands of the pWCET curve at "
+            "this level, using --n-resamples and --workers (requires "
+            "--pwcet)"
         ),
     )
 
     parser.add_argument(
-        "--n_candidates",
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "Stop the analysis after SECONDS and report the partial result: "
+            "the best p_m scored so far and the sensitive points among the "
+            "candidates processed so far. Partial runs exit with status "
+            f"{EXIT_PARTIAL}"
+        ),
+    )
+
+    parser.add_argument(
+        "--artifact",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Write the analysis (sorted tail, EQMAE curve, EVI/CI sequence "
+            "and result) to PATH as a memory-mappable artifact"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Collect per-stage timings and fit counters and print a "
+            "breakdown after the result"
+        ),
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Analysis daemon socket to forward the run to when a daemon "
+            "is running (default: $TAILID_SOCKET or a per-user temp path)"
+        ),
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always run the analysis in this process",
+    )
+
+    parser.add_argument(
+        "--trace",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Write one NDJSON record per GPD fit to PATH and print a "
+            "summary of the slowest fits"
+        ),
+    )
+
+    return parser
+
+
+def _parse_bulk_param(text: str) -> Tuple[str, float]:
+    """Parse a ``name=value`` bulk distribution parameter."""
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=VALUE, got {text!r}"
+        )
+    try:
+        return name, float(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _parse_tail_component(text: str) -> "GPDComponent":
+    """Parse a ``loc,scale,shape,weight`` tail component specification."""
+    from src.synthetic import GPDComponent
+
+    try:
+        loc, scale, shape, weight = (float(v) for v in text.split(","))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"expected LOC,SCALE,SHAPE,WEIGHT, got {text!r}"
+        ) from e
+    return GPDComponent(loc=loc, scale=scale, shape=shape, weight=weight)
+
+
+def create_generate_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``generate`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    from src.synthetic import BULK_FAMILIES, DEFAULT_CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(
+        prog="tailid generate",
+        description=(
+            "Generate a synthetic bulk plus GPD tail mixture trace and "
+            "write it to a .npy or raw binary file."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cli.py generate trace.npy --n 100000000 --seed 1 \\
+      --bulk normal --bulk-param loc=1000 --bulk-param scale=20 \\
+      --tail 1100,15,-0.2,0.001 --dtype uint32
+""",
+    )
+
+    parser.add_argument(
+        "output_file",
+        type=str,
+        help="Output path (.npy for NumPy format, anything else for raw)",
+    )
+
+    parser.add_argument(
+        "--n",
         type=int,
         required=True,
-        help="Number of candidate thresholds to evaluate for p_m selection",
+        help="Number of samples to generate",
     )
 
     parser.add_argument(
-        "--gamma",
-        type=float,
-        default=0.9999,
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the random streams (default: 0)",
+    )
+
+    parser.add_argument(
+        "--bulk",
+        choices=BULK_FAMILIES,
+        default="exponential",
+        help="Bulk distribution family (default: exponential)",
+    )
+
+    parser.add_argument(
+        "--bulk-param",
+        type=_parse_bulk_param,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Bulk distribution parameter, e.g. scale=2.0 (repeatable)",
+    )
+
+    parser.add_argument(
+        "--tail",
+        type=_parse_tail_component,
+        action="append",
+        default=[],
+        metavar="LOC,SCALE,SHAPE,WEIGHT",
+        help="GPD tail mixture component (repeatable)",
+    )
+
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        default="float64",
         help=(
-            "Confidence level (0 < gamma < 1). "
-            "Controls detection sensitivity (default: 0.9999)"
+            "Output dtype; integer dtypes round to whole values "
+            "(default: float64)"
         ),
     )
 
     parser.add_argument(
-        "--mos",
+        "--chunk-size",
         type=int,
-        default=MOS_DEFAULT,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Samples per generated chunk (default: {DEFAULT_CHUNK_SIZE})",
+    )
+
+    return parser
+
+
+def run_generate(args: List[str]) -> int:
+    """Run the ``generate`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from src.synthetic import MixtureSpec, write_mixture
+
+    parsed_args = create_generate_parser().parse_args(args)
+
+    try:
+        spec = MixtureSpec(
+            bulk=parsed_args.bulk,
+            bulk_params=dict(parsed_args.bulk_param),
+            components=tuple(parsed_args.tail),
+            dtype=parsed_args.dtype,
+        )
+        path = write_mixture(
+            parsed_args.output_file,
+            spec,
+            parsed_args.n,
+            seed=parsed_args.seed,
+            chunk_size=parsed_args.chunk_size,
+        )
+        print(f"Wrote {parsed_args.n} samples to {path}")
+        return 0
+
+    except (TypeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def create_trace_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``trace`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid trace",
+        description="Summarize an NDJSON fit trace written with --trace.",
+    )
+
+    parser.add_argument(
+        "trace_file",
+        type=str,
+        help="Path to the NDJSON trace file",
+    )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
         help=(
-            f"Minimum of Samples threshold for scenario classification "
-            f"(default: {MOS_DEFAULT})"
+            "Number of slowest fits to list, and of TailID fits listed at "
+            "each end of the EVI/CI trajectory (default: 10)"
         ),
     )
 
     return parser
 
 
-def main(args: Optional[List[str]] = None) -> int:
-    """Main entry point for the CLI.
+def run_trace(args: List[str]) -> int:
+    """Run the ``trace`` subcommand.
 
     Args:
-        args: Command-line arguments (defaults to sys.argv[1:]).
+        args: Subcommand arguments.
 
     Returns:
         Exit code (0 for success, non-zero for errors).
     """
-    parser = create_parser()
-    parsed_args = parser.parse_args(args)
+    from src.tracing import load_trace, summarize_trace
+
+    parsed_args = create_trace_parser().parse_args(args)
 
     try:
-        data = load_data_from_file(parsed_args.data_file)
-        print(f"Loaded {len(data)} data points from {parsed_args.data_file}")
-        print()
+        records = load_trace(parsed_args.trace_file)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
-        print("Selecting optimal p_m by minimizing EQMAE...")
-        p_m = select_threshold(data, n_candidates=parsed_args.n_candidates)
-        print(f"Selected p_m = {p_m:.4f}")
-        print()
+    print(f"Loaded {len(records)} fit records from {parsed_args.trace_file}")
+    print(summarize_trace(records, top=parsed_args.top).format())
+    return 0
 
-        result = tail_id(
-            x=data,
-            p_m=p_m,
-            p_c1=parsed_args.p_c1,
-            gamma=parsed_args.gamma,
-            mos=parsed_args.mos,
-        )
 
-        print("=" * 60)
-        print("TailID Analysis Result")
-        print("=" * 60)
-        print()
-        print("Parameters:")
-        print(f"  p_m (extreme value percentile): {p_m:.4f} (auto-selected)")
-        print(f"  p_c1 (candidate percentile): {parsed_args.p_c1}")
-        print(f"  n_candidates: {parsed_args.n_candidates}")
-        print(f"  gamma (confidence level): {parsed_args.gamma}")
-        print(f"  MoS (minimum of samples): {parsed_args.mos}")
-        print()
-        print("Results:")
-        print(f"  Number of sensitive points: {len(result.sensitive_points)}")
-        print(f"  Scenario: {result.scenario.name}")
-        if result.tail_threshold is not None:
-            print(f"  Tail threshold: {result.tail_threshold}")
-        print()
-        print("Interpretation:")
-        print(f"  {result.message}")
-        print()
+def create_window_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``window`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid window",
+        description=(
+            "Run threshold selection and TailID over sliding or tumbling "
+            "windows of a time-ordered trace, printing one line per window."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cli.py window trace.npy --window 100000 --step 10000 \\
+      --p_c1 0.99 --n_candidates 31
+""",
+    )
+
+    _add_analysis_arguments(parser)
+
+    parser.add_argument(
+        "--window",
+        type=int,
+        required=True,
+        help="Number of samples per window",
+    )
+
+    parser.add_argument(
+        "--step",
+        type=int,
+        help=(
+            "Samples between window starts; smaller than --window for "
+            "sliding windows (default: --window, i.e. tumbling windows)"
+        ),
+    )
+
+    return parser
+
+
+def run_window(args: List[str]) -> int:
+    """Run the ``window`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from src.data_loading import load_data_from_file
+    from src.windowed import iter_windows
+
+    parsed_args = create_window_parser().parse_args(args)
+    step = (
+        parsed_args.window if parsed_args.step is None else parsed_args.step
+    )
+    if parsed_args.window < 1 or step < 1:
+        print("Error: --window and --step must be positive", file=sys.stderr)
+        return 1
+
+    try:
+        data = load_data_from_file(parsed_args.data_file)
+        print(f"Loaded {len(data)} data points from {parsed_args.data_file}")
+        print(
+            f"{'start':>10} {'stop':>10} {'p_m':>7} {'|S|':>6} "
+            f"{'scenario':<11} tail_threshold"
+        )
+        for w in iter_windows(
+            data,
+            window=parsed_args.window,
+            step=step,
+            p_c1=parsed_args.p_c1,
+            n_candidates=parsed_args.n_candidates,
+            gamma=parsed_args.gamma,
+            mos=parsed_args.mos,
+        ):
+            threshold = w.result.tail_threshold
+            print(
+                f"{w.start:>10} {w.stop:>10} {w.p_m:>7.4f} "
+                f"{len(w.result.sensitive_points):>6} "
+                f"{w.result.scenario.name:<11} "
+                f"{'-' if threshold is None else threshold}",
+                flush=True,
+            )
+        return 0
+
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def create_components_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``components`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid components",
+        description=(
+            "Detect the mixture components of a tail one after the other: "
+            "after each Scenario 2 detection, rerun threshold selection and "
+            "TailID on the samples below the detected tail threshold."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cli.py components trace.npy --p_c1 0.99 --n_candidates 31
+""",
+    )
+
+    _add_analysis_arguments(parser)
+
+    parser.add_argument(
+        "--max-levels",
+        type=int,
+        help="Maximum number of levels to analyse (default: no limit)",
+    )
+
+    return parser
+
+
+def run_components(args: List[str]) -> int:
+    """Run the ``components`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from src.data_loading import load_data_from_file
+    from src.pipeline import detect_components
+
+    parsed_args = create_components_parser().parse_args(args)
+
+    try:
+        data = load_data_from_file(parsed_args.data_file)
+        print(f"Loaded {len(data)} data points from {parsed_args.data_file}")
+        analysis = detect_components(
+            data,
+            p_c1=parsed_args.p_c1,
+            n_candidates=parsed_args.n_candidates,
+            gamma=parsed_args.gamma,
+            mos=parsed_args.mos,
+            max_levels=parsed_args.max_levels,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{'level':>5} {'samples':>10} {'p_m':>7} {'|S|':>6} "
+        f"{'scenario':<11} tail_threshold"
+    )
+    for i, (level, size) in enumerate(
+        zip(analysis.levels, analysis.sizes), 1
+    ):
+        threshold = level.result.tail_threshold
+        print(
+            f"{i:>5} {size:>10} {level.p_m:>7.4f} "
+            f"{len(level.result.sensitive_points):>6} "
+            f"{level.result.scenario.name:<11} "
+            f"{'-' if threshold is None else threshold}"
+        )
+    print()
+    print(f"Components detected: {len(analysis.thresholds)}")
+    upper = float(max(data))
+    for threshold in analysis.thresholds:
+        print(f"  [{threshold}, {upper}]")
+        upper = threshold
+    print()
+    print(analysis.levels[-1].result.message)
+    return 0
+
+
+def _parse_column(text: str) -> Union[int, str]:
+    """Parse a log column: an index if it is a number, else a name."""
+    return int(text) if text.isdigit() else text
+
+
+def _parse_predicate(text: str) -> "Predicate":
+    """Parse a ``COLUMN OP VALUE`` row filter."""
+    from src.ingest import Predicate
+
+    try:
+        predicate = Predicate.parse(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+    if isinstance(predicate.column, str):
+        return Predicate(
+            _parse_column(predicate.column), predicate.op, predicate.value
+        )
+    return predicate
+
+
+def create_groups_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``groups`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid groups",
+        description=(
+            "Read a multi-column CSV/TSV log in one pass, group its values "
+            "by key and run threshold selection and TailID on every group."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cli.py groups log.csv --value cycles --by task --where core==0 \\
+      --dtype uint32 --p_c1 0.99 --n_candidates 31
+""",
+    )
+
+    _add_analysis_arguments(parser)
+
+    parser.add_argument(
+        "--value",
+        type=_parse_column,
+        required=True,
+        metavar="COLUMN",
+        help="Column of the measurements (name, or index with --no-header)",
+    )
+
+    parser.add_argument(
+        "--by",
+        type=_parse_column,
+        action="append",
+        default=[],
+        metavar="COLUMN",
+        help="Column identifying a group; repeat for composite keys",
+    )
+
+    parser.add_argument(
+        "--where",
+        type=_parse_predicate,
+        action="append",
+        default=[],
+        metavar="PREDICATE",
+        help=(
+            "Keep only rows satisfying COLUMN OP VALUE, with OP one of "
+            "==, !=, <, <=, >, >=; repeat to combine (e.g. core==0)"
+        ),
+    )
+
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        default="float64",
+        help="Dtype of the grouped values (default: float64)",
+    )
+
+    parser.add_argument(
+        "--delimiter",
+        type=str,
+        help="Field delimiter (default: tab for .tsv/.tab, comma otherwise)",
+    )
+
+    parser.add_argument(
+        "--no-header",
+        action="store_true",
+        help="The log has no header row; columns are given by index",
+    )
+
+    parser.add_argument(
+        "--min-samples",
+        type=int,
+        default=0,
+        help="Skip groups with fewer samples (default: 0)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Groups analysed concurrently; 1 runs inline (default: 1)",
+    )
+
+    parser.add_argument(
+        "--executor",
+        choices=EXECUTOR_BACKENDS,
+        default="auto",
+        help=(
+            "Worker pool backend; auto picks threads for large groups and "
+            "free-threaded Python, processes otherwise (default: auto)"
+        ),
+    )
+
+    return parser
+
+
+def run_groups(args: List[str]) -> int:
+    """Run the ``groups`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from concurrent.futures import Future
+    from functools import partial
+
+    from src.executors import create_executor
+    from src.ingest import load_groups
+    from src.pipeline import AnalysisResult, run_analysis
+
+    parsed_args = create_groups_parser().parse_args(args)
+
+    try:
+        groups = load_groups(
+            parsed_args.data_file,
+            value_column=parsed_args.value,
+            key_columns=parsed_args.by,
+            where=parsed_args.where,
+            dtype=parsed_args.dtype,
+            delimiter=parsed_args.delimiter,
+            header=not parsed_args.no_header,
+        )
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    n_values = sum(len(values) for values in groups.values())
+    print(
+        f"Loaded {n_values} data points in {len(groups)} groups from "
+        f"{parsed_args.data_file}"
+    )
+    print(
+        f"{'group':<20} {'samples':>10} {'p_m':>7} {'|S|':>6} "
+        f"{'scenario':<11} tail_threshold"
+    )
+    analyse = partial(
+        run_analysis,
+        p_c1=parsed_args.p_c1,
+        n_candidates=parsed_args.n_candidates,
+        gamma=parsed_args.gamma,
+        mos=parsed_args.mos,
+    )
+    largest = max((len(values) for values in groups.values()), default=0)
+    try:
+        executor = create_executor(
+            parsed_args.workers, parsed_args.executor, largest
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    futures: Dict[Tuple[str, ...], "Future[AnalysisResult]"] = {}
+    status = 0
+    try:
+        if executor is not None:
+            for key, values in groups.items():
+                if len(values) >= max(1, parsed_args.min_samples):
+                    futures[key] = executor.submit(analyse, values)
+        for key, values in groups.items():
+            name = "/".join(key) or "(all)"
+            if len(values) < max(1, parsed_args.min_samples):
+                print(f"{name:<20} {len(values):>10} skipped")
+                continue
+            try:
+                if key in futures:
+                    analysis = futures[key].result()
+                else:
+                    analysis = analyse(values)
+            except ValueError as e:
+                print(f"{name:<20} {len(values):>10} error: {e}")
+                status = 1
+                continue
+            threshold = analysis.result.tail_threshold
+            print(
+                f"{name:<20} {len(values):>10} {analysis.p_m:>7.4f} "
+                f"{len(analysis.result.sensitive_points):>6} "
+                f"{analysis.result.scenario.name:<11} "
+                f"{'-' if threshold is None else threshold}",
+                flush=True,
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return status
+
+
+def create_stability_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``stability`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid stability",
+        description=(
+            "Rerun threshold selection and TailID on many resamples of a "
+            "trace and report the distribution of |S|, the tail threshold "
+            "and the scenario frequencies."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cli.py stability trace.npy --p_c1 0.99 --n_candidates 31 \\
+      --resamples 1000 --workers 8
+""",
+    )
+
+    _add_analysis_arguments(parser)
+
+    parser.add_argument(
+        "--resamples",
+        type=int,
+        default=DEFAULT_N_STABILITY_RESAMPLES,
+        help=(
+            f"Number of resamples "
+            f"(default: {DEFAULT_N_STABILITY_RESAMPLES})"
+        ),
+    )
+
+    parser.add_argument(
+        "--method",
+        choices=RESAMPLING_METHODS,
+        default="subsample",
+        help=(
+            "Subsamples without replacement, or a moving block bootstrap "
+            "of the time-ordered trace (default: subsample)"
+        ),
+    )
+
+    parser.add_argument(
+        "--fraction",
+        type=float,
+        default=DEFAULT_SUBSAMPLE_FRACTION,
+        help=(
+            f"Resample size as a fraction of the trace "
+            f"(default: {DEFAULT_SUBSAMPLE_FRACTION})"
+        ),
+    )
+
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        help="Block length for --method block (default: cube root of n)",
+    )
+
+    parser.add_argument(
+        "--eqmae-subsample",
+        type=int,
+        default=DEFAULT_STABILITY_MAX_EXCEEDANCES,
+        metavar="N",
+        help=(
+            "Approximate the EQMAE of candidate thresholds with more than N "
+            "exceedances on N thinned order statistics "
+            f"(default: {DEFAULT_STABILITY_MAX_EXCEEDANCES})"
+        ),
+    )
+
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help=(
+            "Score every candidate exactly and fit every TailID excess set "
+            "from scratch, as a single analysis does (much slower)"
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Workers sharing the trace; 1 runs inline (default: 1)",
+    )
+
+    parser.add_argument(
+        "--executor",
+        choices=EXECUTOR_BACKENDS,
+        default="auto",
+        help=(
+            "Worker pool backend: threads share the data without copies, "
+            "processes run Python code in parallel; auto picks threads for "
+            "large traces and free-threaded Python (default: auto)"
+        ),
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the resampling streams (default: 0)",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="PATH",
+        help="Also write the per-resample outcomes to PATH as a .npz file",
+    )
+
+    return parser
+
+
+def run_stability(args: List[str]) -> int:
+    """Run the ``stability`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from src.data_loading import load_data_from_file
+    from src.stability import stability_report
+
+    parsed_args = create_stability_parser().parse_args(args)
+
+    try:
+        data = load_data_from_file(parsed_args.data_file)
+        print(f"Loaded {len(data)} data points from {parsed_args.data_file}")
+        report = stability_report(
+            data,
+            p_c1=parsed_args.p_c1,
+            n_candidates=parsed_args.n_candidates,
+            gamma=parsed_args.gamma,
+            mos=parsed_args.mos,
+            n_resamples=parsed_args.resamples,
+            method=parsed_args.method,
+            fraction=parsed_args.fraction,
+            block_size=parsed_args.block_size,
+            max_exceedances=(
+                None if parsed_args.exact else parsed_args.eqmae_subsample
+            ),
+            warm_start=not parsed_args.exact,
+            seed=parsed_args.seed,
+            workers=parsed_args.workers,
+            backend=parsed_args.executor,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(report.format())
+    if parsed_args.output is not None:
+        report.save(parsed_args.output)
+        print(f"Outcomes written to {parsed_args.output}")
+    return 0
+
+
+def create_serve_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``serve`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    from src.server import DEFAULT_QUEUE_SIZE, DEFAULT_WORKERS
+
+    parser = argparse.ArgumentParser(
+        prog="tailid serve",
+        description=(
+            "Run a long-lived analysis daemon on a Unix-domain socket. "
+            "Analysis runs of this CLI are forwarded to it while it runs."
+        ),
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        metavar="PATH",
+        help="Socket path (default: $TAILID_SOCKET or a per-user temp path)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Analysis worker threads (default: {DEFAULT_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=(
+            f"Maximum requests waiting for a worker before clients are "
+            f"held back (default: {DEFAULT_QUEUE_SIZE})"
+        ),
+    )
+
+    return parser
+
+
+def run_serve(args: List[str]) -> int:
+    """Run the ``serve`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    import asyncio
+
+    from src.server import TailIDServer
+
+    parsed_args = create_serve_parser().parse_args(args)
+    socket_path = parsed_args.socket or default_socket_path()
+
+    if server_available(socket_path):
+        print(
+            f"Error: a TailID daemon is already running on {socket_path}",
+            file=sys.stderr,
+        )
+        return 1
+
+    try:
+        server = TailIDServer(
+            socket_path,
+            workers=parsed_args.workers,
+            queue_size=parsed_args.queue_size,
+        )
+        print(f"Serving TailID analyses on {socket_path}", flush=True)
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def create_submit_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``submit`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid submit",
+        description=(
+            "Split a campaign manifest (one JSON analysis job per line) into "
+            "a job queue directory on a shared filesystem."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cli.py submit nightly.jsonl /shared/queue
+  python cli.py worker /shared/queue     # on any number of hosts
+  python cli.py merge /shared/queue --output report.jsonl
+""",
+    )
+
+    parser.add_argument("manifest", type=str, help="Campaign manifest")
+    parser.add_argument("queue", type=str, help="Queue directory")
+
+    return parser
+
+
+def run_submit(args: List[str]) -> int:
+    """Run the ``submit`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from src.campaign import submit_campaign
+
+    parsed_args = create_submit_parser().parse_args(args)
+    try:
+        n_jobs = submit_campaign(parsed_args.manifest, parsed_args.queue)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Submitted {n_jobs} jobs to {parsed_args.queue}")
+    return 0
+
+
+def create_worker_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``worker`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    from src.campaign import (
+        DEFAULT_LEASE_SECONDS,
+        DEFAULT_MAX_ATTEMPTS,
+        DEFAULT_POLL_INTERVAL,
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="tailid worker",
+        description=(
+            "Run jobs from a campaign queue until none are left. Any number "
+            "of workers may share a queue."
+        ),
+    )
+
+    parser.add_argument("queue", type=str, help="Queue directory")
+
+    parser.add_argument(
+        "--lease",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help=(
+            f"Seconds after which an unrenewed claim is taken over "
+            f"(default: {DEFAULT_LEASE_SECONDS:g})"
+        ),
+    )
+
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=(
+            f"Attempts per job before it is marked failed "
+            f"(default: {DEFAULT_MAX_ATTEMPTS})"
+        ),
+    )
+
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=(
+            f"Seconds between polls while other workers hold jobs "
+            f"(default: {DEFAULT_POLL_INTERVAL:g})"
+        ),
+    )
+
+    return parser
+
+
+def run_worker_command(args: List[str]) -> int:
+    """Run the ``worker`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 for success, non-zero for errors).
+    """
+    from src.campaign import run_worker
+
+    parsed_args = create_worker_parser().parse_args(args)
+    try:
+        summary = run_worker(
+            parsed_args.queue,
+            lease_seconds=parsed_args.lease,
+            max_attempts=parsed_args.max_attempts,
+            poll_interval=parsed_args.poll_interval,
+        )
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Worker {summary.worker}: {summary.done} done, "
+        f"{summary.retried} retried, {summary.failed} failed, "
+        f"{summary.taken_over} expired leases taken over, "
+        f"{summary.lost} lost to other workers"
+    )
+    return 0
+
+
+def create_merge_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``merge`` subcommand.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="tailid merge",
+        description="Merge the results of a campaign queue into one report.",
+    )
+
+    parser.add_argument("queue", type=str, help="Queue directory")
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="PATH",
+        help="Also write the report as JSON lines to PATH",
+    )
+
+    return parser
+
+
+def run_merge(args: List[str]) -> int:
+    """Run the ``merge`` subcommand.
+
+    Args:
+        args: Subcommand arguments.
+
+    Returns:
+        Exit code (0 if every job completed, non-zero otherwise).
+    """
+    from src.campaign import merge_campaign
+
+    parsed_args = create_merge_parser().parse_args(args)
+    try:
+        report = merge_campaign(parsed_args.queue)
+        if parsed_args.output is not None:
+            report.save(parsed_args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{'id':<20} {'p_m':>7} {'|S|':>6} {'scenario':<11} tail_threshold"
+    )
+    for entry in report.results:
+        result = entry["result"]
+        threshold = result["tail_threshold"]
+        print(
+            f"{entry['id']:<20} {result['p_m']:>7.4f} "
+            f"{len(result['sensitive_points']):>6} "
+            f"{result['scenario']:<11} "
+            f"{'-' if threshold is None else threshold}"
+        )
+    for entry in report.failed:
+        print(f"{entry['id']:<20} FAILED: {entry['errors'][-1]}")
+    print()
+    print(
+        f"{len(report.results)} done, {len(report.failed)} failed, "
+        f"{report.pending} pending, {report.claimed} running"
+    )
+    if parsed_args.output is not None:
+        print(f"Report written to {parsed_args.output}")
+    return 0 if report.complete and not report.failed else 1
+
+
+SUBCOMMANDS: Dict[str, Callable[[List[str]], int]] = {
+    "generate": run_generate,
+    "trace": run_trace,
+    "window": run_window,
+    "components": run_components,
+    "groups": run_groups,
+    "stability": run_stability,
+    "serve": run_serve,
+    "submit": run_submit,
+    "worker": run_worker_command,
+    "merge": run_merge,
+}
+
+
+def _run_via_daemon(
+    parsed_args: argparse.Namespace, socket_path: Path
+) -> Dict[str, Any]:
+    """Forward an analysis run to the daemon listening on socket_path.
+
+    Args:
+        parsed_args: Parsed analysis arguments.
+        socket_path: Daemon socket.
+
+    Returns:
+        The daemon response (see ``src.server.result_to_dict``).
+
+    Raises:
+        FileNotFoundError: If the data file does not exist.
+        ValueError: If the daemon reports an error.
+    """
+    path = Path(parsed_args.data_file)
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {path}")
+
+    response = request(
+        {
+            "path": str(path.resolve()),
+            "p_c1": parsed_args.p_c1,
+            "n_candidates": parsed_args.n_candidates,
+            "gamma": parsed_args.gamma,
+            "mos": parsed_args.mos,
+        },
+        socket_path,
+    )
+    if not response.get("ok"):
+        raise ValueError(response.get("error", "daemon request failed"))
+
+    print(
+        f"Loaded {response['n_samples']} data points from "
+        f"{parsed_args.data_file} (via daemon at {socket_path})"
+    )
+    print()
+    print("Selecting optimal p_m by minimizing EQMAE...")
+    print(f"Selected p_m = {response['p_m']:.4f}")
+    print()
+    return response
+
+
+def _print_report(
+    parsed_args: argparse.Namespace,
+    p_m: float,
+    sensitive_points: Sequence[float],
+    scenario: str,
+    tail_threshold: Optional[float],
+    message: str,
+    mos: int,
+    kpss: Optional["KPSSResult"] = None,
+) -> None:
+    """Print the TailID analysis report.
+
+    Args:
+        parsed_args: Parsed analysis arguments.
+        p_m: Selected extreme value percentile.
+        sensitive_points: Detected sensitive points.
+        scenario: Name of the scenario classification.
+        tail_threshold: Tail threshold for Scenario 2, None otherwise.
+        message: Interpretation message.
+        mos: MoS threshold the scenario was classified with.
+        kpss: KPSS test of the data when --kpss was given.
+    """
+    print("=" * 60)
+    print("TailID Analysis Result")
+    print("=" * 60)
+    print()
+    print("Parameters:")
+    print(f"  p_m (extreme value percentile): {p_m:.4f} (auto-selected)")
+    print(f"  p_c1 (candidate percentile): {parsed_args.p_c1}")
+    print(f"  n_candidates: {parsed_args.n_candidates}")
+    print(f"  gamma (confidence level): {parsed_args.gamma}")
+    mos_source = " (estimated)" if parsed_args.mos == MOS_AUTO else ""
+    print(f"  MoS (minimum of samples): {mos}{mos_source}")
+    print(f"  CI method: {parsed_args.ci_method}")
+    print()
+    print("Results:")
+    print(f"  Number of sensitive points: {len(sensitive_points)}")
+    print(f"  Scenario: {scenario}")
+    if tail_threshold is not None:
+        print(f"  Tail threshold: {tail_threshold}")
+    if kpss is not None:
+        print(f"  KPSS statistic: {kpss.statistic:.4f}")
+        print(f"  KPSS p-value: {kpss.p_value:.3f} (lags: {kpss.lags})")
+    print()
+    print("Interpretation:")
+    print(f"  {message}")
+    print()
+
+    if len(sensitive_points) > 0:
+        print("Sensitive points:")
+        for i, point in enumerate(sensitive_points[:10]):
+            print(f"  {i + 1}. {point}")
+        if len(sensitive_points) > 10:
+            print(f"  ... and {len(sensitive_points) - 10} more")
+    print("=" * 60)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Main entry point for the CLI.
+
+    The first argument may name a subcommand (see ``SUBCOMMANDS``);
+    otherwise the arguments are parsed as a TailID analysis run. A leading
+    ``--`` forces an analysis run, so that data files named like a
+    subcommand can be analysed. Plain analysis runs are forwarded to an
+    analysis daemon when one answers on the socket (see the ``serve``
+    subcommand), unless --no-daemon is given.
+
+    Args:
+        args: Command-line arguments (defaults to sys.argv[1:]).
+
+    Returns:
+        Exit code (0 for success, ``EXIT_PARTIAL`` when the time budget
+        stopped the run early, 1 for errors).
+    """
+    argv = sys.argv[1:] if args is None else list(args)
+    if argv and argv[0] == "--":
+        argv = argv[1:]
+    elif argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
+    parser = create_parser()
+    parsed_args = parser.parse_args(argv)
+    if parsed_args.pwcet_confidence is not None and parsed_args.pwcet is None:
+        parser.error("--pwcet-confidence requires --pwcet")
+
+    socket_path = parsed_args.socket or default_socket_path()
+    forward = (
+        not parsed_args.no_daemon
+        and not parsed_args.profile
+        and parsed_args.trace is None
+        and parsed_args.ci_method == "asymptotic"
+        and parsed_args.kpss is None
+        and parsed_args.pwcet is None
+        and parsed_args.artifact is None
+        and parsed_args.time_budget is None
+        and parsed_args.eqmae_subsample is None
+        and parsed_args.workers == 1
+        and server_available(socket_path)
+    )
+    if forward:
+        try:
+            response = _run_via_daemon(parsed_args, socket_path)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        _print_report(
+            parsed_args,
+            response["p_m"],
+            response["sensitive_points"],
+            response["scenario"],
+            response["tail_threshold"],
+            response["message"],
+            response["mos"],
+        )
+        return 0
+
+    from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+    from src.artifact import write_artifact
+    from src.data_loading import load_data_from_file
+    from src.executors import create_executor
+    from src.instrumentation import Deadline, RunStats, stage
+    from src.kpss import kpss_test
+    from src.pipeline import selection_share
+    from src.pwcet import estimate_pwcet
+    from src.tailid import combine_with_kpss, tail_id
+    from src.threshold_selection import evaluate_thresholds
+    from src.tracing import (
+        DEFAULT_TRACE_CAPACITY,
+        TraceSink,
+        summarize_trace,
+    )
+
+    stats = RunStats() if parsed_args.profile else None
+    trace: Optional[TraceSink] = None
+    executor: Optional[Executor] = None
+    kpss_executor: Optional[ThreadPoolExecutor] = None
+
+    try:
+        if parsed_args.trace is not None or parsed_args.artifact is not None:
+            # The artifact takes the EVI/CI sequence from the trace, so
+            # keep every record in memory.
+            capacity = (
+                sys.maxsize
+                if parsed_args.artifact
+                else DEFAULT_TRACE_CAPACITY
+            )
+            trace = TraceSink(capacity, path=parsed_args.trace)
+        deadline: Optional[Deadline] = None
+        if parsed_args.time_budget is not None:
+            deadline = Deadline.after(parsed_args.time_budget)
+        with stage(stats, "load"):
+            data = load_data_from_file(parsed_args.data_file)
+        if stats is not None:
+            stats.record_copy(data)
+        print(f"Loaded {len(data)} data points from {parsed_args.data_file}")
+        print()
+        executor = create_executor(
+            parsed_args.workers, parsed_args.executor, len(data)
+        )
+
+        # The KPSS test is independent of TailID; run it alongside.
+        kpss_future: Optional[Future] = None
+        if parsed_args.kpss is not None:
+            kpss_executor = ThreadPoolExecutor(max_workers=1)
+            kpss_future = kpss_executor.submit(
+                kpss_test, data, parsed_args.kpss
+            )
+
+        # Time the selection leaves unused is left to TailID.
+        selection_deadline: Optional[Deadline] = None
+        if deadline is not None:
+            selection_deadline = deadline.share(
+                selection_share(
+                    len(data), parsed_args.n_candidates, parsed_args.p_c1
+                )
+            )
+
+        print("Selecting optimal p_m by minimizing EQMAE...")
+        selection = evaluate_thresholds(
+            data,
+            n_candidates=parsed_args.n_candidates,
+            stats=stats,
+            trace=trace,
+            max_exceedances=parsed_args.eqmae_subsample,
+            recheck=parsed_args.eqmae_recheck,
+            deadline=selection_deadline,
+            executor=executor,
+        )
+        p_m = selection.p_m
+        if selection.partial:
+            print(
+                f"Selected p_m = {p_m:.4f} (partial: the time budget of "
+                f"threshold selection ran out after {selection.n_scored} of "
+                f"{len(selection.percentiles)} candidates)"
+            )
+        elif selection.exact.all():
+            print(f"Selected p_m = {p_m:.4f}")
+        else:
+            print(
+                f"Selected p_m = {p_m:.4f} (approximate EQMAE for "
+                f"{int((~selection.exact).sum())} of "
+                f"{len(selection.exact)} candidates; estimated error "
+                f"+/- {selection.p_m_error:.4f})"
+            )
+        if selection.n_failures:
+            print(
+                f"Warning: the GPD fit failed for {selection.n_failures} of "
+                f"{len(selection.failed)} candidate thresholds; they were "
+                f"not considered"
+            )
+        print()
+
+        result = tail_id(
+            x=data,
+            p_m=p_m,
+            p_c1=parsed_args.p_c1,
+            gamma=parsed_args.gamma,
+            mos=parsed_args.mos,
+            stats=stats,
+            trace=trace,
+            ci_method=parsed_args.ci_method,
+            n_resamples=parsed_args.n_resamples,
+            executor=executor,
+            deadline=deadline,
+        )
+        if kpss_future is not None:
+            result = combine_with_kpss(result, kpss_future.result())
+
+        _print_report(
+            parsed_args,
+            p_m,
+            result.sensitive_points,
+            result.scenario.name,
+            result.tail_threshold,
+            result.message,
+            result.mos,
+            result.kpss,
+        )
+
+        if parsed_args.pwcet is not None:
+            curve = estimate_pwcet(
+                result,
+                data,
+                confidence_level=parsed_args.pwcet_confidence,
+                n_resamples=parsed_args.n_resamples,
+                executor=executor,
+            )
+            curve.save(parsed_args.pwcet)
+            print()
+            print(f"pWCET curve written to {parsed_args.pwcet}:")
+            for i, p in enumerate(curve.probabilities):
+                line = f"  P(exceed) = {p:.0e}: {curve.pwcet[i]:.6g}"
+                if curve.lower is not None and curve.upper is not None:
+                    line += f" [{curve.lower[i]:.6g}, {curve.upper[i]:.6g}]"
+                print(line)
+
+        if parsed_args.artifact is not None:
+            assert trace is not None
+            write_artifact(
+                parsed_args.artifact,
+                data,
+                p_m,
+                parsed_args.p_c1,
+                result,
+                selection,
+                trace.records,
+            )
+            print()
+            print(f"Analysis artifact written to {parsed_args.artifact}")
+
+        if stats is not None:
+            print()
+            print("Profile:")
+            print(stats.format_breakdown())
 
-        if len(result.sensitive_points) > 0:
-            print("Sensitive points:")
-            for i, point in enumerate(result.sensitive_points[:10]):
-                print(f"  {i + 1}. {point}")
-            if len(result.sensitive_points) > 10:
-                print(f"  ... and {len(result.sensitive_points) - 10} more")
-        print("=" * 60)
+        if trace is not None and parsed_args.trace is not None:
+            trace.close()
+            print()
+            print(f"Fit trace written to {parsed_args.trace}:")
+            print(summarize_trace(trace.records).format())
 
+        if selection.partial or result.partial:
+            return EXIT_PARTIAL
         return 0
 
-    except FileNotFoundError as e:
+    except OSError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
     except ValueError as e:
@@ -187,6 +1708,13 @@ def main(args: Optional[List[str]] = None) -> int:
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         return 1
+    finally:
+        if trace is not None:
+            trace.close()
+        if executor is not None:
+            executor.shutdown()
+        if kpss_executor is not None:
+            kpss_executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,33 +1,93 @@
-"""TailID package for detecting low-density mixtures in high-quantile tails."""
-
-from src.data_processing import (
-    excess_set,
-    quantile,
-    select_candidates,
-)
-from src.gpd_statistics import (
-    compute_gpd_ci,
-    fit_gpd_evi,
-    is_in_interval,
-)
-from src.tailid import (
-    MOS_DEFAULT,
-    TailIDResult,
-    TailIDScenario,
-    tail_id,
-)
-from src.threshold_selection import select_threshold
-
-__all__ = [
-    "quantile",
-    "select_candidates",
-    "excess_set",
-    "fit_gpd_evi",
-    "compute_gpd_ci",
-    "is_in_interval",
-    "tail_id",
-    "TailIDResult",
-    "TailIDScenario",
-    "MOS_DEFAULT",
-    "select_threshold",
-]
+"""TailID package for detecting low-density mixtures in high-quantile tails.
+
+Public names are imported lazily on first access, so that importing a
+lightweight submodule (e.g. ``src.client``) does not load NumPy and SciPy.
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+_EXPORTS: Dict[str, str] = {
+    "quantile": "src.data_processing",
+    "select_candidates": "src.data_processing",
+    "excess_set": "src.data_processing",
+    "fit_gpd_evi": "src.gpd_statistics",
+    "compute_gpd_ci": "src.gpd_statistics",
+    "compute_gpd_bootstrap_ci": "src.gpd_statistics",
+    "fit_gpd": "src.gpd_statistics",
+    "fit_gpd_batch": "src.gpd_statistics",
+    "fit_gpd_mle_batch": "src.gpd_statistics",
+    "refit_gpd": "src.gpd_statistics",
+    "is_in_interval": "src.gpd_statistics",
+    "GPDFit": "src.gpd_statistics",
+    "bootstrap_gpd_fits": "src.gpd_statistics",
+    "tail_id": "src.tailid",
+    "TailIDResult": "src.tailid",
+    "TailIDScenario": "src.tailid",
+    "MOS_DEFAULT": "src.tailid",
+    "select_threshold": "src.threshold_selection",
+    "evaluate_thresholds": "src.threshold_selection",
+    "ThresholdSelection": "src.threshold_selection",
+    "RunStats": "src.instrumentation",
+    "Deadline": "src.instrumentation",
+    "DeadlineExceeded": "src.instrumentation",
+    "FitTrace": "src.tracing",
+    "TraceSink": "src.tracing",
+    "load_trace": "src.tracing",
+    "summarize_trace": "src.tracing",
+    "AnalysisResult": "src.pipeline",
+    "ComponentAnalysis": "src.pipeline",
+    "detect_components": "src.pipeline",
+    "run_analysis": "src.pipeline",
+    "WindowResult": "src.windowed",
+    "iter_windows": "src.windowed",
+    "GPDComponent": "src.synthetic",
+    "MixtureSpec": "src.synthetic",
+    "generate_mixture": "src.synthetic",
+    "iter_mixture_chunks": "src.synthetic",
+    "write_mixture": "src.synthetic",
+    "TailIDServer": "src.server",
+    "AnalysisTask": "src.async_api",
+    "Progress": "src.async_api",
+    "aload_data": "src.async_api",
+    "aselect_threshold": "src.async_api",
+    "atail_id": "src.async_api",
+    "KPSSAccumulator": "src.kpss",
+    "KPSSResult": "src.kpss",
+    "kpss_test": "src.kpss",
+    "combine_with_kpss": "src.tailid",
+    "PWCETCurve": "src.pwcet",
+    "estimate_pwcet": "src.pwcet",
+    "pwcet_curves": "src.pwcet",
+    "CampaignReport": "src.campaign",
+    "merge_campaign": "src.campaign",
+    "run_worker": "src.campaign",
+    "submit_campaign": "src.campaign",
+    "Predicate": "src.ingest",
+    "load_groups": "src.ingest",
+    "estimate_mos": "src.mos",
+    "create_executor": "src.executors",
+    "resolve_backend": "src.executors",
+    "StabilityReport": "src.stability",
+    "stability_report": "src.stability",
+    "AnalysisArtifact": "src.artifact",
+    "load_result": "src.artifact",
+    "write_artifact": "src.artifact",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'src' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including the not yet imported exports."""
+    return sorted(set(globals()) | set(__all__))
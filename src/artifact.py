@@ -0,0 +1,334 @@
+"""Memory-mappable analysis artifacts shared between processes.
+
+An artifact stores one finished analysis so that dashboards, the pWCET
+stage and notebooks can reuse it without reloading the trace or refitting.
+The file starts with a fixed 64-byte preamble (magic, format version and
+the location of a JSON index), followed by sections that are each a
+complete ``.npy`` array, and ends with the JSON index:
+
+- ``tail``: sorted values at or above the p_m quantile, in the dtype of the
+  data (``src.data_processing.Tail.values``).
+- ``eqmae``: the EQMAE curve of threshold selection, one record per
+  candidate (percentile, EQMAE, error, exact, failed).
+- ``evi``: the EVI/CI sequence of the TailID candidate loop, one record per
+  fit (prefix size, candidate, EVI, CI bounds, acceptance).
+- ``sensitive_points``: the detected sensitive points.
+
+The index holds the scalar outcome (p_m, scenario, GPD fit, ...) and the
+offset of every section. Sections start on 64-byte boundaries, so their
+data is aligned, and are opened with ``np.memmap`` on first access: opening
+an artifact reads only the preamble and the index, and processes mapping
+the same file share its pages through the OS cache. Each section can also
+be read with ``np.load`` from a file object positioned at its offset.
+"""
+
+import json
+import os
+import struct
+from dataclasses import asdict
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.data_processing import extract_tail
+from src.gpd_statistics import GPDFit
+from src.kpss import KPSSResult
+from src.tailid import TailIDResult, TailIDScenario
+from src.threshold_selection import ThresholdSelection
+from src.tracing import FitTrace
+
+ARTIFACT_VERSION = 1
+
+_MAGIC = b"TAILID\x00"
+_PREAMBLE = struct.Struct("<7sBQQ")
+_ALIGN = 64
+
+# Record dtype of the ``eqmae`` section.
+EQMAE_DTYPE = np.dtype(
+    [
+        ("percentile", "<f8"),
+        ("eqmae", "<f8"),
+        ("error", "<f8"),
+        ("exact", "?"),
+        ("failed", "?"),
+    ]
+)
+
+# Record dtype of the ``evi`` section. The candidate of the baseline fit is
+# NaN and its acceptance -1; failed fits have a NaN EVI.
+EVI_DTYPE = np.dtype(
+    [
+        ("prefix_size", "<i8"),
+        ("candidate", "<f8"),
+        ("evi", "<f8"),
+        ("ci_lower", "<f8"),
+        ("ci_upper", "<f8"),
+        ("accepted", "i1"),
+    ]
+)
+
+
+def _optional_float(value: Optional[float]) -> float:
+    """Map None to NaN for float record fields."""
+    return float("nan") if value is None else float(value)
+
+
+def _eqmae_records(selection: ThresholdSelection) -> NDArray[np.void]:
+    """Build the ``eqmae`` section from a threshold selection."""
+    records = np.empty(len(selection.percentiles), dtype=EQMAE_DTYPE)
+    records["percentile"] = selection.percentiles
+    records["eqmae"] = selection.eqmae
+    records["error"] = selection.eqmae_error
+    records["exact"] = selection.exact
+    records["failed"] = selection.failed
+    return records
+
+
+def _evi_records(fits: Iterable[FitTrace]) -> NDArray[np.void]:
+    """Build the ``evi`` section from the TailID records of a fit trace."""
+    rows = [
+        (
+            fit.prefix_size,
+            _optional_float(fit.candidate),
+            _optional_float(fit.evi),
+            _optional_float(fit.ci_lower),
+            _optional_float(fit.ci_upper),
+            -1 if fit.accepted is None else int(fit.accepted),
+        )
+        for fit in fits
+        if fit.source == "tail_id"
+    ]
+    return np.array(rows, dtype=EVI_DTYPE)
+
+
+def _pad(f: IO[bytes]) -> None:
+    """Pad the file with zeros to the next section boundary."""
+    f.write(b"\x00" * (-f.tell() % _ALIGN))
+
+
+def write_artifact(
+    path: Union[str, Path],
+    data: NDArray[np.number],
+    p_m: float,
+    p_c1: float,
+    result: TailIDResult,
+    selection: Optional[ThresholdSelection] = None,
+    fits: Optional[Iterable[FitTrace]] = None,
+) -> None:
+    """Write an analysis to an artifact file.
+
+    The file is written under a temporary name and renamed into place, so
+    readers never map a partial artifact.
+
+    Args:
+        path: Output path (overwritten).
+        data: The sample data the analysis was run on.
+        p_m: Extreme value percentile TailID was run with.
+        p_c1: Candidate percentile TailID was run with.
+        result: Result of ``tail_id``.
+        selection: Optional threshold selection the EQMAE curve is taken
+            from (see ``evaluate_thresholds``). The section is empty
+            without it.
+        fits: Optional fit records of the run, e.g. ``TraceSink.records``;
+            the TailID records form the EVI/CI sequence. The section is
+            empty without them.
+
+    Raises:
+        ValueError: If the data is empty or p_m > p_c1.
+    """
+    path = Path(path)
+    tail = extract_tail(data, p_m, p_c1)
+    sections = {
+        "tail": tail.values,
+        "eqmae": (
+            _eqmae_records(selection)
+            if selection is not None
+            else np.empty(0, dtype=EQMAE_DTYPE)
+        ),
+        "evi": _evi_records(fits if fits is not None else ()),
+        "sensitive_points": result.sensitive_points,
+    }
+    index: Dict[str, Any] = {
+        "version": ARTIFACT_VERSION,
+        "n_samples": tail.n,
+        "p_m": float(p_m),
+        "p_c1": float(p_c1),
+        "t_m": tail.t_m,
+        "t_c1": tail.t_c1,
+        "scenario": result.scenario.name,
+        "message": result.message,
+        "tail_threshold": result.tail_threshold,
+        "mos": result.mos,
+        "id_supported": result.id_supported,
+        "partial": result.partial,
+        "candidates_processed": result.candidates_processed,
+        "candidates_total": result.candidates_total,
+        "fit": asdict(result.fit) if result.fit is not None else None,
+        "kpss": asdict(result.kpss) if result.kpss is not None else None,
+        "sections": {},
+    }
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(b"\x00" * _ALIGN)
+        for name, array in sections.items():
+            index["sections"][name] = f.tell()
+            np.lib.format.write_array(
+                f, np.ascontiguousarray(array), allow_pickle=False
+            )
+            _pad(f)
+        index_offset = f.tell()
+        encoded = json.dumps(index).encode("utf-8")
+        f.write(encoded)
+        f.seek(0)
+        f.write(
+            _PREAMBLE.pack(
+                _MAGIC, ARTIFACT_VERSION, index_offset, len(encoded)
+            )
+        )
+    os.replace(tmp, path)
+
+
+class AnalysisArtifact:
+    """Read-only view of an analysis artifact written by ``write_artifact``.
+
+    Opening an artifact reads only its index. Sections are memory-mapped
+    on first access and returned as read-only arrays without copying.
+
+    Args:
+        path: Artifact file.
+
+    Raises:
+        ValueError: If the file is not an analysis artifact of a supported
+            version.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            preamble = f.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                raise ValueError(f"{self.path} is not a TailID artifact")
+            magic, version, index_offset, index_size = _PREAMBLE.unpack(
+                preamble
+            )
+            if magic != _MAGIC:
+                raise ValueError(f"{self.path} is not a TailID artifact")
+            if version != ARTIFACT_VERSION:
+                raise ValueError(
+                    f"unsupported artifact version {version} in {self.path}"
+                )
+            f.seek(index_offset)
+            self.index: Dict[str, Any] = json.loads(f.read(index_size))
+        self._sections: Dict[str, NDArray[Any]] = {}
+        self._result: Optional[TailIDResult] = None
+
+    def section(self, name: str) -> NDArray[Any]:
+        """Return a section as a read-only memory-mapped array.
+
+        Args:
+            name: Section name (``"tail"``, ``"eqmae"``, ``"evi"`` or
+                ``"sensitive_points"``).
+
+        Returns:
+            The section array.
+
+        Raises:
+            KeyError: If the artifact has no such section.
+        """
+        if name not in self._sections:
+            offset = self.index["sections"][name]
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(f)
+                else:
+                    header = np.lib.format.read_array_header_2_0(f)
+                data_offset = f.tell()
+            shape, fortran_order, dtype = header
+            if int(np.prod(shape)) == 0:
+                array: NDArray[Any] = np.empty(shape, dtype=dtype)
+            else:
+                array = np.memmap(
+                    self.path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=data_offset,
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+            self._sections[name] = array
+        return self._sections[name]
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples the analysis was run on."""
+        return int(self.index["n_samples"])
+
+    @property
+    def p_m(self) -> float:
+        """Extreme value percentile TailID was run with."""
+        return float(self.index["p_m"])
+
+    @property
+    def tail(self) -> NDArray[np.number]:
+        """Sorted values at or above the p_m quantile."""
+        return self.section("tail")
+
+    @property
+    def eqmae(self) -> NDArray[np.void]:
+        """EQMAE curve of threshold selection (see ``EQMAE_DTYPE``)."""
+        return self.section("eqmae")
+
+    @property
+    def evi(self) -> NDArray[np.void]:
+        """EVI/CI sequence of the TailID loop (see ``EVI_DTYPE``)."""
+        return self.section("evi")
+
+    @property
+    def sensitive_points(self) -> NDArray[np.number]:
+        """Detected sensitive points, in ascending order."""
+        return self.section("sensitive_points")
+
+    @property
+    def result(self) -> TailIDResult:
+        """The TailID result, whose sensitive points are memory-mapped."""
+        if self._result is None:
+            index = self.index
+            self._result = TailIDResult(
+                self.sensitive_points,
+                TailIDScenario[index["scenario"]],
+                message=index["message"],
+                tail_threshold=index["tail_threshold"],
+                kpss=(
+                    KPSSResult(**index["kpss"])
+                    if index["kpss"] is not None
+                    else None
+                ),
+                id_supported=index["id_supported"],
+                fit=(
+                    GPDFit(**index["fit"])
+                    if index["fit"] is not None
+                    else None
+                ),
+                mos=index["mos"],
+                partial=index["partial"],
+                candidates_processed=index["candidates_processed"],
+                candidates_total=index["candidates_total"],
+            )
+        return self._result
+
+
+def load_result(path: Union[str, Path]) -> TailIDResult:
+    """Load the TailID result of an artifact lazily.
+
+    Args:
+        path: Artifact file.
+
+    Returns:
+        TailIDResult whose sensitive points are memory-mapped.
+    """
+    return AnalysisArtifact(path).result
@@ -0,0 +1,267 @@
+"""Asyncio-friendly variants of the TailID entry points.
+
+This module lets the library be embedded in asyncio services without
+blocking the event loop. ``aload_data``, ``aselect_threshold`` and
+``atail_id`` run the numeric work in an executor (the event loop's default
+thread pool unless one is given), so many traces can be analysed
+concurrently from one event loop.
+
+``aselect_threshold`` and ``atail_id`` return an ``AnalysisTask``, which is
+awaited for the result and can also be iterated asynchronously for the
+progress over the candidates::
+
+    task = atail_id(data, p_m, p_c1, gamma)
+    async for progress in task:
+        print(progress.done, progress.total)
+    result = await task
+
+Cancelling the awaiting task (or hitting its ``timeout``) stops the
+computation at the next candidate boundary. Progress and cancellation rely
+on callbacks run by the worker, so the executor must run its callables in
+this process (e.g. a ``ThreadPoolExecutor``).
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Generic,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.data_loading import load_data_from_file
+from src.defaults import DEFAULT_N_RESAMPLES, MOS_DEFAULT
+from src.instrumentation import ProgressHook, RunStats
+from src.tailid import TailIDResult, tail_id
+from src.threshold_selection import P_M_MAX, P_M_MIN, select_threshold
+from src.tracing import TraceSink
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Progress:
+    """Progress of an asynchronous computation over its candidates.
+
+    Attributes:
+        stage: ``"select_threshold"`` or ``"tail_id"``.
+        done: Number of candidates processed so far.
+        total: Total number of candidates.
+    """
+
+    stage: str
+    done: int
+    total: int
+
+
+class _Cancelled(Exception):
+    """Raised inside the worker to abort a cancelled computation."""
+
+
+class AnalysisTask(Generic[T]):
+    """Handle on a computation running in an executor.
+
+    Awaiting the task returns the result of the computation. Iterating it
+    with ``async for`` yields a ``Progress`` after each processed candidate
+    and ends when the computation finishes. Cancelling the awaiting
+    coroutine, or calling ``cancel``, stops the computation at the next
+    candidate boundary.
+
+    Args:
+        stage: Name reported in the ``Progress`` records.
+        func: Computation taking the progress callback.
+        executor: Executor the computation runs in (the loop's default
+            executor when None).
+        timeout: Optional timeout in seconds applied when awaiting.
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        func: Callable[[ProgressHook], T],
+        executor: Optional[Executor] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self._stage = stage
+        self._timeout = timeout
+        self._loop = asyncio.get_running_loop()
+        self._cancel_event = threading.Event()
+        self._progress: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._future: "asyncio.Future[T]" = self._loop.run_in_executor(
+            executor, func, self._report
+        )
+        self._future.add_done_callback(self._on_done)
+
+    def _report(self, done: int, total: int) -> None:
+        """Progress callback run in the worker."""
+        if self._cancel_event.is_set():
+            raise _Cancelled()
+        self._loop.call_soon_threadsafe(
+            self._progress.put_nowait, Progress(self._stage, done, total)
+        )
+
+    def _on_done(self, future: "asyncio.Future[T]") -> None:
+        """Stop the worker if cancelled and end the progress stream."""
+        if future.cancelled():
+            self._cancel_event.set()
+        self._progress.put_nowait(_DONE)
+
+    def cancel(self) -> None:
+        """Request the computation to stop and cancel the task."""
+        self._cancel_event.set()
+        self._future.cancel()
+
+    def done(self) -> bool:
+        """Return True if the computation finished or was cancelled."""
+        return self._future.done()
+
+    async def _result(self) -> T:
+        """Wait for the result, stopping the worker on cancellation."""
+        try:
+            return await asyncio.wait_for(self._future, self._timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self.cancel()
+            raise
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self._result().__await__()
+
+    async def __aiter__(self) -> AsyncIterator[Progress]:
+        while True:
+            item = await self._progress.get()
+            if item is _DONE:
+                return
+            yield item
+
+
+async def aload_data(
+    file_path: str, executor: Optional[Executor] = None
+) -> NDArray[np.floating]:
+    """Load sample data without blocking the event loop.
+
+    Args:
+        file_path: Path of a text or ``.npy`` data file.
+        executor: Executor used for reading and parsing (the loop's default
+            executor when None).
+
+    Returns:
+        NumPy array of floating-point values.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file contains invalid data.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, load_data_from_file, file_path
+    )
+
+
+def aselect_threshold(
+    data: NDArray[np.floating],
+    n_candidates: int,
+    p_min: float = P_M_MIN,
+    p_max: float = P_M_MAX,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    executor: Optional[Executor] = None,
+    timeout: Optional[float] = None,
+) -> AnalysisTask[float]:
+    """Start ``select_threshold`` in an executor.
+
+    Must be called from a running event loop. See ``select_threshold`` for
+    the selection parameters.
+
+    Args:
+        data: Sample data array.
+        n_candidates: Number of candidate thresholds to evaluate.
+        p_min: Minimum percentile for candidate thresholds (default: 0.6).
+        p_max: Maximum percentile for candidate thresholds (default: 0.9).
+        stats: Optional collector for per-stage timings and fit counters.
+        trace: Optional sink receiving one record per candidate fit.
+        executor: Executor running the selection (the loop's default
+            executor when None).
+        timeout: Optional timeout in seconds; on expiry the selection is
+            stopped and ``asyncio.TimeoutError`` is raised.
+
+    Returns:
+        AnalysisTask whose result is the selected p_m.
+    """
+
+    def run(progress: ProgressHook) -> float:
+        return select_threshold(
+            data, n_candidates, p_min, p_max, stats, trace, progress
+        )
+
+    return AnalysisTask("select_threshold", run, executor, timeout)
+
+
+def atail_id(
+    x: NDArray[np.floating],
+    p_m: float,
+    p_c1: float,
+    gamma: float,
+    mos: Union[int, str] = MOS_DEFAULT,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    ci_method: str = "asymptotic",
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+    timeout: Optional[float] = None,
+) -> AnalysisTask[TailIDResult]:
+    """Start ``tail_id`` in an executor.
+
+    Must be called from a running event loop. See ``tail_id`` for the
+    algorithm parameters. The bootstrap resamples of ``ci_method=
+    "bootstrap"`` are computed inline in the worker.
+
+    Args:
+        x: Sample data for analysis (execution time measurements).
+        p_m: Extreme value percentile. Must be less than p_c1.
+        p_c1: Candidate percentile. Must be greater than p_m.
+        gamma: Confidence level (controls detection sensitivity).
+        mos: Minimum of Samples threshold (default: 40), or
+            ``"auto"`` to estimate it (see ``tail_id``).
+        stats: Optional collector for per-stage timings and fit counters.
+        trace: Optional sink receiving one record per GPD fit.
+        ci_method: ``"asymptotic"`` (default) or ``"bootstrap"``.
+        n_resamples: Number of bootstrap resamples per interval.
+        seed: Seed of the bootstrap resampling streams.
+        executor: Executor running the algorithm (the loop's default
+            executor when None).
+        timeout: Optional timeout in seconds; on expiry the run is stopped
+            and ``asyncio.TimeoutError`` is raised.
+
+    Returns:
+        AnalysisTask whose result is the TailIDResult.
+    """
+
+    def run(progress: ProgressHook) -> TailIDResult:
+        return tail_id(
+            x,
+            p_m,
+            p_c1,
+            gamma,
+            mos=mos,
+            stats=stats,
+            trace=trace,
+            ci_method=ci_method,
+            n_resamples=n_resamples,
+            seed=seed,
+            progress=progress,
+        )
+
+    return AnalysisTask("tail_id", run, executor, timeout)
@@ -0,0 +1,513 @@
+"""Campaign runner with a file-based job queue on a shared filesystem.
+
+A campaign is a manifest of analysis jobs, one JSON object per line in the
+request format of the analysis daemon (see ``src.server``), e.g.
+``{"path": "traces/a.npy", "p_c1": 0.99, "n_candidates": 31}``. An optional
+``"id"`` names the job in the report. ``submit_campaign`` turns the
+manifest into a queue directory; any number of ``run_worker`` processes on
+any number of hosts sharing that directory then pull and run the jobs, and
+``merge_campaign`` collects the results into one report.
+
+The queue needs no broker. Each job is a JSON file moving between the
+``pending``, ``claimed``, ``done`` and ``failed`` subdirectories:
+
+- A worker claims a job by renaming it from ``pending`` to ``claimed``
+  under a name unique to the claim (``<job>@<worker>-<n>.json``);
+  ``os.rename`` is atomic within a filesystem, so exactly one worker wins.
+- Each claim has a lease file next to it, holding the lease duration and a
+  renewal counter that the worker increments while the job runs. Other
+  workers time the lease on their own monotonic clock: a lease whose
+  content has not changed for its duration (e.g. its worker died) is
+  expired, whatever the clocks of the other hosts or the file server
+  say. An expired claim is taken over by renaming it to a name unique to
+  the new claim, so only one worker can take it over, and never a newer
+  claim of the same job.
+- A job that raised is put back to ``pending`` until it has been attempted
+  ``max_attempts`` times, and then moved to ``failed``.
+- Results are written to a temporary file and renamed into ``done``, so a
+  reader never sees a partial result.
+"""
+
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.data_loading import load_data_from_file
+from src.pipeline import run_analysis
+from src.server import request_params, result_to_dict
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 1.0
+
+_STATES = ("pending", "claimed", "done", "failed")
+
+# Separates the job name from the claim token in claimed file names.
+_CLAIM_SEPARATOR = "@"
+
+
+def _write_json(path: Path, content: Dict[str, Any]) -> None:
+    """Write a JSON file atomically through a uniquely named temp file."""
+    tmp = path.with_name(
+        f".{path.name}.{socket.gethostname()}.{os.getpid()}.tmp"
+    )
+    with open(tmp, "w") as f:
+        json.dump(content, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Read a JSON job or result file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def submit_campaign(
+    manifest: Union[str, Path], queue_dir: Union[str, Path]
+) -> int:
+    """Create a job queue from a campaign manifest.
+
+    Relative trace paths are resolved against the directory of the
+    manifest, so workers find them wherever they are started.
+
+    Args:
+        manifest: JSON-lines manifest with one analysis job per line.
+        queue_dir: Queue directory on a filesystem shared by the workers.
+            It is created if needed and must not hold jobs already.
+
+    Returns:
+        Number of jobs submitted.
+
+    Raises:
+        FileNotFoundError: If the manifest does not exist.
+        ValueError: If a manifest line is not a valid job, or the queue
+            already holds jobs.
+    """
+    manifest = Path(manifest)
+    queue = Path(queue_dir)
+    for state in _STATES:
+        (queue / state).mkdir(parents=True, exist_ok=True)
+        if any((queue / state).glob("*.json")):
+            raise ValueError(f"queue {queue} already holds jobs")
+
+    jobs: List[Dict[str, Any]] = []
+    with open(manifest) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job must be a JSON object")
+                request_params(job)
+                if "path" not in job and "data" not in job:
+                    raise ValueError("job needs a 'path' or 'data' field")
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(
+                    f"Invalid job on line {line_number} of {manifest}: {e}"
+                ) from e
+            if "path" in job:
+                job["path"] = str((manifest.parent / job["path"]).resolve())
+            jobs.append(job)
+
+    width = max(6, len(str(len(jobs))))
+    for index, job in enumerate(jobs):
+        name = f"{index:0{width}d}"
+        _write_json(
+            queue / "pending" / f"{name}.json",
+            {
+                "id": str(job.pop("id", name)),
+                "index": index,
+                "job": job,
+                "attempts": 0,
+                "errors": [],
+            },
+        )
+    return len(jobs)
+
+
+def _load_job_data(job: Dict[str, Any]) -> NDArray[np.number]:
+    """Load the trace of a job."""
+    if "path" in job:
+        return load_data_from_file(job["path"])
+    return np.asarray(job["data"], dtype=np.float64)
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the analysis pipeline on one job.
+
+    Args:
+        job: Analysis job in the daemon request format.
+
+    Returns:
+        Result dictionary (see ``src.server.result_to_dict``).
+
+    Raises:
+        Exception: Any error of loading or analysing the trace.
+    """
+    params = request_params(job)
+    data = _load_job_data(job)
+    analysis = run_analysis(data, *params)
+    return result_to_dict(analysis.p_m, analysis.result, len(data))
+
+
+def _job_file(claimed: Path) -> str:
+    """Return the queue file name of the job of a claimed file."""
+    stem = claimed.name[: -len(".json")]
+    return stem.split(_CLAIM_SEPARATOR, 1)[0] + ".json"
+
+
+def _lease_file(claimed: Path) -> Path:
+    """Return the lease file of a claimed file."""
+    return claimed.with_suffix(".lease")
+
+
+class _Lease:
+    """Renews the lease of a claimed job from a background thread.
+
+    The lease file is rewritten atomically with an incremented renewal
+    counter every third of the lease duration, as long as the claimed file
+    exists; once another worker has taken the claim over, renewal stops.
+    """
+
+    def __init__(self, path: Path, worker: str, lease_seconds: float) -> None:
+        self._path = path
+        self._worker = worker
+        self._seconds = lease_seconds
+        self._renewals = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    def write(self) -> None:
+        """Write the lease file with the next renewal count."""
+        _write_json(
+            _lease_file(self._path),
+            {
+                "worker": self._worker,
+                "renewal": self._renewals,
+                "seconds": self._seconds,
+            },
+        )
+        self._renewals += 1
+
+    def _renew(self) -> None:
+        while not self._stop.wait(self._seconds / 3):
+            if not self._path.exists():
+                return
+            self.write()
+
+    @contextmanager
+    def held(self) -> Iterator[None]:
+        """Keep the lease renewed while the block runs."""
+        self._thread.start()
+        try:
+            yield
+        finally:
+            self._stop.set()
+            self._thread.join()
+
+
+class _LeaseObserver:
+    """Detects expired leases by timing them on the local monotonic clock.
+
+    A lease is expired once its file content (renewal counter) has not
+    changed for the lease duration it declares, as measured by this
+    worker. No wall-clock time of another host or of the file server is
+    compared, so clock skew cannot expire a lease that is being renewed.
+
+    Args:
+        lease_seconds: Duration of claims without a readable lease file.
+    """
+
+    def __init__(self, lease_seconds: float) -> None:
+        self._lease_seconds = lease_seconds
+        self._seen: Dict[str, Tuple[str, float]] = {}
+
+    def expired(self, claimed: Path) -> bool:
+        """Return whether the lease of a claimed file has expired."""
+        try:
+            content = _lease_file(claimed).read_text()
+            seconds = float(json.loads(content)["seconds"])
+        except (OSError, ValueError, KeyError, TypeError):
+            content, seconds = "", self._lease_seconds
+        now = time.monotonic()
+        seen = self._seen.get(claimed.name)
+        if seen is None or seen[0] != content:
+            self._seen[claimed.name] = (content, now)
+            return False
+        return now - seen[1] > seconds
+
+
+@dataclass
+class WorkerSummary:
+    """Jobs handled by one ``run_worker`` call.
+
+    Attributes:
+        worker: Identifier of the worker (host name and process id).
+        done: Number of jobs completed.
+        retried: Number of failed attempts put back to the queue.
+        failed: Number of jobs moved to ``failed``.
+        taken_over: Number of claims with an expired lease taken over.
+        lost: Number of jobs whose claim was taken over by another worker
+            while they ran; their results were discarded.
+    """
+
+    worker: str
+    done: int = 0
+    retried: int = 0
+    failed: int = 0
+    taken_over: int = 0
+    lost: int = 0
+
+
+def _take_over_expired(
+    queue: Path, observer: _LeaseObserver, token: str
+) -> Optional[Path]:
+    """Take over the first claim whose lease has expired.
+
+    Lease files left without their claim are removed on the way.
+
+    Returns:
+        The new claimed path, or None if no lease has expired.
+    """
+    claimed_dir = queue / "claimed"
+    for lease in claimed_dir.glob("*.lease"):
+        if not lease.with_suffix(".json").exists():
+            _unlink(lease)
+    for path in sorted(claimed_dir.glob("*.json")):
+        if not observer.expired(path):
+            continue
+        stem = _job_file(path)[: -len(".json")]
+        target = claimed_dir / f"{stem}{_CLAIM_SEPARATOR}{token}.json"
+        try:
+            # The source name is unique to the expired claim, so only one
+            # worker can take it over.
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue
+        _unlink(_lease_file(path))
+        return target
+    return None
+
+
+def _claim(queue: Path, token: str) -> Optional[Path]:
+    """Claim the first pending job, returning its claimed path."""
+    for path in sorted((queue / "pending").glob("*.json")):
+        claimed = (
+            queue
+            / "claimed"
+            / f"{path.stem}{_CLAIM_SEPARATOR}{token}.json"
+        )
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            continue
+        return claimed
+    return None
+
+
+def _unlink(path: Path) -> None:
+    """Remove a file that may already be gone."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _finish(path: Path, target: Path, entry: Dict[str, Any]) -> bool:
+    """Write a job entry to target and release its claim.
+
+    Returns:
+        False, writing nothing, if the claim was taken over meanwhile.
+    """
+    if not path.exists():
+        return False
+    _write_json(target, entry)
+    _unlink(path)
+    _unlink(_lease_file(path))
+    return True
+
+
+def run_worker(
+    queue_dir: Union[str, Path],
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_jobs: Optional[int] = None,
+) -> WorkerSummary:
+    """Pull jobs from a campaign queue and run them until none are left.
+
+    The worker returns once no job is pending or claimed by another worker
+    (or after ``max_jobs`` jobs). While other workers still hold claims, it
+    polls so that it can take over jobs whose lease expires.
+
+    Args:
+        queue_dir: Queue directory created by ``submit_campaign``.
+        lease_seconds: Seconds after which a claim that is no longer
+            renewed is considered abandoned (default: 300).
+        max_attempts: Attempts per job before it is moved to ``failed``
+            (default: 3).
+        poll_interval: Seconds between polls while other workers hold
+            claims (default: 1).
+        max_jobs: Optional maximum number of jobs to attempt.
+
+    Returns:
+        WorkerSummary of the jobs handled.
+
+    Raises:
+        ValueError: If a parameter is out of range or queue_dir is not a
+            campaign queue.
+    """
+    if lease_seconds <= 0:
+        raise ValueError("lease_seconds must be positive")
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be positive")
+    queue = Path(queue_dir)
+    if not all((queue / state).is_dir() for state in _STATES):
+        raise ValueError(f"{queue} is not a campaign queue")
+
+    summary = WorkerSummary(worker=f"{socket.gethostname()}-{os.getpid()}")
+    observer = _LeaseObserver(lease_seconds)
+    claims = itertools.count()
+    attempted = 0
+    while max_jobs is None or attempted < max_jobs:
+        token = f"{summary.worker}-{next(claims)}"
+        path = _take_over_expired(queue, observer, token)
+        if path is not None:
+            summary.taken_over += 1
+        else:
+            path = _claim(queue, token)
+        if path is None:
+            if not any((queue / "claimed").glob("*.json")):
+                break
+            time.sleep(poll_interval)
+            continue
+
+        lease = _Lease(path, summary.worker, lease_seconds)
+        lease.write()
+        try:
+            entry = _read_json(path)
+        except FileNotFoundError:
+            continue
+        name = _job_file(path)
+        entry["attempts"] += 1
+        entry["worker"] = summary.worker
+        _write_json(path, entry)
+        attempted += 1
+
+        if entry["attempts"] > max_attempts:
+            # Only reachable through expired leases of earlier attempts.
+            entry["errors"].append("lease expired")
+            if _finish(path, queue / "failed" / name, entry):
+                summary.failed += 1
+            continue
+
+        try:
+            with lease.held():
+                result = run_job(entry["job"])
+        except Exception as e:
+            entry["errors"].append(f"{type(e).__name__}: {e}")
+            if entry["attempts"] >= max_attempts:
+                if _finish(path, queue / "failed" / name, entry):
+                    summary.failed += 1
+                else:
+                    summary.lost += 1
+                continue
+            if not path.exists():
+                summary.lost += 1
+                continue
+            _write_json(path, entry)
+            try:
+                os.rename(path, queue / "pending" / name)
+            except FileNotFoundError:
+                summary.lost += 1
+                continue
+            _unlink(_lease_file(path))
+            summary.retried += 1
+            continue
+
+        entry["result"] = result
+        if _finish(path, queue / "done" / name, entry):
+            summary.done += 1
+        else:
+            summary.lost += 1
+
+    return summary
+
+
+@dataclass
+class CampaignReport:
+    """Merged results of a campaign.
+
+    Attributes:
+        results: Completed jobs in manifest order. Each entry holds the
+            job ``id``, the ``job`` itself, the number of ``attempts`` and
+            the ``result`` dictionary (see ``src.server.result_to_dict``).
+        failed: Jobs that exhausted their attempts, with their ``errors``.
+        pending: Number of jobs not yet run.
+        claimed: Number of jobs currently being run.
+    """
+
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    pending: int = 0
+    claimed: int = 0
+
+    @property
+    def complete(self) -> bool:
+        """True if no job is pending or being run."""
+        return self.pending == 0 and self.claimed == 0
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the report as JSON lines, one line per job.
+
+        Completed jobs come first, then failed ones, each in manifest
+        order.
+
+        Args:
+            path: Output path.
+        """
+        with open(path, "w") as f:
+            for entry in self.results + self.failed:
+                f.write(json.dumps(entry) + "\n")
+
+
+def merge_campaign(queue_dir: Union[str, Path]) -> CampaignReport:
+    """Collect the results of a campaign queue into one report.
+
+    The queue can be merged while workers are still running; the report
+    then counts the pending and claimed jobs.
+
+    Args:
+        queue_dir: Queue directory created by ``submit_campaign``.
+
+    Returns:
+        CampaignReport of the queue.
+    """
+    queue = Path(queue_dir)
+
+    def entries(state: str) -> List[Dict[str, Any]]:
+        found = []
+        for path in (queue / state).glob("*.json"):
+            try:
+                found.append(_read_json(path))
+            except FileNotFoundError:
+                continue
+        return sorted(found, key=lambda entry: entry["index"])
+
+    return CampaignReport(
+        results=entries("done"),
+        failed=entries("failed"),
+        pending=sum(1 for _ in (queue / "pending").glob("*.json")),
+        claimed=sum(1 for _ in (queue / "claimed").glob("*.json")),
+    )
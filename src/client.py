@@ -0,0 +1,78 @@
+"""Client for the TailID analysis daemon.
+
+This module only depends on the standard library, so forwarding a run to a
+running daemon (see ``src.server``) does not pay for importing NumPy and
+SciPy in the client process.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+SOCKET_ENV_VAR = "TAILID_SOCKET"
+
+
+def default_socket_path() -> Path:
+    """Return the socket path used when none is given.
+
+    The ``TAILID_SOCKET`` environment variable takes precedence over a
+    per-user path in the system temporary directory.
+    """
+    env = os.environ.get(SOCKET_ENV_VAR)
+    if env:
+        return Path(env)
+    return Path(tempfile.gettempdir()) / f"tailid-{os.getuid()}.sock"
+
+
+def request(
+    payload: Dict[str, Any],
+    socket_path: Optional[Union[str, Path]] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Send one request to a running daemon and wait for its response.
+
+    Args:
+        payload: JSON-serializable request.
+        socket_path: Daemon socket (default: ``default_socket_path()``).
+        timeout: Optional socket timeout in seconds.
+
+    Returns:
+        The decoded response.
+
+    Raises:
+        OSError: If the daemon cannot be reached.
+    """
+    path = Path(socket_path) if socket_path else default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    return json.loads(line)
+
+
+def server_available(
+    socket_path: Optional[Union[str, Path]] = None, timeout: float = 1.0
+) -> bool:
+    """Check whether a daemon answers on the socket.
+
+    Args:
+        socket_path: Daemon socket (default: ``default_socket_path()``).
+        timeout: Socket timeout in seconds.
+
+    Returns:
+        True if the daemon answered a ping.
+    """
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not path.exists():
+        return False
+    try:
+        return bool(request({"op": "ping"}, path, timeout).get("ok"))
+    except (OSError, ValueError):
+        return False
@@ -0,0 +1,51 @@
+"""Loading of sample data files for the TailID algorithm.
+
+This module reads execution time measurements from the text and ``.npy``
+files accepted by the CLI and the analysis daemon.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+def load_data_from_file(file_path: str) -> np.ndarray:
+    """Load numerical data from a text file.
+
+    The file should contain one numerical value per line. Files with a
+    ``.npy`` suffix (e.g. written by ``src.synthetic.write_mixture``) are
+    read through a memory map instead of being parsed as text, keeping
+    their integer or floating dtype.
+
+    Args:
+        file_path: Path to the text file containing the data.
+
+    Returns:
+        NumPy array of the values (float64 for text files).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file contains invalid data.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+
+    if path.suffix == ".npy":
+        data = np.load(file_path, mmap_mode="r")
+        if data.ndim != 1:
+            raise ValueError(
+                f"Invalid data in file {file_path}: expected a 1-D array"
+            )
+        if data.dtype.kind in "iuf":
+            # Integer and float32 traces are analysed in their own dtype.
+            return data
+        return np.asarray(data, dtype=np.float64)
+
+    try:
+        data = np.loadtxt(file_path, dtype=np.float64)
+        if data.ndim == 0:
+            data = np.array([float(data)])
+        return data
+    except ValueError as e:
+        raise ValueError(f"Invalid data in file {file_path}: {e}") from e
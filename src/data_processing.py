@@ -3,13 +3,38 @@
 This module provides helper functions for data processing operations
 used in the TailID algorithm for detecting ID-sensitive points in the
 tail of probability distributions.
+
+Integer and float32 data are not converted to float64: candidates keep the
+dtype of the data and exceedances are returned in ``excess_dtype``, so
+traces of cycle counts stay compact.
 """
 
+from dataclasses import dataclass
+from typing import Tuple
+
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import DTypeLike, NDArray
+
+
+def excess_dtype(dtype: DTypeLike) -> np.dtype:
+    """Return the dtype exceedances of data of the given dtype are kept in.
+
+    Floating dtypes of at least single precision are kept; integer and
+    half-precision data give float32 exceedances.
+
+    Args:
+        dtype: Dtype of the sample data.
+
+    Returns:
+        The floating dtype of the exceedances.
+    """
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.floating):
+        return np.result_type(dtype, np.float32)
+    return np.dtype(np.float32)
 
 
-def quantile(data: NDArray[np.floating], percentile: float) -> float:
+def quantile(data: NDArray[np.number], percentile: float) -> float:
     """Compute the value at specified percentile in data.
 
     Args:
@@ -23,8 +48,8 @@ def quantile(data: NDArray[np.floating], percentile: float) -> float:
 
 
 def select_candidates(
-    data: NDArray[np.floating], percentile: float
-) -> NDArray[np.floating]:
+    data: NDArray[np.number], percentile: float
+) -> NDArray[np.number]:
     """Extract ordered set of values at or above the specified percentile.
 
     Args:
@@ -32,15 +57,147 @@ def select_candidates(
         percentile: Percentile value between 0 and 1.
 
     Returns:
-        Ordered array of candidate values (sorted in ascending order).
+        Ordered array of candidate values (sorted in ascending order), in
+        the dtype of data.
+    """
+    return extract_tail(data, percentile, percentile).candidates
+
+
+@dataclass
+class Tail:
+    """Upper tail of a sample, extracted by ``extract_tail``.
+
+    Attributes:
+        n: Number of samples in the data.
+        t_m: Value at the p_m percentile (as ``quantile(data, p_m)``).
+        t_c1: Value at the p_c1 percentile (as ``quantile(data, p_c1)``).
+        values: All values of the data at or above t_m, sorted in ascending
+            order, in the dtype of the data.
     """
-    threshold = quantile(data, percentile)
-    candidates = data[data >= threshold]
-    return np.sort(candidates)
+
+    n: int
+    t_m: float
+    t_c1: float
+    values: NDArray[np.number]
+
+    @property
+    def candidates(self) -> NDArray[np.number]:
+        """Sorted values at or above t_c1 (as ``select_candidates``)."""
+        return self.values[np.searchsorted(self.values, self.t_c1, "left"):]
+
+    @property
+    def exceedances(self) -> NDArray[np.number]:
+        """Sorted values above t_m, the support of ``excess_set``."""
+        return self.values[np.searchsorted(self.values, self.t_m, "right"):]
+
+
+def order_quantile(
+    top: NDArray[np.number], offset: int, n: int, percentile: float
+) -> float:
+    """Interpolate a percentile from sorted upper order statistics.
+
+    Reproduces the linear method of ``np.quantile`` bit for bit.
+
+    Args:
+        top: Sorted order statistics of the data from rank offset upwards,
+            as returned by ``sorted_upper``.
+        offset: Rank of ``top[0]``.
+        n: Number of samples in the data.
+        percentile: Percentile value between 0 and 1 whose lower rank is
+            at least offset.
+
+    Returns:
+        The value at the specified percentile.
+    """
+    virtual_index = (n - 1) * percentile
+    previous = int(np.floor(virtual_index))
+    following = min(previous + 1, n - 1)
+    gamma = virtual_index - previous
+    a = top[previous - offset]
+    b = top[following - offset]
+    diff = b - a
+    if gamma >= 0.5:
+        return float(b - diff * (1 - gamma))
+    return float(a + diff * gamma)
+
+
+def sorted_upper(
+    data: NDArray[np.number], percentile: float, presorted: bool = False
+) -> Tuple[NDArray[np.number], int]:
+    """Sort the order statistics of data from a percentile upwards.
+
+    One ``np.partition`` pass places the order statistic at the lower rank
+    of the percentile, after which only the values above it are sorted.
+
+    Args:
+        data: Sample data array (not empty).
+        percentile: Percentile value between 0 and 1.
+        presorted: Whether data is already sorted in ascending order. The
+            order statistics are then a view of data and nothing is sorted.
+
+    Returns:
+        Tuple of (sorted order statistics from the rank upwards, rank). Any
+        percentile at or above the given one can be passed with them to
+        ``order_quantile``.
+    """
+    n = len(data)
+    offset = int(np.floor((n - 1) * percentile))
+    if presorted:
+        return data[offset:], offset
+    return np.sort(np.partition(data, offset)[offset:]), offset
+
+
+def extract_tail(
+    data: NDArray[np.number],
+    p_m: float,
+    p_c1: float,
+    presorted: bool = False,
+) -> Tail:
+    """Extract the p_m and p_c1 percentiles and the sorted upper tail.
+
+    One ``np.partition`` pass places the order statistic of the p_m
+    percentile, after which only the values above it are sorted. This
+    costs O(n + k log k) for the k tail values instead of the separate
+    quantile, masking and sorting passes over all n samples.
+
+    Args:
+        data: Sample data array.
+        p_m: Lower percentile between 0 and 1.
+        p_c1: Upper percentile between p_m and 1.
+        presorted: Whether data is already sorted in ascending order. The
+            tail values are then a view of data.
+
+    Returns:
+        Tail of the data.
+
+    Raises:
+        ValueError: If the data is empty or p_m > p_c1.
+    """
+    if p_m > p_c1:
+        raise ValueError("p_m must not be greater than p_c1")
+    data = np.asarray(data).ravel()
+    n = len(data)
+    if n == 0:
+        raise ValueError("data must not be empty")
+
+    top, offset = sorted_upper(data, p_m, presorted)
+    t_m = order_quantile(top, offset, n, p_m)
+    t_c1 = order_quantile(top, offset, n, p_c1)
+    if presorted:
+        values = data[np.searchsorted(data, t_m, "left"):]
+        return Tail(n=n, t_m=t_m, t_c1=t_c1, values=values)
+    values = top[np.searchsorted(top, t_m, "left"):]
+    if offset > 0 and top[0] == t_m:
+        # Values tied with t_m may also sit below the lower rank.
+        n_ties = int(np.count_nonzero(data == t_m)) - (
+            np.searchsorted(top, t_m, "right")
+        )
+        values = np.concatenate([np.full(n_ties, top[0]), values])
+    return Tail(n=n, t_m=t_m, t_c1=t_c1, values=values)
 
 
 def excess_set(
-    data: NDArray[np.floating], threshold: float
+    data: NDArray[np.number], threshold: float
 ) -> NDArray[np.floating]:
     """Compute threshold exceedances (values above threshold minus threshold).
 
@@ -49,7 +206,19 @@ def excess_set(
         threshold: Threshold value for computing excesses.
 
     Returns:
-        Array of exceedances (x_i - threshold for all x_i > threshold).
+        Array of exceedances (x_i - threshold for all x_i > threshold), in
+        ``excess_dtype(data.dtype)``.
     """
-    exceedances = data[data > threshold] - threshold
+    tail = data[data > threshold]
+    # Subtract in float64 so that large integer values lose no precision,
+    # casting into the compact output buffer by buffer-sized chunks rather
+    # than through a float64 temporary of the whole tail.
+    exceedances = np.empty(len(tail), dtype=excess_dtype(data.dtype))
+    np.subtract(
+        tail,
+        threshold,
+        out=exceedances,
+        dtype=np.float64,
+        casting="same_kind",
+    )
     return exceedances
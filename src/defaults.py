@@ -0,0 +1,26 @@
+"""Default parameters shared by the TailID library and its CLI.
+
+This module has no third-party dependencies, so the CLI can build its
+argument parser without importing NumPy or SciPy.
+"""
+
+MOS_DEFAULT = 40
+GAMMA_DEFAULT = 0.9999
+
+CI_METHODS = ("asymptotic", "bootstrap")
+DEFAULT_N_RESAMPLES = 200
+
+KPSS_REGRESSIONS = ("c", "ct")
+KPSS_SIGNIFICANCE = 0.05
+
+RESAMPLING_METHODS = ("subsample", "block")
+DEFAULT_N_STABILITY_RESAMPLES = 1000
+DEFAULT_SUBSAMPLE_FRACTION = 0.5
+DEFAULT_STABILITY_MAX_EXCEEDANCES = 2000
+
+MOS_AUTO = "auto"
+MOS_PRECISION = 0.25
+MOS_CONFIDENCE = 0.9
+DEFAULT_N_MOS_SIMULATIONS = 1000
+
+EXECUTOR_BACKENDS = ("auto", "thread", "process")
@@ -0,0 +1,211 @@
+"""Single-pass ingest of multi-column trace logs grouped by task.
+
+Collectors often write one CSV/TSV log with a row per measurement and
+columns such as task id, core, path and cycle count. ``load_groups`` reads
+such a log once, in chunks of rows: each chunk is projected onto the
+columns the grouping, filters and values need, rows failing a
+``Predicate`` are dropped, and the values are split by key into per-group
+arrays in a compact dtype. Each group is a plain sample array that can be
+passed to ``select_threshold``, ``tail_id`` or ``run_analysis``.
+"""
+
+import csv
+import operator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+DEFAULT_CHUNK_ROWS = 65536
+
+Column = Union[str, int]
+GroupKey = Tuple[str, ...]
+
+_OPERATORS: Dict[str, Callable[..., NDArray[np.bool_]]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """Row filter comparing one column with a constant.
+
+    The comparison is numeric when the constant is a number and a string
+    comparison otherwise.
+
+    Attributes:
+        column: Column name (with a header) or index.
+        op: One of ``==``, ``!=``, ``<``, ``<=``, ``>`` and ``>=``.
+        value: Constant the column is compared with.
+    """
+
+    column: Column
+    op: str
+    value: Union[str, float]
+
+    def __post_init__(self) -> None:
+        if self.op not in _OPERATORS:
+            raise ValueError(
+                f"op must be one of {', '.join(_OPERATORS)}, got {self.op!r}"
+            )
+
+    @classmethod
+    def parse(cls, text: str) -> "Predicate":
+        """Parse a predicate such as ``core==0`` or ``path!=slow``.
+
+        Args:
+            text: Column, operator and value without separators.
+
+        Returns:
+            The predicate. Values that parse as numbers are numeric.
+
+        Raises:
+            ValueError: If the text contains no operator.
+        """
+        for op in sorted(_OPERATORS, key=len, reverse=True):
+            column, sep, value = text.partition(op)
+            if sep and column:
+                constant: Union[str, float]
+                try:
+                    constant = float(value)
+                except ValueError:
+                    constant = value
+                return cls(column.strip(), op, constant)
+        raise ValueError(f"expected COLUMN OP VALUE, got {text!r}")
+
+    def evaluate(self, column: NDArray[np.str_]) -> NDArray[np.bool_]:
+        """Evaluate the predicate on the values of its column.
+
+        Args:
+            column: Column values of a chunk, as strings.
+
+        Returns:
+            Boolean mask of the rows that pass.
+        """
+        compare = _OPERATORS[self.op]
+        if isinstance(self.value, float):
+            return compare(column.astype(np.float64), self.value)
+        return compare(column, self.value)
+
+
+def _delimiter(path: Path) -> str:
+    """Return the delimiter of a log from its suffix."""
+    return "\t" if path.suffix in (".tsv", ".tab") else ","
+
+
+def _column_index(column: Column, header: Optional[List[str]]) -> int:
+    """Resolve a column name or index to an index."""
+    if isinstance(column, int):
+        return column
+    if header is None:
+        raise ValueError(f"column {column!r} needs a header row")
+    try:
+        return header.index(column)
+    except ValueError as e:
+        raise ValueError(f"no column {column!r} in the header") from e
+
+
+def load_groups(
+    file_path: Union[str, Path],
+    value_column: Column,
+    key_columns: Sequence[Column] = (),
+    where: Sequence[Predicate] = (),
+    dtype: DTypeLike = np.float64,
+    delimiter: Optional[str] = None,
+    header: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Dict[GroupKey, NDArray[np.number]]:
+    """Read a multi-column log and group its values by key in one pass.
+
+    Only the projected columns of a chunk are converted: the value column
+    to ``dtype``, the key columns to strings, and the predicate columns
+    as their predicates require. The values of each chunk are split by
+    key with one stable argsort, and the per-group pieces are concatenated
+    once at the end, so memory holds the grouped values plus one chunk of
+    rows.
+
+    Args:
+        file_path: CSV or TSV log.
+        value_column: Column of the measurements (name or index).
+        key_columns: Columns whose values identify a group. Without them
+            all rows form one group with the empty key.
+        where: Predicates every kept row satisfies.
+        dtype: Dtype of the grouped values (default: float64). Integer
+            dtypes keep cycle counts compact.
+        delimiter: Field delimiter. Defaults to a tab for ``.tsv`` and
+            ``.tab`` files and to a comma otherwise.
+        header: Whether the first row holds the column names
+            (default: True). Columns can only be named with a header.
+        chunk_rows: Number of rows read and converted at once.
+
+    Returns:
+        Dictionary from group key (tuple of key column values) to the
+        values of the group in file order, sorted by key.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If a column is unknown or a row cannot be converted.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    if delimiter is None:
+        delimiter = _delimiter(path)
+
+    pieces: Dict[GroupKey, List[NDArray[np.number]]] = {}
+    with open(path, newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        names = next(reader, None) if header else None
+        # Projected columns: the value, then the keys, then the filters.
+        projected = [value_column, *key_columns, *(p.column for p in where)]
+        indices = [_column_index(c, names) for c in projected]
+        project = operator.itemgetter(*indices)
+        n_keys = len(key_columns)
+
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                break
+            try:
+                table = np.array(
+                    [project(row) for row in rows if row], dtype=str
+                ).reshape(-1, len(indices))
+                mask = np.ones(len(table), dtype=bool)
+                for i, predicate in enumerate(where, 1 + n_keys):
+                    mask &= predicate.evaluate(table[:, i])
+                table = table[mask]
+                values = table[:, 0].astype(dtype)
+            except (IndexError, ValueError) as e:
+                raise ValueError(
+                    f"Invalid data in file {file_path} before line "
+                    f"{reader.line_num}: {e}"
+                ) from e
+
+            if n_keys == 0:
+                pieces.setdefault((), []).append(values)
+                continue
+            keys, inverse = np.unique(
+                table[:, 1:1 + n_keys], axis=0, return_inverse=True
+            )
+            inverse = inverse.ravel()
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.cumsum(np.bincount(inverse, minlength=len(keys)))
+            for key, part in zip(
+                keys, np.split(values[order], bounds[:-1])
+            ):
+                pieces.setdefault(tuple(key.tolist()), []).append(part)
+
+    return {
+        key: np.concatenate(pieces[key]).astype(dtype, copy=False)
+        for key in sorted(pieces)
+    }
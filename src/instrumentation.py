@@ -0,0 +1,210 @@
+"""Opt-in per-stage timing and counter instrumentation for TailID runs.
+
+This module provides the ``RunStats`` collector that threshold selection,
+the TailID algorithm and GPD fitting update when one is passed to them.
+When no collector is passed, the instrumented code paths only perform a
+``None`` check, so instrumentation costs nothing when disabled.
+
+It also provides ``Deadline``, the time budget those stages stop at when
+one is passed to them.
+"""
+
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+StageHook = Callable[[str, float], None]
+
+# Called as ``progress(done, total)`` after each candidate is processed.
+ProgressHook = Callable[[int, int], None]
+
+_NULL_STAGE: AbstractContextManager = nullcontext()
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised inside a computation whose deadline has passed."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Point in time a computation has to finish by.
+
+    Stages given a deadline check it between candidates, and GPD fits
+    check it after every optimizer iteration, so a run stops shortly after
+    the deadline passes and returns a result flagged as partial.
+
+    Attributes:
+        at: Deadline on the ``time.monotonic`` clock.
+    """
+
+    at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Return the deadline the given number of seconds from now.
+
+        Args:
+            seconds: Time budget in seconds.
+
+        Raises:
+            ValueError: If seconds is negative.
+        """
+        if seconds < 0:
+            raise ValueError("time budget must be non-negative")
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline (0 once it has passed)."""
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Return True once the deadline has passed."""
+        return time.monotonic() >= self.at
+
+    def check(self, *args: object) -> None:
+        """Raise ``DeadlineExceeded`` once the deadline has passed.
+
+        Accepts and ignores arguments, so it can be passed as an optimizer
+        callback.
+        """
+        if self.expired():
+            raise DeadlineExceeded("time budget exhausted")
+
+    def share(self, fraction: float) -> "Deadline":
+        """Return the deadline of a stage given a share of the time left.
+
+        Args:
+            fraction: Share of the remaining time, between 0 and 1.
+        """
+        now = time.monotonic()
+        return Deadline(min(self.at, now + fraction * max(0.0, self.at - now)))
+
+
+@dataclass
+class RunStats:
+    """Counters and per-stage wall times collected during a run.
+
+    Stage names are dotted paths (e.g. ``"tail_id.fit"``); a stage entered
+    several times accumulates its wall time.
+
+    Attributes:
+        stage_times: Accumulated wall time in seconds per stage.
+        stage_calls: Number of times each stage was entered.
+        n_fits: Number of GPD fits performed.
+        optimizer_iterations: Total optimizer iterations over all fits.
+        optimizer_failures: Number of fits whose optimizer did not converge
+            or raised an error.
+        bytes_copied: Bytes of intermediate arrays materialized.
+        hook: Optional callback invoked as ``hook(stage, seconds)`` each
+            time a stage completes.
+    """
+
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    stage_calls: Dict[str, int] = field(default_factory=dict)
+    n_fits: int = 0
+    optimizer_iterations: int = 0
+    optimizer_failures: int = 0
+    bytes_copied: int = 0
+    hook: Optional[StageHook] = field(
+        default=None, repr=False, compare=False
+    )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as the given stage.
+
+        Args:
+            name: Dotted stage name.
+        """
+        # Register on entry so the breakdown lists stages in entry order.
+        self.stage_times.setdefault(name, 0.0)
+        self.stage_calls.setdefault(name, 0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_times[name] += elapsed
+            self.stage_calls[name] += 1
+            if self.hook is not None:
+                self.hook(name, elapsed)
+
+    def record_fit(self, iterations: int, failed: bool = False) -> None:
+        """Record one GPD fit.
+
+        Args:
+            iterations: Number of optimizer iterations used by the fit.
+            failed: Whether the optimizer failed to converge.
+        """
+        self.n_fits += 1
+        self.optimizer_iterations += iterations
+        if failed:
+            self.optimizer_failures += 1
+
+    def record_copy(self, array: np.ndarray) -> None:
+        """Record the materialization of an intermediate array.
+
+        Args:
+            array: The newly allocated array.
+        """
+        self.bytes_copied += array.nbytes
+
+    def merge(self, other: "RunStats") -> None:
+        """Add the timings and counters of another collector to this one.
+
+        Used for collectors filled by pool workers; the stage times of
+        concurrent workers add up and can exceed the wall time.
+
+        Args:
+            other: Collector to add.
+        """
+        for name, seconds in other.stage_times.items():
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + seconds
+            self.stage_calls[name] = (
+                self.stage_calls.get(name, 0) + other.stage_calls[name]
+            )
+        self.n_fits += other.n_fits
+        self.optimizer_iterations += other.optimizer_iterations
+        self.optimizer_failures += other.optimizer_failures
+        self.bytes_copied += other.bytes_copied
+
+    def format_breakdown(self) -> str:
+        """Format the collected statistics as a human-readable table.
+
+        Returns:
+            Multi-line string with one row per stage followed by counters.
+        """
+        total = sum(
+            t for name, t in self.stage_times.items() if "." not in name
+        )
+        lines = [f"  {'stage':<32} {'calls':>7} {'seconds':>10} {'%':>6}"]
+        for name, seconds in self.stage_times.items():
+            share = 100.0 * seconds / total if total > 0 else 0.0
+            indent = "  " * name.count(".")
+            lines.append(
+                f"  {indent + name:<32} {self.stage_calls[name]:>7} "
+                f"{seconds:>10.4f} {share:>6.1f}"
+            )
+        lines.append(f"  GPD fits: {self.n_fits}")
+        lines.append(f"  Optimizer iterations: {self.optimizer_iterations}")
+        lines.append(f"  Optimizer failures: {self.optimizer_failures}")
+        lines.append(f"  Bytes copied: {self.bytes_copied}")
+        return "\n".join(lines)
+
+
+def stage(stats: Optional[RunStats], name: str) -> AbstractContextManager:
+    """Return a context manager timing a stage, or a no-op when disabled.
+
+    Args:
+        stats: Collector to update, or None when instrumentation is off.
+        name: Dotted stage name.
+
+    Returns:
+        A context manager timing the enclosed block.
+    """
+    if stats is None:
+        return _NULL_STAGE
+    return stats.stage(name)
@@ -0,0 +1,251 @@
+"""KPSS stationarity test for large execution time traces.
+
+The TailID paper recommends combining a Scenario 1 outcome with the
+Kwiatkowski-Phillips-Schmidt-Shin (KPSS) test. This module implements the
+test with the Bartlett-kernel long-run variance estimated from
+autocovariances obtained by FFT, which costs O(n log n) instead of the
+O(n * lags) of the direct sums. ``KPSSAccumulator`` computes the level
+stationarity test over a stream of chunks, so traces that do not fit in
+memory can be tested in one pass.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.defaults import KPSS_REGRESSIONS, KPSS_SIGNIFICANCE
+
+# Asymptotic critical values from Kwiatkowski et al. (1992), Table 1.
+_P_VALUES = (0.10, 0.05, 0.025, 0.01)
+_CRITICAL_VALUES = {
+    "c": (0.347, 0.463, 0.574, 0.739),
+    "ct": (0.119, 0.146, 0.176, 0.216),
+}
+
+
+@dataclass
+class KPSSResult:
+    """Result of a KPSS stationarity test.
+
+    Attributes:
+        statistic: The KPSS statistic.
+        p_value: Interpolated p-value. Values beyond the tabulated
+            critical values are reported as 0.01 or 0.10.
+        lags: Number of autocovariance lags of the long-run variance.
+        regression: ``"c"`` (level stationarity) or ``"ct"`` (trend
+            stationarity).
+        critical_values: Critical values by significance level.
+    """
+
+    statistic: float
+    p_value: float
+    lags: int
+    regression: str
+    critical_values: Dict[str, float] = field(default_factory=dict)
+
+    def stationary(self, significance: float = KPSS_SIGNIFICANCE) -> bool:
+        """Return True if stationarity is not rejected at the given level.
+
+        Args:
+            significance: Significance level of the test (default: 0.05).
+        """
+        return self.p_value >= significance
+
+
+def default_lags(n: int) -> int:
+    """Return the lag truncation ``ceil(12 * (n / 100) ** (1 / 4))``.
+
+    Args:
+        n: Number of observations.
+
+    Returns:
+        Number of autocovariance lags, less than n.
+    """
+    return max(0, min(n - 1, math.ceil(12 * (n / 100.0) ** 0.25)))
+
+
+def _make_result(statistic: float, lags: int, regression: str) -> KPSSResult:
+    """Attach the p-value and critical values to a KPSS statistic."""
+    critical = _CRITICAL_VALUES[regression]
+    p_value = float(np.interp(statistic, critical, _P_VALUES))
+    return KPSSResult(
+        statistic=statistic,
+        p_value=p_value,
+        lags=lags,
+        regression=regression,
+        critical_values={
+            f"{p * 100:g}%": c for p, c in zip(_P_VALUES, critical)
+        },
+    )
+
+
+def _long_run_variance(autocovariances: NDArray[np.floating]) -> float:
+    """Bartlett-kernel long-run variance from autocovariances 0..lags."""
+    lags = len(autocovariances) - 1
+    weights = 1.0 - np.arange(1, lags + 1) / (lags + 1.0)
+    return float(
+        autocovariances[0] + 2.0 * np.dot(weights, autocovariances[1:])
+    )
+
+
+def kpss_test(
+    x: NDArray[np.floating],
+    regression: str = "c",
+    lags: Optional[int] = None,
+) -> KPSSResult:
+    """Run the KPSS test for level or trend stationarity.
+
+    The null hypothesis is that x is stationary around a level
+    (``regression="c"``) or a linear trend (``regression="ct"``).
+
+    Args:
+        x: Time-ordered observations.
+        regression: ``"c"`` (default) or ``"ct"``.
+        lags: Number of autocovariance lags of the long-run variance
+            (default: ``default_lags(len(x))``).
+
+    Returns:
+        KPSSResult of the test.
+
+    Raises:
+        ValueError: If the regression is unknown, x has fewer than 3
+            observations, or lags is not in [0, len(x)).
+    """
+    if regression not in KPSS_REGRESSIONS:
+        raise ValueError(
+            f"regression must be one of {', '.join(KPSS_REGRESSIONS)}"
+        )
+    n = len(x)
+    if n < 3:
+        raise ValueError("KPSS test requires at least 3 observations")
+    if lags is None:
+        lags = default_lags(n)
+    if not (0 <= lags < n):
+        raise ValueError("lags must be between 0 and len(x) - 1")
+
+    x = np.asarray(x, dtype=np.float64)
+    if regression == "c":
+        residuals = x - x.mean()
+    else:
+        t = np.arange(n, dtype=np.float64)
+        design = np.column_stack([np.ones(n), t])
+        coef = np.linalg.lstsq(design, x, rcond=None)[0]
+        residuals = x - design @ coef
+
+    partial_sums = np.cumsum(residuals)
+
+    # Zero-pad so the circular correlation does not wrap for lags < n.
+    n_fft = 1 << (n + lags).bit_length()
+    spectrum = np.fft.rfft(residuals, n_fft)
+    autocovariances = (
+        np.fft.irfft(spectrum.real**2 + spectrum.imag**2, n_fft)[: lags + 1]
+        / n
+    )
+
+    statistic = float(
+        np.dot(partial_sums, partial_sums)
+        / (n * n * _long_run_variance(autocovariances))
+    )
+    return _make_result(statistic, lags, regression)
+
+
+class KPSSAccumulator:
+    """One-pass KPSS level stationarity test over a stream of chunks.
+
+    The partial-sum statistic and the lagged products of the long-run
+    variance are accumulated per chunk, keeping only the first and last
+    ``lags`` observations between chunks, so memory does not grow with the
+    length of the trace. The result equals ``kpss_test`` applied to the
+    concatenated chunks with ``regression="c"``.
+
+    Args:
+        lags: Number of autocovariance lags of the long-run variance. Use
+            ``default_lags`` with the expected trace length.
+    """
+
+    def __init__(self, lags: int) -> None:
+        if lags < 0:
+            raise ValueError("lags must be non-negative")
+        self.lags = lags
+        self.n = 0
+        # Observations are shifted by the mean of the first chunk to keep
+        # the accumulated partial sums small.
+        self._shift = 0.0
+        self._total = 0.0
+        self._partial = 0.0
+        self._sum_p2 = 0.0
+        self._sum_tp = 0.0
+        self._lagged = np.zeros(lags + 1)
+        self._head = np.empty(0)
+        self._tail = np.zeros(lags)
+
+    def update(self, chunk: NDArray[np.floating]) -> None:
+        """Add the next chunk of observations.
+
+        Args:
+            chunk: Observations following those already added.
+        """
+        y = np.asarray(chunk, dtype=np.float64)
+        m = len(y)
+        if m == 0:
+            return
+        if self.n == 0:
+            self._shift = float(y.mean())
+        y = y - self._shift
+
+        partial_sums = self._partial + np.cumsum(y)
+        t = np.arange(self.n + 1, self.n + m + 1, dtype=np.float64)
+        self._sum_p2 += float(np.dot(partial_sums, partial_sums))
+        self._sum_tp += float(np.dot(t, partial_sums))
+        self._partial = float(partial_sums[-1])
+
+        # r[d] = sum_i y[i] * buf[i + d] pairs every observation of the
+        # chunk with the one lags - d positions before it.
+        buf = np.concatenate([self._tail, y])
+        n_fft = 1 << len(buf).bit_length()
+        r = np.fft.irfft(
+            np.fft.rfft(buf, n_fft) * np.conj(np.fft.rfft(y, n_fft)), n_fft
+        )
+        self._lagged += r[self.lags::-1]
+
+        if len(self._head) < self.lags:
+            self._head = np.concatenate(
+                [self._head, y[: self.lags - len(self._head)]]
+            )
+        self._tail = buf[len(buf) - self.lags:]
+        self._total += float(y.sum())
+        self.n += m
+
+    def result(self) -> KPSSResult:
+        """Return the KPSS level stationarity test of the data added so far.
+
+        Raises:
+            ValueError: If fewer than max(3, lags + 1) observations were
+                added.
+        """
+        n = self.n
+        if n < 3 or n <= self.lags:
+            raise ValueError(
+                "KPSS test requires at least 3 observations and more "
+                "observations than lags"
+            )
+        mean = self._total / n
+        sum_t2 = n * (n + 1) * (2 * n + 1) / 6.0
+        sum_s2 = (
+            self._sum_p2 - 2.0 * mean * self._sum_tp + mean * mean * sum_t2
+        )
+
+        k = np.arange(self.lags + 1)
+        head_sums = np.concatenate([[0.0], np.cumsum(self._head)])
+        tail_sums = np.concatenate([[0.0], np.cumsum(self._tail[::-1])])
+        autocovariances = (
+            self._lagged
+            - mean * (2.0 * self._total - head_sums - tail_sums)
+            + (n - k) * mean * mean
+        ) / n
+
+        statistic = sum_s2 / (n * n * _long_run_variance(autocovariances))
+        return _make_result(float(statistic), self.lags, "c")
@@ -0,0 +1,168 @@
+"""Data-driven estimation of the Minimum of Samples (MoS).
+
+TailID classifies its outcome by comparing |S| with the minimum number of
+exceedances needed for a precise EVI estimate. The paper sets it to 40 and
+notes that it depends on the tail profile, typically between 40 and 70.
+``estimate_mos`` determines it for a fitted tail by simulation: GPD samples
+with the fitted shape are drawn and fitted by maximum likelihood, the
+estimator TailID itself uses, with its batched form ``fit_gpd_mle_batch``,
+and the MoS is the smallest exceedance count at which the EVI estimates
+reach a target precision.
+
+The estimators are scale invariant, so the samples are drawn with unit
+scale. Simulations are split into fixed-size blocks, each with its own
+random stream derived from the seed, and the blocks can be spread over an
+executor. Every candidate count reuses the leading columns of the same
+uniform draws, so the precision decreases smoothly with the count and the
+smallest count is located by bisection.
+"""
+
+from concurrent.futures import Executor
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.defaults import (
+    DEFAULT_N_MOS_SIMULATIONS,
+    MOS_CONFIDENCE,
+    MOS_PRECISION,
+)
+from src.gpd_statistics import fit_gpd_mle_batch
+
+MOS_MIN_SIZE = 10
+MOS_MAX_SIZE = 500
+
+_SIMULATION_BLOCK = 250
+
+
+def _simulation_errors(
+    shape: float, size: int, rows: int, max_size: int, seed: int, index: int
+) -> NDArray[np.floating]:
+    """Fit one block of simulated samples and return their EVI errors."""
+    rng = np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=(index,))
+    )
+    u = rng.random((rows, max_size))[:, :size]
+    if shape == 0:
+        samples = -np.log1p(-u)
+    else:
+        samples = np.expm1(-shape * np.log1p(-u)) / shape
+    estimates, _ = fit_gpd_mle_batch(samples)
+    return np.abs(estimates - shape)
+
+
+def evi_error_quantile(
+    shape: float,
+    size: int,
+    confidence: float = MOS_CONFIDENCE,
+    n_simulations: int = DEFAULT_N_MOS_SIMULATIONS,
+    max_size: Optional[int] = None,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+) -> float:
+    """Simulate the absolute EVI estimation error at an exceedance count.
+
+    Args:
+        shape: EVI of the simulated GPD.
+        size: Number of exceedances of each simulated sample (at least 2).
+        confidence: Quantile level of the error (default: 0.9).
+        n_simulations: Number of simulated samples (default: 1000).
+        max_size: Number of uniform draws per simulated sample, of which
+            the first ``size`` are used. Calls with the same ``max_size``
+            and seed share their draws. Defaults to ``size``.
+        seed: Seed of the simulation streams.
+        executor: Optional executor (e.g. a ``ProcessPoolExecutor``) the
+            simulation blocks are submitted to. Blocks run inline when None.
+
+    Returns:
+        The ``confidence`` quantile of the absolute EVI errors.
+    """
+    max_size = size if max_size is None else max_size
+    rows = [
+        min(_SIMULATION_BLOCK, n_simulations - start)
+        for start in range(0, n_simulations, _SIMULATION_BLOCK)
+    ]
+    if executor is None:
+        blocks = [
+            _simulation_errors(shape, size, n, max_size, seed, i)
+            for i, n in enumerate(rows)
+        ]
+    else:
+        futures = [
+            executor.submit(
+                _simulation_errors, shape, size, n, max_size, seed, i
+            )
+            for i, n in enumerate(rows)
+        ]
+        blocks = [f.result() for f in futures]
+    return float(np.quantile(np.concatenate(blocks), confidence))
+
+
+def estimate_mos(
+    shape: float,
+    precision: float = MOS_PRECISION,
+    confidence: float = MOS_CONFIDENCE,
+    n_simulations: int = DEFAULT_N_MOS_SIMULATIONS,
+    min_size: int = MOS_MIN_SIZE,
+    max_size: int = MOS_MAX_SIZE,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Estimate the MoS of a tail with the given EVI.
+
+    The MoS is the smallest exceedance count at which the ``confidence``
+    quantile of the absolute EVI estimation error is at most
+    ``precision`` (see ``evi_error_quantile``). With the defaults it is
+    about 58 for short tails (xi = -0.5), 64 for xi = 0 and 73 for
+    xi = 0.2.
+
+    Args:
+        shape: EVI of the fitted tail, e.g. ``TailIDResult.fit.shape``.
+        precision: Target absolute EVI error (default: 0.25).
+        confidence: Probability with which the error must stay within the
+            target (default: 0.9).
+        n_simulations: Number of simulated samples per exceedance count
+            (default: 1000).
+        min_size: Smallest exceedance count considered (default: 10).
+        max_size: Largest exceedance count considered, returned when even
+            it does not reach the target (default: 500).
+        seed: Seed of the simulation streams.
+        executor: Optional executor the simulation blocks are spread over.
+
+    Returns:
+        The estimated MoS.
+
+    Raises:
+        ValueError: If the parameters are out of their valid ranges.
+    """
+    if not np.isfinite(shape):
+        raise ValueError("shape must be finite")
+    if precision <= 0:
+        raise ValueError("precision must be positive")
+    if not (0 < confidence < 1):
+        raise ValueError("confidence must be between 0 and 1 (exclusive)")
+    if n_simulations < 1:
+        raise ValueError("n_simulations must be positive")
+    if not (2 <= min_size <= max_size):
+        raise ValueError("min_size must be at least 2 and at most max_size")
+
+    def reached(size: int) -> bool:
+        error = evi_error_quantile(
+            shape, size, confidence, n_simulations, max_size, seed, executor
+        )
+        return error <= precision
+
+    if not reached(max_size):
+        return max_size
+    if reached(min_size):
+        return min_size
+    # The target is missed at lo and reached at hi.
+    lo, hi = min_size, max_size
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if reached(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
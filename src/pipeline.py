@@ -0,0 +1,279 @@
+"""End-to-end TailID pipeline: threshold selection followed by TailID.
+
+This module chains ``select_threshold`` and ``tail_id`` the same way the
+CLI does, for callers that analyse many traces or many parts of a trace.
+``detect_components`` repeats the pipeline below each detected tail
+threshold to find the earlier mixture components as well.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.defaults import GAMMA_DEFAULT, MOS_DEFAULT
+from src.gpd_statistics import GPDFit
+from src.instrumentation import Deadline, RunStats, stage
+from src.tailid import TailIDResult, TailIDScenario, tail_id
+from src.threshold_selection import evaluate_thresholds
+from src.tracing import TraceSink
+
+# Bounds of the share of a time budget given to threshold selection.
+_MIN_SELECTION_SHARE = 0.25
+_MAX_SELECTION_SHARE = 0.75
+
+
+@dataclass
+class AnalysisResult:
+    """Result of the full TailID pipeline.
+
+    Attributes:
+        p_m: Extreme value percentile selected by EQMAE minimization.
+        result: The TailID result obtained with ``p_m``.
+        partial: Whether a deadline stopped threshold selection or TailID
+            early. p_m is then the best candidate scored in time, and the
+            result covers the candidates processed in time.
+    """
+
+    p_m: float
+    result: TailIDResult
+    partial: bool = False
+
+
+def selection_share(n: int, n_candidates: int, p_c1: float) -> float:
+    """Share of a time budget given to threshold selection.
+
+    Both stages are dominated by GPD fits to exceedance sets of comparable
+    size, so the budget is split by the number of fits each stage makes at
+    most: one per candidate threshold, and one per candidate point above
+    the p_c1 quantile plus the baseline fit. The share is kept within
+    0.25 and 0.75, as TailID often stops at an early candidate. Time the
+    selection does not use is left to TailID.
+
+    Args:
+        n: Number of samples.
+        n_candidates: Number of candidate thresholds.
+        p_c1: Candidate percentile of TailID.
+
+    Returns:
+        Share of the remaining time, between 0.25 and 0.75.
+    """
+    tail_fits = n * (1 - p_c1) + 1
+    share = n_candidates / (n_candidates + tail_fits)
+    return min(_MAX_SELECTION_SHARE, max(_MIN_SELECTION_SHARE, share))
+
+
+def run_analysis(
+    data: NDArray[np.floating],
+    p_c1: float,
+    n_candidates: int,
+    gamma: float = GAMMA_DEFAULT,
+    mos: Union[int, str] = MOS_DEFAULT,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    deadline: Optional[Deadline] = None,
+    presorted: bool = False,
+) -> AnalysisResult:
+    """Select p_m by EQMAE minimization and run TailID with it.
+
+    With a deadline, threshold selection stops at a share of the remaining
+    time (see ``selection_share``) and TailID at the deadline itself, so
+    the run always returns, possibly with a partial result.
+
+    Args:
+        data: Sample data for analysis (execution time measurements).
+        p_c1: Candidate percentile (0 < p_c1 < 1).
+        n_candidates: Number of candidate thresholds for p_m selection.
+        gamma: Confidence level (default: 0.9999).
+        mos: Minimum of Samples threshold (default: 40), or
+            ``"auto"`` to estimate it (see ``tail_id``).
+        stats: Optional collector for per-stage timings and fit counters.
+        trace: Optional sink receiving one record per GPD fit.
+        deadline: Optional deadline of the whole analysis.
+        presorted: Whether data is already sorted in ascending order, in
+            which case neither stage sorts it.
+
+    Returns:
+        AnalysisResult with the selected p_m and the TailID result.
+
+    Raises:
+        ValueError: If the parameters are out of their valid ranges.
+    """
+    return _analyse(
+        data,
+        p_c1,
+        n_candidates,
+        gamma,
+        mos,
+        stats,
+        trace,
+        deadline,
+        presorted=presorted,
+    )
+
+
+def _analyse(
+    data: NDArray[np.number],
+    p_c1: float,
+    n_candidates: int,
+    gamma: float,
+    mos: Union[int, str],
+    stats: Optional[RunStats],
+    trace: Optional[TraceSink],
+    deadline: Optional[Deadline],
+    presorted: bool = False,
+    initial_fit: Optional[GPDFit] = None,
+) -> AnalysisResult:
+    """Run threshold selection and TailID (see ``run_analysis``)."""
+    selection_deadline = None
+    if deadline is not None:
+        selection_deadline = deadline.share(
+            selection_share(len(data), n_candidates, p_c1)
+        )
+    selection = evaluate_thresholds(
+        data,
+        n_candidates=n_candidates,
+        stats=stats,
+        trace=trace,
+        deadline=selection_deadline,
+        presorted=presorted,
+        initial_fit=initial_fit,
+    )
+    p_m = selection.p_m
+    result = tail_id(
+        x=data,
+        p_m=p_m,
+        p_c1=p_c1,
+        gamma=gamma,
+        mos=mos,
+        stats=stats,
+        trace=trace,
+        deadline=deadline,
+        presorted=presorted,
+    )
+    return AnalysisResult(
+        p_m=p_m, result=result, partial=selection.partial or result.partial
+    )
+
+
+@dataclass
+class ComponentAnalysis:
+    """Result of recursive mixture detection by ``detect_components``.
+
+    Attributes:
+        levels: Pipeline result of each level, from the full data down.
+            Every level but the last is in Scenario 2, and each level
+            analyses the samples below the tail threshold of the previous
+            one.
+        sizes: Number of samples analysed at each level.
+    """
+
+    levels: List[AnalysisResult]
+    sizes: List[int]
+
+    @property
+    def thresholds(self) -> List[float]:
+        """Tail thresholds of the detected components, in descending order.
+
+        Each threshold is the lowest value of its component, which extends
+        up to the threshold of the component above it (to the maximum for
+        the first one).
+        """
+        return [
+            level.result.tail_threshold
+            for level in self.levels
+            if level.result.tail_threshold is not None
+        ]
+
+    @property
+    def partial(self) -> bool:
+        """Whether a deadline stopped the last level early."""
+        return self.levels[-1].partial
+
+
+def detect_components(
+    data: NDArray[np.number],
+    p_c1: float,
+    n_candidates: int,
+    gamma: float = GAMMA_DEFAULT,
+    mos: Union[int, str] = MOS_DEFAULT,
+    max_levels: Optional[int] = None,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    deadline: Optional[Deadline] = None,
+) -> ComponentAnalysis:
+    """Detect the mixture components of a tail one after the other.
+
+    ``run_analysis`` finds the last mixture component: in Scenario 2, its
+    tail threshold is the first sensitive point. This function then runs
+    the pipeline again on the samples below that threshold, and repeats
+    until a level is not in Scenario 2. Each level is exactly the analysis
+    ``run_analysis`` gives on the truncated data, except that the first
+    EQMAE fit of a level starts from the last accepted TailID fit of the
+    level above, which was fitted to exceedances of the same samples.
+
+    The data is sorted once. Every level analyses a prefix of the sorted
+    array, so quantiles are read off it by index and the tails of threshold
+    selection and TailID are views of it: no level sorts, partitions or
+    copies the data again. Since a Scenario 2 level has more than MoS
+    sensitive points, every level is smaller than the previous one by more
+    than MoS samples and the recursion ends.
+
+    Args:
+        data: Sample data for analysis (execution time measurements).
+        p_c1: Candidate percentile (0 < p_c1 < 1).
+        n_candidates: Number of candidate thresholds for p_m selection.
+        gamma: Confidence level (default: 0.9999).
+        mos: Minimum of Samples threshold (default: 40), or
+            ``"auto"`` to estimate it at each level (see ``tail_id``).
+        max_levels: Optional maximum number of levels to analyse.
+        stats: Optional collector for per-stage timings and fit counters,
+            accumulated over the levels.
+        trace: Optional sink receiving one record per GPD fit.
+        deadline: Optional deadline of the whole detection. The level it
+            interrupts is partial and ends the recursion.
+
+    Returns:
+        ComponentAnalysis with the result of every level.
+
+    Raises:
+        ValueError: If the parameters are out of their valid ranges.
+    """
+    if max_levels is not None and max_levels < 1:
+        raise ValueError("max_levels must be positive")
+    with stage(stats, "components.sort"):
+        values = np.sort(np.asarray(data).ravel())
+    if stats is not None:
+        stats.record_copy(values)
+
+    levels: List[AnalysisResult] = []
+    sizes: List[int] = []
+    n = len(values)
+    initial_fit: Optional[GPDFit] = None
+    while True:
+        analysis = _analyse(
+            values[:n],
+            p_c1,
+            n_candidates,
+            gamma,
+            mos,
+            stats,
+            trace,
+            deadline,
+            presorted=True,
+            initial_fit=initial_fit,
+        )
+        levels.append(analysis)
+        sizes.append(n)
+        result = analysis.result
+        if (
+            analysis.partial
+            or result.scenario != TailIDScenario.SCENARIO_2
+            or len(levels) == max_levels
+        ):
+            break
+        assert result.tail_threshold is not None
+        n = int(np.searchsorted(values[:n], result.tail_threshold, "left"))
+        initial_fit = result.fit
+    return ComponentAnalysis(levels=levels, sizes=sizes)
@@ -0,0 +1,262 @@
+"""pWCET estimation on top of the TailID outcome.
+
+Once TailID has validated the tail (Scenario 1) or located the last mixture
+component (Scenario 2), the probabilistic Worst-Case Execution Time (pWCET)
+curve gives the execution time exceeded with each probability of a grid.
+This module evaluates the curve from the GPD fit TailID already produced,
+for whole probability grids and many tasks in one vectorized call, and
+optionally derives bootstrap confidence bands.
+"""
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.data_processing import excess_set
+from src.defaults import DEFAULT_N_RESAMPLES
+from src.gpd_statistics import (
+    GPDFit,
+    bootstrap_gpd_fits,
+    fit_gpd,
+    fit_gpd_batch,
+)
+from src.tailid import TailIDResult, TailIDScenario
+
+DEFAULT_EXCEEDANCE_PROBABILITIES = np.logspace(-3, -15, 13)
+
+_SHAPE_EPS = 1e-12
+
+
+@dataclass
+class PWCETCurve:
+    """pWCET curve of one task.
+
+    Attributes:
+        probabilities: Exceedance probabilities of the grid.
+        pwcet: Execution time exceeded with each probability. NaN where
+            the probability is not below the exceedance rate of the fit,
+            i.e. outside the modelled tail.
+        fit: The GPD fit the curve was computed from.
+        lower: Lower bootstrap confidence band, if computed.
+        upper: Upper bootstrap confidence band, if computed.
+        confidence_level: Confidence level of the bands, if computed.
+    """
+
+    probabilities: NDArray[np.floating]
+    pwcet: NDArray[np.floating]
+    fit: GPDFit
+    lower: Optional[NDArray[np.floating]] = None
+    upper: Optional[NDArray[np.floating]] = None
+    confidence_level: Optional[float] = None
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the curve to a compressed ``.npz`` array file.
+
+        The file holds the ``probabilities`` and ``pwcet`` arrays, the
+        ``lower`` and ``upper`` bands when computed, and the fit parameters
+        as ``fit`` (threshold, shape, scale, n_exceedances, n_samples).
+
+        Args:
+            path: Output path.
+        """
+        arrays = {
+            "probabilities": self.probabilities,
+            "pwcet": self.pwcet,
+            "fit": np.array(
+                [
+                    self.fit.threshold,
+                    self.fit.shape,
+                    self.fit.scale,
+                    self.fit.n_exceedances,
+                    self.fit.n_samples,
+                ]
+            ),
+        }
+        if self.lower is not None and self.upper is not None:
+            arrays["lower"] = self.lower
+            arrays["upper"] = self.upper
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+
+def gpd_quantiles(
+    threshold: NDArray[np.floating],
+    shape: NDArray[np.floating],
+    scale: NDArray[np.floating],
+    rate: NDArray[np.floating],
+    probabilities: NDArray[np.floating],
+) -> NDArray[np.floating]:
+    """Evaluate POT exceedance quantiles for broadcast parameter arrays.
+
+    Returns x with P(X > x) = p under the model P(X > u + y) =
+    rate * GPD_sf(y; shape, scale), i.e. ``u + GPD_isf(p / rate)``. All
+    arguments are broadcast together.
+
+    Args:
+        threshold: Thresholds u.
+        shape: GPD shape parameters.
+        scale: GPD scale parameters.
+        rate: Exceedance rates of the thresholds.
+        probabilities: Exceedance probabilities p.
+
+    Returns:
+        Quantile array, NaN where p >= rate.
+    """
+    log_q = np.log(np.asarray(probabilities) / rate)
+    shape = np.asarray(shape, dtype=np.float64)
+    near_zero = np.abs(shape) < _SHAPE_EPS
+    safe_shape = np.where(near_zero, 1.0, shape)
+    # GPD_isf(q) = scale * (q**-shape - 1) / shape, -scale * log(q) at 0.
+    excess = scale * np.where(
+        near_zero, -log_q, np.expm1(-safe_shape * log_q) / safe_shape
+    )
+    return np.where(log_q < 0, threshold + excess, np.nan)
+
+
+def pwcet_curves(
+    fits: Sequence[GPDFit],
+    probabilities: NDArray[np.floating] = DEFAULT_EXCEEDANCE_PROBABILITIES,
+) -> NDArray[np.floating]:
+    """Evaluate the pWCET curves of many tasks at once.
+
+    Args:
+        fits: GPD fits, one per task (e.g. ``TailIDResult.fit``).
+        probabilities: Exceedance probability grid (default: 1e-3 to
+            1e-15 by decades).
+
+    Returns:
+        Array of shape (len(fits), len(probabilities)).
+    """
+    params = np.array(
+        [
+            (f.threshold, f.shape, f.scale, f.exceedance_rate)
+            for f in fits
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    return gpd_quantiles(
+        params[:, 0:1],
+        params[:, 1:2],
+        params[:, 2:3],
+        params[:, 3:4],
+        np.asarray(probabilities, dtype=np.float64)[None, :],
+    )
+
+
+def _tail_fit(
+    result: TailIDResult,
+    data: Optional[NDArray[np.floating]],
+    n_samples: Optional[int] = None,
+) -> GPDFit:
+    """Return the GPD fit a pWCET curve is computed from."""
+    if result.scenario == TailIDScenario.UNDETERMINED:
+        raise ValueError(
+            "pWCET estimation requires a complete TailID result; "
+            "rerun with a larger time budget"
+        )
+    if result.scenario == TailIDScenario.SCENARIO_3:
+        raise ValueError(
+            "pWCET estimation must not be performed in Scenario 3; "
+            "collect additional samples first"
+        )
+    if result.scenario == TailIDScenario.SCENARIO_1:
+        if result.fit is None:
+            raise ValueError("the TailID result carries no GPD fit")
+        return result.fit
+
+    # Scenario 2: the last mixture component starts at the tail threshold,
+    # which TailID never fitted over.
+    if data is None:
+        raise ValueError("Scenario 2 pWCET estimation requires the data")
+    assert result.tail_threshold is not None
+    excess = excess_set(data, result.tail_threshold)
+    shape, scale = fit_gpd(excess)
+    return GPDFit(
+        result.tail_threshold,
+        shape,
+        scale,
+        len(excess),
+        len(data) if n_samples is None else n_samples,
+    )
+
+
+def estimate_pwcet(
+    result: TailIDResult,
+    data: Optional[NDArray[np.floating]] = None,
+    probabilities: NDArray[np.floating] = DEFAULT_EXCEEDANCE_PROBABILITIES,
+    confidence_level: Optional[float] = None,
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+    n_samples: Optional[int] = None,
+) -> PWCETCurve:
+    """Estimate the pWCET curve from a TailID outcome.
+
+    In Scenario 1 the curve uses the GPD fit of ``tail_id`` (``result.fit``)
+    without refitting. In Scenario 2 the GPD is fitted once to the
+    exceedances over ``result.tail_threshold``, the start of the last
+    mixture component. Scenario 3 has too few samples for tail prediction.
+
+    Args:
+        result: Result of ``tail_id``.
+        data: The sample data ``tail_id`` was run on, or its values above
+            the p_m quantile (e.g. ``AnalysisArtifact.tail``) together with
+            ``n_samples``. Required in Scenario 2 and for confidence bands.
+        probabilities: Exceedance probability grid (default: 1e-3 to
+            1e-15 by decades).
+        confidence_level: If given, also compute bootstrap confidence bands
+            at this level (e.g. 0.95).
+        n_resamples: Number of bootstrap resamples for the bands.
+        seed: Seed of the bootstrap resampling streams.
+        executor: Optional executor the bootstrap resample blocks are
+            spread over (e.g. a ``ProcessPoolExecutor``).
+        n_samples: Number of samples of the whole trace when data holds
+            only its upper tail. Defaults to ``len(data)``.
+
+    Returns:
+        PWCETCurve of the task.
+
+    Raises:
+        ValueError: In Scenario 3, if the result carries no fit, or if the
+            data needed for Scenario 2 or the bands is missing.
+    """
+    fit = _tail_fit(result, data, n_samples)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    curve = PWCETCurve(
+        probabilities=probabilities,
+        pwcet=pwcet_curves([fit], probabilities)[0],
+        fit=fit,
+    )
+    if confidence_level is None:
+        return curve
+    if not (0 < confidence_level < 1):
+        raise ValueError("confidence_level must be between 0 and 1")
+    if data is None:
+        raise ValueError("confidence bands require the data")
+
+    # As in compute_gpd_bootstrap_ci, the bands are the percentiles of the
+    # bootstrap errors against the batched estimate on the original data,
+    # centered on the MLE curve.
+    excess = np.asarray(excess_set(data, fit.threshold), dtype=np.float64)
+    shapes, scales = bootstrap_gpd_fits(excess, n_resamples, seed, executor)
+    ref_shape, ref_scale = fit_gpd_batch(excess)
+    shapes = np.concatenate([ref_shape, shapes])
+    scales = np.concatenate([ref_scale, scales])
+    quantiles = gpd_quantiles(
+        fit.threshold,
+        shapes[:, None],
+        scales[:, None],
+        fit.exceedance_rate,
+        probabilities[None, :],
+    )
+    errors = quantiles[1:] - quantiles[0]
+    alpha = 1 - confidence_level
+    lower, upper = np.quantile(errors, [alpha / 2, 1 - alpha / 2], axis=0)
+    curve.lower = curve.pwcet + lower
+    curve.upper = curve.pwcet + upper
+    curve.confidence_level = confidence_level
+    return curve
@@ -0,0 +1,304 @@
+"""Long-lived TailID analysis daemon with a local socket API.
+
+This module keeps NumPy, SciPy and the TailID code loaded in a daemon
+process that accepts JSON requests over a Unix-domain socket, so frequent
+small analyses do not pay interpreter startup, imports and file parsing on
+every call. Requests are newline-delimited JSON objects; each request gets
+one JSON response line.
+
+A request carries the trace either inline (``"data"``: list of numbers, or
+``"data_b64"`` plus ``"dtype"``: base64-encoded raw array) or as a file
+``"path"`` readable by the daemon, together with the TailID parameters
+``p_c1``, ``n_candidates`` and optionally ``gamma`` and ``mos`` (an integer
+or ``"auto"``). The request ``{"op": "ping"}`` checks that the daemon is
+alive.
+
+Analyses run on a bounded thread pool fed by a bounded request queue; when
+the queue is full, connections wait for a free slot before their request is
+read further. Loaded files and results are kept in LRU caches shared by all
+requests.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.client import server_available
+from src.data_loading import load_data_from_file
+from src.defaults import GAMMA_DEFAULT, MOS_AUTO, MOS_DEFAULT
+from src.pipeline import run_analysis
+from src.tailid import TailIDResult, TailIDScenario
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_CACHE_SIZE = 32
+MAX_REQUEST_BYTES = 1 << 28
+
+
+class _LRUCache:
+    """Thread-safe least-recently-used cache."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+
+def result_to_dict(
+    p_m: float, result: TailIDResult, n_samples: int
+) -> Dict[str, Any]:
+    """Convert a pipeline outcome to a JSON-serializable response.
+
+    Args:
+        p_m: Selected extreme value percentile.
+        result: TailID result.
+        n_samples: Number of analysed samples.
+
+    Returns:
+        Response dictionary with ``"ok": True``.
+    """
+    return {
+        "ok": True,
+        "n_samples": n_samples,
+        "p_m": p_m,
+        "sensitive_points": result.sensitive_points.tolist(),
+        "scenario": result.scenario.name,
+        "message": result.message,
+        "tail_threshold": result.tail_threshold,
+        "mos": result.mos,
+    }
+
+
+def result_from_dict(response: Dict[str, Any]) -> Tuple[float, TailIDResult]:
+    """Rebuild the selected p_m and TailID result from a response.
+
+    Args:
+        response: Successful response produced by ``result_to_dict``.
+
+    Returns:
+        Tuple of (p_m, TailIDResult).
+    """
+    result = TailIDResult(
+        sensitive_points=response["sensitive_points"],
+        scenario=TailIDScenario[response["scenario"]],
+        message=response["message"],
+        tail_threshold=response["tail_threshold"],
+        mos=response["mos"],
+    )
+    return float(response["p_m"]), result
+
+
+def request_params(
+    request: Dict[str, Any]
+) -> Tuple[float, int, float, Union[int, str]]:
+    """Extract the ``run_analysis`` parameters of an analysis request.
+
+    Args:
+        request: Decoded JSON request.
+
+    Returns:
+        Tuple of (p_c1, n_candidates, gamma, mos).
+
+    Raises:
+        KeyError: If p_c1 or n_candidates is missing.
+        TypeError, ValueError: If a parameter has the wrong type.
+    """
+    mos = request.get("mos", MOS_DEFAULT)
+    return (
+        float(request["p_c1"]),
+        int(request["n_candidates"]),
+        float(request.get("gamma", GAMMA_DEFAULT)),
+        mos if mos == MOS_AUTO else int(mos),
+    )
+
+
+class TailIDServer:
+    """Asyncio daemon serving TailID analyses over a Unix-domain socket.
+
+    Args:
+        socket_path: Path of the Unix-domain socket to listen on.
+        workers: Number of analysis threads.
+        queue_size: Maximum number of requests waiting for a worker.
+        cache_size: Maximum number of loaded files and of results kept.
+    """
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path],
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive")
+        self.socket_path = Path(socket_path)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.data_cache = _LRUCache(cache_size)
+        self.result_cache = _LRUCache(cache_size)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one analysis request synchronously.
+
+        Args:
+            request: Decoded JSON request.
+
+        Returns:
+            Response dictionary.
+        """
+        try:
+            params = request_params(request)
+        except KeyError as e:
+            return {"ok": False, "error": f"missing field {e.args[0]!r}"}
+        except (TypeError, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+
+        try:
+            data, data_key = self._load(request)
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+
+        key = (data_key, params) if data_key is not None else None
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            analysis = run_analysis(data, *params)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        response = result_to_dict(analysis.p_m, analysis.result, len(data))
+        if key is not None:
+            self.result_cache.put(key, response)
+        return response
+
+    def _load(
+        self, request: Dict[str, Any]
+    ) -> Tuple[NDArray[np.floating], Optional[Hashable]]:
+        """Return the request's data and a cache key for file inputs."""
+        if "path" in request:
+            path = Path(request["path"]).resolve()
+            st = path.stat()
+            key = (str(path), st.st_mtime_ns, st.st_size)
+            data = self.data_cache.get(key)
+            if data is None:
+                data = load_data_from_file(str(path))
+                self.data_cache.put(key, data)
+            return data, key
+        if "data_b64" in request:
+            raw = base64.b64decode(request["data_b64"])
+            dtype = np.dtype(request.get("dtype", "float64"))
+            return np.frombuffer(raw, dtype=dtype), None
+        return np.asarray(request["data"], dtype=np.float64), None
+
+    async def serve_forever(self) -> None:
+        """Listen on the socket and serve requests until cancelled.
+
+        Raises:
+            RuntimeError: If another daemon already listens on the socket.
+        """
+        if self.socket_path.exists():
+            if server_available(self.socket_path):
+                raise RuntimeError(
+                    f"a TailID daemon is already running on {self.socket_path}"
+                )
+            self.socket_path.unlink()
+
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = (
+            asyncio.Queue(self.queue_size)
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="tailid-worker"
+        )
+
+        async def worker() -> None:
+            while True:
+                request, future = await queue.get()
+                try:
+                    response = await loop.run_in_executor(
+                        executor, self.handle_request, request
+                    )
+                except Exception as e:
+                    response = {"ok": False, "error": f"unexpected: {e}"}
+                if not future.done():
+                    future.set_result(response)
+                queue.task_done()
+
+        async def handle_connection(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("request must be a JSON object")
+                    except ValueError as e:
+                        response: Dict[str, Any] = {
+                            "ok": False,
+                            "error": f"invalid request: {e}",
+                        }
+                    else:
+                        if request.get("op") == "ping":
+                            response = {"ok": True}
+                        else:
+                            future = loop.create_future()
+                            await queue.put((request, future))
+                            response = await future
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+            except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                pass
+            finally:
+                writer.close()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_unix_server(
+            handle_connection,
+            path=str(self.socket_path),
+            limit=MAX_REQUEST_BYTES,
+        )
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.socket_path.exists():
+                self.socket_path.unlink()
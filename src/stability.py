@@ -0,0 +1,424 @@
+"""Resampling stability report of the TailID scenario classification.
+
+A single analysis gives one |S| and one scenario, and borderline traces
+with |S| near MoS can flip between Scenarios 2 and 3 as samples arrive.
+``stability_report`` reruns the full pipeline (threshold selection and
+``tail_id``) on many resamples of a trace and reports the distribution of
+|S|, the tail threshold and the scenario frequencies.
+
+Two resampling schemes are supported:
+
+- ``"subsample"``: subsamples of a fixed size drawn without replacement.
+  They are drawn as sorted index sets into the sorted trace, so every
+  resample is already sorted and is analysed without sorting.
+- ``"block"``: moving block bootstrap of the time-ordered trace, which
+  keeps the serial dependence within blocks.
+
+With several worker processes, the base data is placed once in shared
+memory that the workers map, so it is neither pickled per task nor copied
+per process; worker threads (see ``src.executors``) read it directly.
+Resamples are submitted in batches, and each resample has its own random
+stream derived from the seed, so the report does not depend on the number
+of workers or the backend.
+
+The TailID loop fits one GPD per candidate on up to |tail| exceedances,
+and dominates the cost of a resample. By default, resamples are analysed
+with approximate EQMAE scores on thinned exceedances and with the loop
+fits refined from the fit of the previous candidate (``warm_start`` of
+``tail_id``). On a trace of 10^6 samples (resamples of 5 * 10^5, 20
+candidates, p_c1 = 0.999), this takes about 5 s per resample instead of
+about 8 minutes, so 1000 resamples take about 1.5 hours per worker.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.defaults import (
+    DEFAULT_N_STABILITY_RESAMPLES,
+    DEFAULT_STABILITY_MAX_EXCEEDANCES,
+    DEFAULT_SUBSAMPLE_FRACTION,
+    GAMMA_DEFAULT,
+    MOS_DEFAULT,
+    RESAMPLING_METHODS,
+)
+from src.executors import create_executor, resolve_backend
+from src.tailid import TailIDScenario, tail_id
+from src.threshold_selection import P_M_MAX, evaluate_thresholds
+
+_BATCH_SIZE = 8
+
+# Base data of a pool worker process, mapped by ``_attach``: the sorted
+# trace for subsampling, or the time-ordered trace for block resampling.
+# Inline and thread runs pass their base data explicitly instead.
+_BASE: Dict[str, NDArray[np.number]] = {}
+_SEGMENTS: List[shared_memory.SharedMemory] = []
+
+
+@dataclass
+class _Settings:
+    """Parameters of the pipeline run on every resample."""
+
+    p_c1: float
+    n_candidates: int
+    gamma: float
+    mos: Union[int, str]
+    method: str
+    size: int
+    block_size: int
+    max_exceedances: Optional[int]
+    warm_start: bool
+    seed: int
+
+
+@dataclass
+class StabilityReport:
+    """Distribution of the TailID outcome over resamples of a trace.
+
+    Attributes:
+        method: Resampling method (``"subsample"`` or ``"block"``).
+        resample_size: Number of samples of each resample.
+        p_m: Selected p_m of each resample.
+        n_sensitive: Number of sensitive points |S| of each resample.
+        tail_threshold: Tail threshold of each resample, NaN where the
+            resample is not in Scenario 2.
+        scenario: Scenario number (1, 2 or 3) of each resample.
+    """
+
+    method: str
+    resample_size: int
+    p_m: NDArray[np.floating]
+    n_sensitive: NDArray[np.int64]
+    tail_threshold: NDArray[np.floating]
+    scenario: NDArray[np.int8]
+
+    @property
+    def n_resamples(self) -> int:
+        """Number of resamples."""
+        return len(self.scenario)
+
+    @property
+    def scenario_frequencies(self) -> Dict[TailIDScenario, float]:
+        """Fraction of the resamples classified in each scenario."""
+        return {
+            s: float(np.mean(self.scenario == s.value))
+            for s in TailIDScenario
+            if s != TailIDScenario.UNDETERMINED
+        }
+
+    def format(self) -> str:
+        """Format the report as a human-readable summary.
+
+        Returns:
+            Multi-line string with the scenario frequencies and the
+            quantiles of |S|, the tail threshold and p_m.
+        """
+        levels = [0.0, 0.05, 0.5, 0.95, 1.0]
+        header = "  ".join(f"{f'{q:.0%}':>10}" for q in levels)
+        lines = [
+            f"  {self.n_resamples} resamples ({self.method}, "
+            f"{self.resample_size} samples each)",
+            "  Scenario frequencies:",
+        ]
+        for s, freq in self.scenario_frequencies.items():
+            lines.append(f"    {s.name}: {freq:.3f}")
+        lines.append(f"  {'quantile':<16}{header}")
+        rows: List[Tuple[str, NDArray[np.floating]]] = [
+            ("|S|", self.n_sensitive.astype(np.float64)),
+            ("p_m", self.p_m),
+            ("tail_threshold", self.tail_threshold[self.scenario == 2]),
+        ]
+        for name, values in rows:
+            if len(values) == 0:
+                lines.append(f"  {name:<16}{'(none)':>10}")
+                continue
+            quantiles = np.quantile(values, levels)
+            cells = "  ".join(f"{v:>10.6g}" for v in quantiles)
+            lines.append(f"  {name:<16}{cells}")
+        return "\n".join(lines)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the per-resample outcomes to a compressed ``.npz`` file.
+
+        Args:
+            path: Output path.
+        """
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                p_m=self.p_m,
+                n_sensitive=self.n_sensitive,
+                tail_threshold=self.tail_threshold,
+                scenario=self.scenario,
+            )
+
+
+def _share(
+    array: NDArray[np.number], segments: List[shared_memory.SharedMemory]
+) -> Tuple[str, Tuple[int, ...], str]:
+    """Copy an array into a new shared memory segment, kept in segments."""
+    segment = shared_memory.SharedMemory(
+        create=True, size=max(1, array.nbytes)
+    )
+    segments.append(segment)
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    view[...] = array
+    return segment.name, array.shape, array.dtype.str
+
+
+def _attach(shared: Dict[str, Tuple[str, Tuple[int, ...], str]]) -> None:
+    """Map the shared base data in a worker process."""
+    for key, (name, shape, dtype) in shared.items():
+        # Workers share the resource tracker of the creating process, which
+        # unlinks the segment when the report is done.
+        segment = shared_memory.SharedMemory(name=name)
+        _SEGMENTS.append(segment)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        _BASE[key] = array
+
+
+def _release(segments: List[shared_memory.SharedMemory]) -> None:
+    """Unmap and remove the shared memory segments a report created."""
+    while segments:
+        segment = segments.pop()
+        segment.close()
+        segment.unlink()
+
+
+def _resample(
+    settings: _Settings,
+    base: Dict[str, NDArray[np.number]],
+    rng: np.random.Generator,
+) -> NDArray[np.number]:
+    """Draw one resample of the base data."""
+    if settings.method == "subsample":
+        sorted_data = base["sorted"]
+        indices = rng.choice(len(sorted_data), settings.size, replace=False)
+        indices.sort()
+        return sorted_data[indices]
+
+    data = base["data"]
+    n_blocks = settings.size // settings.block_size
+    starts = rng.integers(
+        0, len(data) - settings.block_size + 1, size=n_blocks
+    )
+    indices = starts[:, None] + np.arange(settings.block_size)
+    return data[indices.ravel()]
+
+
+def _run_batch(
+    settings: _Settings,
+    start: int,
+    stop: int,
+    base: Optional[Dict[str, NDArray[np.number]]] = None,
+) -> List[Tuple[float, int, float, int]]:
+    """Run the pipeline on the resamples with the given indices.
+
+    The resamples are drawn from ``base``, or in a pool worker process
+    from the base data mapped by ``_attach``.
+    """
+    if base is None:
+        base = _BASE
+    outcomes = []
+    for index in range(start, stop):
+        rng = np.random.default_rng(
+            np.random.SeedSequence(settings.seed, spawn_key=(index,))
+        )
+        sample = _resample(settings, base, rng)
+        presorted = settings.method == "subsample"
+        p_m = evaluate_thresholds(
+            sample,
+            n_candidates=settings.n_candidates,
+            max_exceedances=settings.max_exceedances,
+            presorted=presorted,
+        ).p_m
+        result = tail_id(
+            sample,
+            p_m=p_m,
+            p_c1=settings.p_c1,
+            gamma=settings.gamma,
+            mos=settings.mos,
+            presorted=presorted,
+            warm_start=settings.warm_start,
+        )
+        tail_threshold = (
+            result.tail_threshold
+            if result.tail_threshold is not None
+            else float("nan")
+        )
+        outcomes.append(
+            (
+                p_m,
+                len(result.sensitive_points),
+                tail_threshold,
+                result.scenario.value,
+            )
+        )
+    return outcomes
+
+
+def _run_batches(
+    executor: Executor,
+    settings: _Settings,
+    batches: List[Tuple[int, int]],
+    base: Optional[Dict[str, NDArray[np.number]]] = None,
+) -> List[Tuple[float, int, float, int]]:
+    """Run the batches of resamples on an executor, in order.
+
+    ``base`` is passed to thread workers; process workers leave it None
+    and read the data they mapped.
+    """
+    futures = [
+        executor.submit(_run_batch, settings, start, stop, base)
+        for start, stop in batches
+    ]
+    outcomes = []
+    for future in futures:
+        outcomes.extend(future.result())
+    return outcomes
+
+
+def stability_report(
+    data: NDArray[np.number],
+    p_c1: float,
+    n_candidates: int,
+    gamma: float = GAMMA_DEFAULT,
+    mos: Union[int, str] = MOS_DEFAULT,
+    n_resamples: int = DEFAULT_N_STABILITY_RESAMPLES,
+    method: str = "subsample",
+    fraction: float = DEFAULT_SUBSAMPLE_FRACTION,
+    block_size: Optional[int] = None,
+    max_exceedances: Optional[int] = DEFAULT_STABILITY_MAX_EXCEEDANCES,
+    warm_start: bool = True,
+    seed: int = 0,
+    workers: int = 1,
+    backend: str = "auto",
+) -> StabilityReport:
+    """Rerun the analysis pipeline on resamples of a trace.
+
+    Every resample is analysed like ``run_analysis``: p_m is selected by
+    EQMAE minimization and ``tail_id`` is run with it. By default, the
+    EQMAE is approximated for candidates with more than 2000 exceedances
+    and the TailID fits are warm-started; with ``max_exceedances=None``
+    and ``warm_start=False``, each verdict is the one a single analysis of
+    the resample would give.
+
+    Args:
+        data: Sample data (time-ordered for block resampling).
+        p_c1: Candidate percentile, above every candidate p_m (0.9 < p_c1
+            < 1).
+        n_candidates: Number of candidate thresholds for p_m selection.
+        gamma: Confidence level (default: 0.9999).
+        mos: Minimum of Samples threshold (default: 40), or
+            ``"auto"`` to estimate it (see ``tail_id``).
+        n_resamples: Number of resamples (default: 1000).
+        method: ``"subsample"`` (default) or ``"block"``.
+        fraction: Size of each resample as a fraction of the trace
+            (default: 0.5). Block resamples are rounded down to whole
+            blocks.
+        block_size: Block length of block resampling (default: the cube
+            root of the trace length).
+        max_exceedances: Number of exceedances above which the EQMAE of
+            a candidate threshold is approximated (default: 2000; see
+            ``evaluate_thresholds``), or None to score every candidate
+            exactly.
+        warm_start: Refit the TailID loop fits from the previous
+            candidate's fit (default: True; see ``tail_id``).
+        seed: Seed of the resampling streams.
+        workers: Number of workers; 1 runs inline (default: 1).
+        backend: Worker pool backend, ``"auto"`` (default), ``"thread"``
+            or ``"process"`` (see ``src.executors``).
+
+    Returns:
+        StabilityReport of the resamples.
+
+    Raises:
+        ValueError: If the parameters are out of their valid ranges.
+    """
+    data = np.asarray(data).ravel()
+    n = len(data)
+    if not (P_M_MAX < p_c1 < 1):
+        # Otherwise a resample selecting a large p_m would fail TailID.
+        raise ValueError(
+            f"p_c1 must be between the largest candidate p_m ({P_M_MAX}) "
+            f"and 1"
+        )
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(
+            f"method must be one of {', '.join(RESAMPLING_METHODS)}"
+        )
+    if not (0 < fraction <= 1):
+        raise ValueError("fraction must be in (0, 1]")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be positive")
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    resolved = resolve_backend(backend, n)
+    if block_size is None:
+        block_size = max(1, round(n ** (1 / 3)))
+    if not (0 < block_size <= n):
+        raise ValueError("block_size must be between 1 and the data length")
+    size = int(n * fraction)
+    if method == "block":
+        size -= size % block_size
+    if size < 2:
+        raise ValueError("resamples must hold at least 2 samples")
+
+    settings = _Settings(
+        p_c1=p_c1,
+        n_candidates=n_candidates,
+        gamma=gamma,
+        mos=mos,
+        method=method,
+        size=size,
+        block_size=block_size,
+        max_exceedances=max_exceedances,
+        warm_start=warm_start,
+        seed=seed,
+    )
+    if method == "subsample":
+        base = {"sorted": np.sort(data)}
+    else:
+        base = {"data": data}
+    batches = [
+        (start, min(start + _BATCH_SIZE, n_resamples))
+        for start in range(0, n_resamples, _BATCH_SIZE)
+    ]
+
+    outcomes: List[Tuple[float, int, float, int]] = []
+    if workers == 1 or resolved == "thread":
+        executor = create_executor(workers, "thread")
+        if executor is None:
+            for start, stop in batches:
+                outcomes.extend(_run_batch(settings, start, stop, base))
+        else:
+            with executor:
+                outcomes = _run_batches(executor, settings, batches, base)
+    else:
+        segments: List[shared_memory.SharedMemory] = []
+        try:
+            shared = {
+                key: _share(array, segments) for key, array in base.items()
+            }
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach, initargs=(shared,)
+            ) as executor:
+                outcomes = _run_batches(executor, settings, batches)
+        finally:
+            _release(segments)
+
+    columns = list(zip(*outcomes))
+    return StabilityReport(
+        method=method,
+        resample_size=size,
+        p_m=np.array(columns[0], dtype=np.float64),
+        n_sensitive=np.array(columns[1], dtype=np.int64),
+        tail_threshold=np.array(columns[2], dtype=np.float64),
+        scenario=np.array(columns[3], dtype=np.int8),
+    )
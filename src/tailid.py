@@ -6,104 +6,306 @@ probabilistic Worst-Case Execution Time (pWCET) estimation in real-time
 systems.
 """
 
-from dataclasses import dataclass
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Callable, Optional, Tuple, Union
 
 import numpy as np
-from numpy.typing import NDArray
-
-from src.data_processing import excess_set, quantile, select_candidates
-from src.gpd_statistics import compute_gpd_ci, fit_gpd_evi, is_in_interval
-
-MOS_DEFAULT = 40
+from numpy.typing import ArrayLike, NDArray
+
+from src.data_processing import excess_set, extract_tail
+from src.defaults import (
+    CI_METHODS,
+    DEFAULT_N_RESAMPLES,
+    KPSS_SIGNIFICANCE,
+    MOS_AUTO,
+    MOS_DEFAULT,
+)
+from src.gpd_statistics import (
+    GPDFit,
+    compute_gpd_bootstrap_ci,
+    compute_gpd_ci,
+    fit_gpd,
+    is_in_interval,
+    refit_gpd,
+)
+from src.instrumentation import (
+    Deadline,
+    DeadlineExceeded,
+    ProgressHook,
+    RunStats,
+    stage,
+)
+from src.kpss import KPSSResult
+from src.mos import estimate_mos
+from src.tracing import FitTrace, TraceSink
 
 
 class TailIDScenario(Enum):
-    """Scenarios for TailID outcomes based on the number of detected points."""
+    """Scenarios for TailID outcomes based on the number of detected points.
+
+    ``UNDETERMINED`` is the outcome of a run the deadline stopped before
+    its candidate loop finished: no scenario can be assigned until every
+    candidate has been tested.
+    """
 
+    UNDETERMINED = 0
     SCENARIO_1 = 1
     SCENARIO_2 = 2
     SCENARIO_3 = 3
 
 
-@dataclass
+@dataclass(init=False, eq=False, slots=True)
 class TailIDResult:
     """Result of the TailID algorithm with scenario interpretation.
 
+    Results are slotted and keep the sensitive points as a NumPy array in
+    the dtype of the analysed data, so large Scenario 2 results stay
+    compact. The interpretation message is built on first access. Results
+    compare equal when all their fields are equal.
+
     Attributes:
-        sensitive_points: List of ID-sensitive points detected.
-        scenario: The scenario classification based on |S| and MoS.
+        sensitive_points: Array of ID-sensitive points detected, in
+            ascending order.
+        scenario: The scenario classification based on |S| and MoS,
+            ``UNDETERMINED`` for partial results.
         message: Human-readable interpretation of the result.
         tail_threshold: For Scenario 2, the first detected sensitive point
             which becomes the new tail threshold. None for other scenarios.
+        stats: Per-stage timings and fit counters when the run was
+            instrumented. None otherwise.
+        kpss: KPSS stationarity test of the sample when one was combined
+            with the result (see ``combine_with_kpss``). None otherwise.
+        id_supported: Combined TailID and KPSS verdict: True if TailID
+            found no inconsistent points (Scenario 1) and KPSS does not
+            reject stationarity. None when no KPSS test was combined.
+        fit: The last GPD fit TailID accepted, i.e. the model of the
+            exceedances over the p_m quantile of all points before the
+            first sensitive point (of all points in Scenario 1). Reused by
+            ``src.pwcet`` to avoid refitting. None if no fit was made.
+        mos: Minimum of Samples threshold the scenario was classified with,
+            estimated from the fit when ``tail_id`` was run with
+            ``mos="auto"``.
+        partial: Whether the deadline passed before the candidate loop
+            finished. No candidate processed so far was rejected, and the
+            scenario is ``UNDETERMINED``.
+        candidates_processed: Number of candidates the loop tested. None
+            if the result was not produced by ``tail_id``.
+        candidates_total: Number of candidates above the p_c1 quantile.
+            None if the result was not produced by ``tail_id``.
     """
 
-    sensitive_points: List[float]
+    sensitive_points: NDArray[np.number]
     scenario: TailIDScenario
-    message: str
-    tail_threshold: Optional[float] = None
+    tail_threshold: Optional[float]
+    stats: Optional[RunStats]
+    kpss: Optional[KPSSResult]
+    id_supported: Optional[bool]
+    fit: Optional[GPDFit]
+    mos: int
+    partial: bool
+    candidates_processed: Optional[int]
+    candidates_total: Optional[int]
+    _message: Optional[str] = field(repr=False)
+
+    def __init__(
+        self,
+        sensitive_points: ArrayLike,
+        scenario: TailIDScenario,
+        message: Optional[str] = None,
+        tail_threshold: Optional[float] = None,
+        stats: Optional[RunStats] = None,
+        kpss: Optional[KPSSResult] = None,
+        id_supported: Optional[bool] = None,
+        fit: Optional[GPDFit] = None,
+        mos: int = MOS_DEFAULT,
+        partial: bool = False,
+        candidates_processed: Optional[int] = None,
+        candidates_total: Optional[int] = None,
+    ) -> None:
+        self.sensitive_points = np.asarray(sensitive_points)
+        self.scenario = scenario
+        self.tail_threshold = tail_threshold
+        self.stats = stats
+        self.kpss = kpss
+        self.id_supported = id_supported
+        self.fit = fit
+        self.mos = mos
+        self.partial = partial
+        self.candidates_processed = candidates_processed
+        self.candidates_total = candidates_total
+        self._message = message
+
+    def __eq__(self, other: object) -> bool:
+        """Compare results by value, the sensitive points element-wise."""
+        if not isinstance(other, TailIDResult):
+            return NotImplemented
+        return (
+            np.array_equal(self.sensitive_points, other.sensitive_points)
+            and self.scenario == other.scenario
+            and self.message == other.message
+            and self.tail_threshold == other.tail_threshold
+            and self.stats == other.stats
+            and self.kpss == other.kpss
+            and self.id_supported == other.id_supported
+            and self.fit == other.fit
+            and self.mos == other.mos
+            and self.partial == other.partial
+            and self.candidates_processed == other.candidates_processed
+            and self.candidates_total == other.candidates_total
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def message(self) -> str:
+        """Human-readable interpretation of the result."""
+        if self._message is None:
+            message = _scenario_message(
+                self.scenario, self.sensitive_points, self.mos
+            )
+            if self.partial:
+                message = (
+                    f"Partial result: the time budget ran out after "
+                    f"{self.candidates_processed} of {self.candidates_total} "
+                    f"candidates. {message}"
+                )
+            self._message = message
+        return self._message
+
+    @message.setter
+    def message(self, value: str) -> None:
+        self._message = value
+
+
+def _scenario_message(
+    scenario: TailIDScenario, s: NDArray[np.number], mos: int
+) -> str:
+    """Build the interpretation message of a scenario.
+
+    Args:
+        scenario: The scenario classification.
+        s: Detected sensitive points.
+        mos: Minimum of Samples threshold.
+
+    Returns:
+        Human-readable interpretation and recommended action.
+    """
+    num_sensitive = len(s)
+
+    if scenario == TailIDScenario.UNDETERMINED:
+        return (
+            "Undetermined: no inconsistent point was found among the "
+            "candidates processed, but the remaining candidates were not "
+            "tested, so no scenario can be assigned. "
+            "Rerun with a larger time budget before using the tail."
+        )
+    elif scenario == TailIDScenario.SCENARIO_1:
+        return (
+            "Scenario 1: No inconsistent points detected (|S| = 0). "
+            "The identical distribution (ID) hypothesis holds for the "
+            "tail. The tail is stable and suitable for pWCET estimation. "
+            "Consider combining with KPSS test for additional validation."
+        )
+    elif scenario == TailIDScenario.SCENARIO_2:
+        return (
+            f"Scenario 2: Many inconsistent points detected "
+            f"(|S| = {num_sensitive} > MoS = {mos}). "
+            f"Multiple mixture components exist in the tail distribution. "
+            f"The first detected point ({float(s[0])}) becomes the new tail "
+            f"threshold, corresponding to the last mixture component. "
+            f"Consider this threshold when performing pWCET estimation."
+        )
+    else:
+        return (
+            f"Scenario 3: Few inconsistent points detected "
+            f"(|S| = {num_sensitive} <= MoS = {mos}). "
+            f"Mixture distribution exists but insufficient samples for "
+            f"accurate parameter estimation. "
+            f"Tail prediction should NOT be performed in this state. "
+            f"Collect additional samples to reach |S| > MoS for reliable "
+            f"estimation."
+        )
 
 
-def _interpret_result(s: List[float], mos: int = MOS_DEFAULT) -> TailIDResult:
+def _interpret_result(
+    s: NDArray[np.number], mos: int = MOS_DEFAULT, partial: bool = False
+) -> TailIDResult:
     """Interpret TailID results based on the three scenarios from the paper.
 
     Args:
-        s: List of detected sensitive points.
+        s: Array of detected sensitive points.
         mos: Minimum of Samples threshold (default: 40).
+        partial: Whether the candidate loop was stopped before it finished.
+            The scenario is then ``UNDETERMINED``.
 
     Returns:
-        TailIDResult with scenario classification and interpretation message.
+        TailIDResult with scenario classification. The interpretation
+        message is built when first accessed.
     """
     num_sensitive = len(s)
 
-    if num_sensitive == 0:
+    if partial:
         return TailIDResult(
-            sensitive_points=s,
-            scenario=TailIDScenario.SCENARIO_1,
-            message=(
-                "Scenario 1: No inconsistent points detected (|S| = 0). "
-                "The identical distribution (ID) hypothesis holds for the "
-                "tail. The tail is stable and suitable for pWCET estimation. "
-                "Consider combining with KPSS test for additional validation."
-            ),
+            s, TailIDScenario.UNDETERMINED, mos=mos, partial=True
         )
+    elif num_sensitive == 0:
+        return TailIDResult(s, TailIDScenario.SCENARIO_1, mos=mos)
     elif num_sensitive > mos:
         return TailIDResult(
-            sensitive_points=s,
-            scenario=TailIDScenario.SCENARIO_2,
-            message=(
-                f"Scenario 2: Many inconsistent points detected "
-                f"(|S| = {num_sensitive} > MoS = {mos}). "
-                f"Multiple mixture components exist in the tail distribution. "
-                f"The first detected point ({s[0]}) becomes the new tail "
-                f"threshold, corresponding to the last mixture component. "
-                f"Consider this threshold when performing pWCET estimation."
-            ),
-            tail_threshold=s[0],
+            s,
+            TailIDScenario.SCENARIO_2,
+            tail_threshold=float(s[0]),
+            mos=mos,
         )
     else:
-        return TailIDResult(
-            sensitive_points=s,
-            scenario=TailIDScenario.SCENARIO_3,
-            message=(
-                f"Scenario 3: Few inconsistent points detected "
-                f"(|S| = {num_sensitive} <= MoS = {mos}). "
-                f"Mixture distribution exists but insufficient samples for "
-                f"accurate parameter estimation. "
-                f"Tail prediction should NOT be performed in this state. "
-                f"Collect additional samples to reach |S| > MoS for reliable "
-                f"estimation."
-            ),
-        )
+        return TailIDResult(s, TailIDScenario.SCENARIO_3, mos=mos)
+
+
+def _resolve_mos(
+    mos: Union[int, str],
+    fit: Optional[GPDFit],
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Return the MoS threshold, estimating it from the fit for "auto".
+
+    Args:
+        mos: MoS threshold, or ``"auto"`` to estimate it with
+            ``src.mos.estimate_mos`` from the EVI of the fit.
+        fit: Last accepted GPD fit. Without one, "auto" falls back to the
+            default MoS.
+        seed: Seed of the simulation streams.
+        executor: Optional executor the simulations are spread over.
+
+    Returns:
+        The MoS threshold.
+    """
+    if mos != MOS_AUTO:
+        return int(mos)
+    if fit is None:
+        return MOS_DEFAULT
+    return estimate_mos(fit.shape, seed=seed, executor=executor)
 
 
 def tail_id(
-    x: NDArray[np.floating],
+    x: NDArray[np.number],
     p_m: float,
     p_c1: float,
     gamma: float,
-    mos: int = MOS_DEFAULT,
+    mos: Union[int, str] = MOS_DEFAULT,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    ci_method: str = "asymptotic",
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+    progress: Optional[ProgressHook] = None,
+    deadline: Optional[Deadline] = None,
+    presorted: bool = False,
+    warm_start: bool = False,
 ) -> TailIDResult:
     """Detect tail ID-sensitive points using the TailID algorithm.
 
@@ -118,22 +320,57 @@ def tail_id(
     - Scenario 2 (|S| > MoS): Many points detected, use first as threshold
     - Scenario 3 (0 < |S| <= MoS): Few points, insufficient for estimation
 
+    A run the deadline stops before the candidate loop finishes has found
+    no rejection yet and is ``UNDETERMINED``.
+
     Args:
-        x: Sample data for analysis (execution time measurements).
+        x: Sample data for analysis (execution time measurements). Integer
+            and float32 data are processed without converting to float64.
         p_m: Extreme value percentile (defines threshold for tail analysis).
             Must be less than p_c1.
         p_c1: Candidate percentile (defines starting point for candidate set).
             Must be greater than p_m.
         gamma: Confidence level (controls detection sensitivity, e.g., 0.95).
         mos: Minimum of Samples threshold for scenario classification
-            (default: 40).
+            (default: 40), or ``"auto"`` to estimate it by simulation from
+            the EVI of the last accepted fit (see ``src.mos``).
+        stats: Optional collector for per-stage timings and fit counters.
+            Instrumentation is disabled when None.
+        trace: Optional sink receiving one record per GPD fit, with the
+            prefix size, EVI, CI bounds, acceptance and duration.
+        ci_method: How the EVI confidence intervals are computed:
+            ``"asymptotic"`` (default, ``compute_gpd_ci``) or
+            ``"bootstrap"`` (``compute_gpd_bootstrap_ci``).
+        n_resamples: Number of bootstrap resamples per interval.
+        seed: Seed of the bootstrap resampling and MoS simulation
+            streams.
+        executor: Optional executor the bootstrap resample blocks and MoS
+            simulations are spread over (e.g. a ``ProcessPoolExecutor``).
+        progress: Optional callback invoked as ``progress(done, total)``
+            after each candidate point is processed. An exception it raises
+            aborts the run.
+        deadline: Optional deadline checked between candidates and during
+            GPD fits. When it passes, the loop stops and the result covers
+            the candidates processed so far, flagged as partial.
+        presorted: Whether x is already sorted in ascending order. The tail
+            is then a view of x and no sort is made.
+        warm_start: Refit each candidate's excess set from the fit of the
+            previous one with ``refit_gpd`` instead of a full ``fit_gpd``
+            (default: False). Much faster on large tails; the EVIs agree
+            up to the tolerance of the ``fit_gpd`` optimizer, so only a
+            candidate within about 1e-4 of a CI bound can be decided
+            differently.
 
     Returns:
         TailIDResult containing:
-        - sensitive_points: List of ID-sensitive points
-        - scenario: Classification (SCENARIO_1, SCENARIO_2, or SCENARIO_3)
+        - sensitive_points: Array of ID-sensitive points, in the dtype of x
+        - scenario: Classification (SCENARIO_1, SCENARIO_2, SCENARIO_3, or
+          UNDETERMINED for partial results)
         - message: Human-readable interpretation and recommended action
         - tail_threshold: For Scenario 2, the first detected point
+        - stats: The collector passed in, if any
+        - fit: The last accepted GPD fit
+        - partial: Whether the deadline stopped the loop early
 
     Raises:
         ValueError: If p_m >= p_c1 or if parameters are out of valid range.
@@ -146,40 +383,244 @@ def tail_id(
         raise ValueError("gamma must be between 0 and 1 (exclusive)")
     if p_m >= p_c1:
         raise ValueError("p_m must be less than p_c1")
+    if ci_method not in CI_METHODS:
+        raise ValueError(f"ci_method must be one of {', '.join(CI_METHODS)}")
+    if isinstance(mos, str) and mos != MOS_AUTO:
+        raise ValueError(f"mos must be an integer or {MOS_AUTO!r}")
 
-    s: List[float] = []
+    if ci_method == "bootstrap":
 
-    t_m = quantile(x, p_m)
+        def ci(evi: float, y: NDArray[np.floating]) -> Tuple[float, float]:
+            return compute_gpd_bootstrap_ci(
+                y, gamma, evi, n_resamples, seed, executor
+            )
 
-    c = select_candidates(x, p_c1)
+    else:
 
-    if len(c) == 0:
-        return _interpret_result(s, mos)
+        def ci(evi: float, y: NDArray[np.floating]) -> Tuple[float, float]:
+            return compute_gpd_ci(evi, gamma, len(y))
+
+    with stage(stats, "tail_id"):
+        loop = _detect_sensitive_points(
+            x,
+            p_m,
+            p_c1,
+            ci,
+            stats,
+            trace,
+            progress,
+            deadline,
+            presorted,
+            warm_start,
+        )
 
-    x_current = x[~np.isin(x, c)]
+    with stage(stats, "tail_id.mos"):
+        mos = _resolve_mos(mos, loop.fit, seed, executor)
+    result = _interpret_result(loop.sensitive_points, mos, loop.partial)
+    result.stats = stats
+    result.fit = loop.fit
+    result.candidates_processed = loop.processed
+    result.candidates_total = loop.total
+    return result
 
-    y_current = excess_set(x_current, t_m)
 
-    if len(y_current) < 2:
-        return _interpret_result(list(c), mos)
+@dataclass
+class _LoopOutcome:
+    """Outcome of the TailID candidate loop.
+
+    Attributes:
+        sensitive_points: Sensitive points, in the dtype of the data.
+        fit: Last accepted GPD fit, None if no fit was made.
+        processed: Number of candidates tested.
+        total: Number of candidates.
+        partial: Whether the deadline stopped the loop.
+    """
+
+    sensitive_points: NDArray[np.number]
+    fit: Optional[GPDFit]
+    processed: int
+    total: int
+    partial: bool = False
+
+
+def _detect_sensitive_points(
+    x: NDArray[np.number],
+    p_m: float,
+    p_c1: float,
+    ci: Callable[[float, NDArray[np.floating]], Tuple[float, float]],
+    stats: Optional[RunStats],
+    trace: Optional[TraceSink],
+    progress: Optional[ProgressHook] = None,
+    deadline: Optional[Deadline] = None,
+    presorted: bool = False,
+    warm_start: bool = False,
+) -> _LoopOutcome:
+    """Run the TailID candidate loop.
 
-    evi_current = fit_gpd_evi(y_current)
+    Returns:
+        _LoopOutcome of the loop. The sensitive points keep the dtype of x.
+    """
+    with stage(stats, "tail_id.tail"):
+        tail = extract_tail(x, p_m, p_c1, presorted)
+    t_m = tail.t_m
+    c = tail.candidates
 
-    ci_current = compute_gpd_ci(evi_current, gamma, len(y_current))
+    if len(c) == 0:
+        return _LoopOutcome(c, None, 0, 0)
+
+    # The data below the candidates together with the first i candidates
+    # is a prefix of the sorted tail, so every excess set of the loop is a
+    # prefix view of one exceedance buffer.
+    excess = excess_set(tail.values, t_m)
+    first_excess = len(tail.values) - len(excess)
+    first_candidate = len(tail.values) - len(c)
+    n_below = tail.n - len(c)
+    if stats is not None:
+        if not presorted:
+            stats.record_copy(tail.values)
+        stats.record_copy(excess)
+
+    y_current = excess[: max(0, first_candidate - first_excess)]
+    if len(y_current) < 2:
+        return _LoopOutcome(c, None, len(c), len(c))
+
+    start = time.perf_counter() if trace is not None else 0.0
+    try:
+        with stage(stats, "tail_id.fit"):
+            evi_current, scale = fit_gpd(
+                y_current, stats, deadline=deadline
+            )
+    except DeadlineExceeded:
+        return _LoopOutcome(c[:0], None, 0, len(c), partial=True)
+    fit = GPDFit(t_m, evi_current, scale, len(y_current), n_below)
+
+    with stage(stats, "tail_id.ci"):
+        ci_current = ci(evi_current, y_current)
+    if trace is not None:
+        trace.record(
+            FitTrace(
+                source="tail_id",
+                prefix_size=len(y_current),
+                threshold=t_m,
+                duration=time.perf_counter() - start,
+                evi=evi_current,
+                ci_lower=ci_current[0],
+                ci_upper=ci_current[1],
+            )
+        )
 
-    for i, c_i in enumerate(c):
-        if len(s) == 0:
-            x_current = np.append(x_current, c_i)
+    # Once a candidate is rejected, it and every larger candidate are
+    # sensitive, so the sensitive points are a suffix of c.
+    # Without a rejection when the deadline passes, no sensitive point has
+    # been found among the candidates processed so far.
+    first_sensitive = len(c)
+    processed = 0
+    partial = False
+    with stage(stats, "tail_id.loop"):
+        for i, c_i in enumerate(c):
+            y_current = excess[
+                : max(0, first_candidate + i + 1 - first_excess)
+            ]
+
+            start = time.perf_counter() if trace is not None else 0.0
+            try:
+                if deadline is not None:
+                    deadline.check()
+                with stage(stats, "tail_id.loop.fit"):
+                    if warm_start:
+                        evi_new, scale = refit_gpd(
+                            y_current, (fit.shape, fit.scale), stats, deadline
+                        )
+                    else:
+                        evi_new, scale = fit_gpd(
+                            y_current, stats, deadline=deadline
+                        )
+            except DeadlineExceeded:
+                partial = True
+                break
+            processed = i + 1
+
+            accepted = is_in_interval(evi_new, ci_current)
+            if trace is not None:
+                trace.record(
+                    FitTrace(
+                        source="tail_id",
+                        prefix_size=len(y_current),
+                        threshold=t_m,
+                        duration=time.perf_counter() - start,
+                        evi=evi_new,
+                        ci_lower=ci_current[0],
+                        ci_upper=ci_current[1],
+                        accepted=accepted,
+                        candidate=float(c_i),
+                    )
+                )
+
+            if not accepted:
+                first_sensitive = i
+                break
+
+            fit = GPDFit(
+                t_m, evi_new, scale, len(y_current), n_below + i + 1
+            )
+            with stage(stats, "tail_id.loop.ci"):
+                ci_current = ci(evi_new, y_current)
+
+            if progress is not None:
+                progress(i + 1, len(c))
+
+    if progress is not None and first_sensitive < len(c):
+        progress(len(c), len(c))
+
+    return _LoopOutcome(
+        c[first_sensitive:], fit, processed, len(c), partial=partial
+    )
+
+
+def combine_with_kpss(
+    result: TailIDResult,
+    kpss: KPSSResult,
+    significance: float = KPSS_SIGNIFICANCE,
+) -> TailIDResult:
+    """Combine a TailID result with a KPSS test of the same sample.
 
-            y_current = excess_set(x_current, t_m)
+    The paper recommends confirming a Scenario 1 outcome with the KPSS
+    test. The KPSS result and the combined verdict are stored on the
+    result and appended to its message.
 
-            evi_new = fit_gpd_evi(y_current)
+    Args:
+        result: TailID result to update in place.
+        kpss: KPSS test of the (time-ordered) sample, e.g. from
+            ``src.kpss.kpss_test``.
+        significance: Significance level of the KPSS test (default: 0.05).
 
-            if not is_in_interval(evi_new, ci_current):
-                s.append(float(c_i))
-            else:
-                ci_current = compute_gpd_ci(evi_new, gamma, len(y_current))
-        else:
-            s.append(float(c_i))
+    Returns:
+        The updated result.
+    """
+    stationary = kpss.stationary(significance)
+    kind = "level" if kpss.regression == "c" else "trend"
+    outcome = "not rejected" if stationary else "rejected"
+    if result.scenario == TailIDScenario.UNDETERMINED:
+        verdict = (
+            "TailID did not finish, so the ID hypothesis is not supported."
+        )
+    elif result.scenario != TailIDScenario.SCENARIO_1:
+        verdict = "TailID rejects the ID hypothesis for the tail."
+    elif stationary:
+        verdict = "the ID hypothesis is supported by both TailID and KPSS."
+    else:
+        verdict = (
+            "TailID finds no inconsistent points but KPSS rejects "
+            "stationarity, so the ID hypothesis is not supported."
+        )
 
-    return _interpret_result(s, mos)
+    result.kpss = kpss
+    result.id_supported = (
+        result.scenario == TailIDScenario.SCENARIO_1 and stationary
+    )
+    result.message += (
+        f" KPSS {kind} stationarity test: statistic = {kpss.statistic:.4f}, "
+        f"p-value = {kpss.p_value:.3f}, {kind} stationarity {outcome} at "
+        f"the {significance:g} level. Combined verdict: {verdict}"
+    )
+    return result
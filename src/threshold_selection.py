@@ -5,18 +5,292 @@ Threshold (POT) approach by minimizing the Estimated Quantile Mean Absolute
 Error (EQMAE) across candidate thresholds.
 """
 
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
 import numpy as np
 from numpy.typing import NDArray
 from scipy.stats import genpareto
 
-from src.data_processing import excess_set, quantile
+from src.data_processing import excess_set, order_quantile, sorted_upper
+from src.gpd_statistics import GPDFit, fit_gpd
+from src.instrumentation import (
+    Deadline,
+    DeadlineExceeded,
+    ProgressHook,
+    RunStats,
+    stage,
+)
+from src.tracing import FitTrace, TraceSink
 
 P_M_MIN = 0.6
 P_M_MAX = 0.9
 
+# Candidates per chunk of warm-started fits. Chunks are the unit of work
+# of an executor, and fixed so that scores do not depend on the workers.
+_CHUNK_SIZE = 4
+
+
+def _eqmae(
+    sorted_excesses: NDArray[np.floating],
+    stats: Optional[RunStats],
+    start: Optional[Tuple[float, float]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[float, float, float]:
+    """Fit a GPD to sorted exceedances and compute its EQMAE.
+
+    Returns:
+        Tuple of (EQMAE, shape, scale). Errors of the fit are propagated.
+    """
+    n = len(sorted_excesses)
+    with stage(stats, "select_threshold.eqmae.fit"):
+        shape, scale = fit_gpd(sorted_excesses, stats, start, deadline)
+
+    if scale <= 0:
+        return float("inf"), shape, scale
+
+    probabilities = (np.arange(1, n + 1) - 0.5) / n
+
+    estimated_quantiles = genpareto.ppf(
+        probabilities, shape, loc=0, scale=scale
+    )
+
+    eqmae = float(np.mean(np.abs(estimated_quantiles - sorted_excesses)))
+    return eqmae, shape, scale
+
+
+def _sorted_excesses(
+    data: NDArray[np.floating],
+    threshold: float,
+    stats: Optional[RunStats],
+) -> NDArray[np.floating]:
+    """Return the exceedances of threshold in ascending order."""
+    excesses = excess_set(data, threshold)
+    if stats is not None:
+        stats.record_copy(excesses)
+    if np.any(excesses[1:] < excesses[:-1]):
+        excesses = np.sort(excesses)
+        if stats is not None:
+            stats.record_copy(excesses)
+    return excesses
+
+
+@dataclass
+class _Score:
+    """EQMAE score of one candidate threshold.
+
+    Attributes:
+        eqmae: The EQMAE, infinity if there were too few exceedances or
+            the fit failed.
+        error: Estimated error of an approximate EQMAE, 0 if exact.
+        fit: Fitted (shape, scale), None without a valid fit.
+        failed: Whether a GPD fit raised or gave an invalid scale.
+        exact: Whether the score used all exceedances.
+    """
+
+    eqmae: float
+    error: float = 0.0
+    fit: Optional[Tuple[float, float]] = None
+    failed: bool = False
+    exact: bool = True
+
+
+def _score_threshold(
+    data: NDArray[np.floating],
+    threshold: float,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    max_exceedances: Optional[int] = None,
+    start: Optional[Tuple[float, float]] = None,
+    deadline: Optional[Deadline] = None,
+) -> _Score:
+    """Fit and score the exceedances of one threshold.
+
+    With ``max_exceedances``, an exceedance set larger than it is thinned
+    to its order statistics at the midpoints of ``max_exceedances`` strata
+    of equal probability. The thinned sample is split into its even and
+    odd strata, each half is fitted and scored, and the EQMAE is the mean
+    of the two; half their difference estimates the error of the
+    approximation.
+
+    Args:
+        data: Sample data array. Exceedances of sorted data need no
+            further sort.
+        threshold: Threshold value for computing excesses.
+        stats: Optional collector updated with fit counters and copies.
+        trace: Optional sink receiving one record for the score.
+        max_exceedances: Optional number of exceedances above which the
+            EQMAE is approximated.
+        start: Optional (shape, scale) the fits start from.
+        deadline: Optional deadline the fits stop at.
+
+    Returns:
+        _Score of the threshold.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes during a fit.
+    """
+    start_time = time.perf_counter() if trace is not None else 0.0
+    excesses = _sorted_excesses(data, threshold, stats)
+    n = len(excesses)
+
+    if n < 2:
+        return _Score(float("inf"))
+
+    exact = max_exceedances is None or n <= max_exceedances
+    if exact:
+        samples = [excesses]
+    else:
+        assert max_exceedances is not None
+        ranks = (np.arange(max_exceedances) + 0.5) * (n / max_exceedances)
+        thinned = excesses[ranks.astype(np.intp)]
+        samples = [thinned[0::2], thinned[1::2]]
+
+    scores = []
+    fits = []
+    try:
+        for sample in samples:
+            eqmae, shape, scale = _eqmae(sample, stats, start, deadline)
+            scores.append(eqmae)
+            fits.append((shape, scale))
+    except DeadlineExceeded:
+        raise
+    except Exception:
+        # Counted as failed instead of being silently scored as infinity.
+        score = _Score(float("inf"), failed=True, exact=exact)
+    else:
+        if not all(np.isfinite(scores)):
+            # Only a non-positive scale gives an infinite score.
+            score = _Score(float("inf"), failed=True, exact=exact)
+        else:
+            score = _Score(
+                eqmae=float(np.mean(scores)),
+                error=abs(scores[0] - scores[-1]) / 2,
+                fit=fits[0],
+                exact=exact,
+            )
+
+    if trace is not None:
+        trace.record(
+            FitTrace(
+                source="eqmae",
+                prefix_size=sum(len(sample) for sample in samples),
+                threshold=float(threshold),
+                duration=time.perf_counter() - start_time,
+                evi=None if score.fit is None else score.fit[0],
+                eqmae=None if score.failed else score.eqmae,
+            )
+        )
+    return score
+
+
+def _score_chunk(
+    data: NDArray[np.floating],
+    thresholds: List[float],
+    stats: Optional[RunStats],
+    trace: Optional[TraceSink],
+    max_exceedances: Optional[int],
+    warm_start: bool,
+    initial: Optional[Tuple[Tuple[float, float], float]] = None,
+    deadline: Optional[Deadline] = None,
+    progress: Optional[ProgressHook] = None,
+    first: int = 0,
+    total: int = 0,
+) -> List[_Score]:
+    """Score a chunk of increasing candidate thresholds in order.
+
+    With ``warm_start``, each fit starts from the last valid fit of the
+    chunk, moved to the new threshold, and the first one from
+    ``initial``, a (fit, threshold) pair, if given.
+
+    Args:
+        data: Sample data array, or the sorted values above the lowest
+            threshold of the chunk.
+        thresholds: Candidate thresholds in increasing order.
+        stats: Optional collector updated with fit counters and copies.
+        trace: Optional sink receiving one record per candidate.
+        max_exceedances: Optional number of exceedances above which the
+            EQMAE is approximated.
+        warm_start: Whether fits start from the previous candidate's fit.
+        initial: Optional fit and its threshold the first fit starts from.
+        deadline: Optional deadline the scoring stops at.
+        progress: Optional callback invoked as ``progress(done, total)``
+            after each candidate, counting from ``first``, the index of the
+            chunk's first candidate.
+        first: Index of the first candidate of the chunk.
+        total: Total passed to ``progress``.
+
+    Returns:
+        The scores of the candidates scored before the deadline passed,
+        i.e. all of them unless the deadline stopped the chunk.
+    """
+    fit, fit_threshold = initial if warm_start and initial else (None, 0.0)
+    scores: List[_Score] = []
+    try:
+        for i, threshold in enumerate(thresholds):
+            if deadline is not None:
+                deadline.check()
+            start = _next_start(fit, fit_threshold, threshold)
+            with stage(stats, "select_threshold.eqmae"):
+                score = _score_threshold(
+                    data,
+                    threshold,
+                    stats,
+                    trace,
+                    max_exceedances,
+                    start,
+                    deadline,
+                )
+            scores.append(score)
+            if warm_start and score.fit is not None:
+                fit, fit_threshold = score.fit, threshold
+            if progress is not None:
+                progress(first + i + 1, total)
+    except DeadlineExceeded:
+        pass
+    return scores
+
+
+def _score_task(
+    excess_support: NDArray[np.floating],
+    thresholds: List[float],
+    max_exceedances: Optional[int],
+    warm_start: bool,
+    initial: Optional[Tuple[Tuple[float, float], float]],
+    deadline: Optional[Deadline],
+    instrumented: bool,
+    traced: bool,
+) -> Tuple[List[_Score], Optional[RunStats], List[FitTrace]]:
+    """Score one chunk of thresholds in a pool worker.
+
+    See ``_score_chunk``. The worker fills its own collectors, which the
+    caller merges.
+
+    Returns:
+        Tuple of (scores, stats, trace records).
+    """
+    stats = RunStats() if instrumented else None
+    trace = TraceSink() if traced else None
+    scores = _score_chunk(
+        excess_support,
+        thresholds,
+        stats,
+        trace,
+        max_exceedances,
+        warm_start,
+        initial,
+        deadline,
+    )
+    return scores, stats, trace.records if trace is not None else []
+
 
 def _compute_eqmae(
-    data: NDArray[np.floating], threshold: float
+    data: NDArray[np.floating],
+    threshold: float,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
 ) -> float:
     """Compute EQMAE for a given threshold.
 
@@ -31,62 +305,160 @@ def _compute_eqmae(
     Args:
         data: Sample data array.
         threshold: Threshold value for computing excesses.
+        stats: Optional collector updated with fit counters and copies.
+        trace: Optional sink receiving one record for the fit.
 
     Returns:
         The EQMAE value. Returns infinity if fitting fails.
     """
-    excesses = excess_set(data, threshold)
-    n = len(excesses)
+    return _score_threshold(data, threshold, stats, trace).eqmae
 
-    if n < 2:
-        return float("inf")
 
-    try:
-        shape, loc, scale = genpareto.fit(excesses, floc=0)
-    except Exception:
-        return float("inf")
+def _approximate_eqmae(
+    data: NDArray[np.floating],
+    threshold: float,
+    max_exceedances: int,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+) -> Tuple[float, float]:
+    """Approximate the EQMAE of a threshold on thinned exceedances.
 
-    if scale <= 0:
-        return float("inf")
+    See ``_score_threshold``. Exceedance sets of at most
+    ``max_exceedances`` values are scored exactly.
 
-    sorted_excesses = np.sort(excesses)
+    Args:
+        data: Sample data array.
+        threshold: Threshold value for computing excesses.
+        max_exceedances: Number of exceedances above which the EQMAE is
+            approximated.
+        stats: Optional collector updated with fit counters and copies.
+        trace: Optional sink receiving one record for the fit.
 
-    probabilities = (np.arange(1, n + 1) - 0.5) / n
+    Returns:
+        Tuple of (EQMAE, estimated error). The error is 0 when the EQMAE is
+        exact or infinite.
+    """
+    score = _score_threshold(data, threshold, stats, trace, max_exceedances)
+    return score.eqmae, score.error
 
-    estimated_quantiles = genpareto.ppf(
-        probabilities, shape, loc=0, scale=scale
-    )
 
-    eqmae = np.mean(np.abs(estimated_quantiles - sorted_excesses))
+def _next_start(
+    fit: Optional[Tuple[float, float]], threshold: float, next_threshold: float
+) -> Optional[Tuple[float, float]]:
+    """Starting values for the fit at the next threshold.
 
-    return float(eqmae)
+    The exceedances of a GPD over a higher threshold are again GPD with
+    the same shape and the scale shifted by shape times the threshold
+    increase.
+    """
+    if fit is None:
+        return None
+    shape, scale = fit
+    next_scale = scale + shape * (next_threshold - threshold)
+    return (shape, next_scale) if next_scale > 0 else None
 
 
-def select_threshold(
+@dataclass
+class ThresholdSelection:
+    """Outcome of EQMAE threshold selection.
+
+    Attributes:
+        p_m: The selected threshold percentile.
+        percentiles: Candidate threshold percentiles.
+        eqmae: EQMAE of each candidate (infinity where the fit failed, NaN
+            where the candidate was not scored before the deadline).
+        eqmae_error: Estimated error of each EQMAE against the exact value;
+            0 for candidates scored exactly.
+        exact: Whether each candidate was scored on all its exceedances.
+        failed: Whether the GPD fit of each candidate failed (raised or gave
+            a non-positive scale); such candidates are never selected.
+        p_m_error: Estimated distance of the p_m the exact selection would
+            return from ``p_m``: the largest distance to a candidate whose
+            EQMAE is within the estimated errors of the minimum. 0 when
+            every competitive candidate was scored exactly.
+        partial: Whether the deadline passed before every candidate was
+            scored; p_m is then the best of the candidates scored so far.
+    """
+
+    p_m: float
+    percentiles: NDArray[np.floating]
+    eqmae: NDArray[np.floating]
+    eqmae_error: NDArray[np.floating]
+    exact: NDArray[np.bool_]
+    failed: NDArray[np.bool_]
+    p_m_error: float
+    partial: bool = False
+
+    @property
+    def n_failures(self) -> int:
+        """Number of candidates whose GPD fit failed."""
+        return int(np.count_nonzero(self.failed))
+
+    @property
+    def n_scored(self) -> int:
+        """Number of candidates scored."""
+        return int(np.count_nonzero(~np.isnan(self.eqmae)))
+
+
+def evaluate_thresholds(
     data: NDArray[np.floating],
     n_candidates: int,
     p_min: float = P_M_MIN,
     p_max: float = P_M_MAX,
-) -> float:
-    """Select optimal threshold percentile by minimizing EQMAE.
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    progress: Optional[ProgressHook] = None,
+    max_exceedances: Optional[int] = None,
+    recheck: int = 0,
+    warm_start: bool = True,
+    deadline: Optional[Deadline] = None,
+    presorted: bool = False,
+    initial_fit: Optional[GPDFit] = None,
+    executor: Optional[Executor] = None,
+) -> ThresholdSelection:
+    """Score candidate thresholds by EQMAE and select the best one.
 
-    This function evaluates candidate thresholds between p_min and p_max
-    percentiles and selects the one that minimizes the Estimated Quantile
-    Mean Absolute Error (EQMAE) when fitting a GP model to the exceedances.
-
-    Based on the approach described in the literature, candidate thresholds
-    are restricted to the 60% to 90% percentile range to:
-    1. Focus the search on the tail region
-    2. Avoid selecting thresholds that are too high
+    See ``select_threshold``. The order statistics above the p_min
+    percentile are sorted once and shared by all candidates, so neither
+    the thresholds nor the sorted exceedances are recomputed per candidate.
+    Candidates are scored in increasing order, in contiguous chunks of
+    four, and each GPD fit starts from the fit of the previous candidate
+    of its chunk, moved to the new threshold. The chunks do not
+    depend on the executor, so the scores are the same whether the chunks
+    run inline or on any number of workers. When a deadline passes,
+    scoring stops and the best candidate scored so far is selected, in a
+    selection flagged as partial.
 
     Args:
         data: Sample data array.
         n_candidates: Number of candidate thresholds to evaluate.
         p_min: Minimum percentile for candidate thresholds (default: 0.6).
         p_max: Maximum percentile for candidate thresholds (default: 0.9).
+        stats: Optional collector for per-stage timings and fit counters.
+        trace: Optional sink receiving one record per candidate score.
+        progress: Optional callback invoked as ``progress(done, total)``
+            after each candidate score (including rechecks).
+        max_exceedances: If given, candidates with more exceedances are
+            scored approximately on a thinned sample of this many order
+            statistics (see ``_approximate_eqmae``).
+        recheck: Number of the best approximately scored candidates that
+            are scored again exactly before the final selection.
+        warm_start: Start each fit from the previous candidate's fit
+            within its chunk (default: True). Otherwise every fit starts
+            from SciPy's default starting values.
+        deadline: Optional deadline the scoring stops at.
+        presorted: Whether data is already sorted in ascending order, in
+            which case its order statistics are used without sorting.
+        initial_fit: Optional GPD fit the first candidate's fit starts
+            from, moved to its threshold, e.g. a fit of an earlier analysis
+            of overlapping data. Ignored without ``warm_start``.
+        executor: Optional executor (see ``src.executors``) the chunks of
+            candidates are scored on concurrently. Each task receives the
+            sorted values above the lowest threshold of its chunk once, a
+            view for thread pools.
 
     Returns:
-        The optimal threshold percentile (p_m) that minimizes EQMAE.
+        ThresholdSelection with the per-candidate scores.
 
     Raises:
         ValueError: If p_min >= p_max or if parameters are out of valid range.
@@ -99,18 +471,255 @@ def select_threshold(
         raise ValueError("p_min must be less than p_max")
     if n_candidates < 2:
         raise ValueError("n_candidates must be at least 2")
+    if max_exceedances is not None and max_exceedances < 4:
+        raise ValueError("max_exceedances must be at least 4")
+    if recheck < 0:
+        raise ValueError("recheck must be non-negative")
 
     candidate_percentiles = np.linspace(p_min, p_max, n_candidates)
+    scores = [_Score(float("nan"), exact=False) for _ in range(n_candidates)]
+    partial = False
+    n_recheck = min(recheck, n_candidates) if max_exceedances else 0
+    total = n_candidates + n_recheck
+
+    with stage(stats, "select_threshold"):
+        with stage(stats, "select_threshold.quantile"):
+            n = len(data)
+            top, offset = sorted_upper(data, p_min, presorted)
+        if stats is not None and not presorted:
+            stats.record_copy(top)
+        thresholds = [
+            order_quantile(top, offset, n, p) for p in candidate_percentiles
+        ]
+
+        # The first chunk may start from the fit of an earlier analysis.
+        initial = None
+        if initial_fit is not None:
+            initial = (
+                (initial_fit.shape, initial_fit.scale),
+                initial_fit.threshold,
+            )
+        chunks = [
+            (first, thresholds[first:first + _CHUNK_SIZE])
+            for first in range(0, n_candidates, _CHUNK_SIZE)
+        ]
+        approximate: List[int] = []
+        try:
+            if executor is not None:
+                _score_concurrently(
+                    executor,
+                    top,
+                    chunks,
+                    scores,
+                    stats,
+                    trace,
+                    progress,
+                    total,
+                    max_exceedances,
+                    warm_start,
+                    initial,
+                    deadline,
+                )
+            else:
+                for first, chunk in chunks:
+                    chunk_scores = _score_chunk(
+                        top,
+                        chunk,
+                        stats,
+                        trace,
+                        max_exceedances,
+                        warm_start,
+                        initial if first == 0 else None,
+                        deadline,
+                        progress,
+                        first,
+                        total,
+                    )
+                    scores[first:first + len(chunk_scores)] = chunk_scores
+                    if len(chunk_scores) < len(chunk):
+                        raise DeadlineExceeded()
+
+            approximate = [i for i, s in enumerate(scores) if not s.exact]
+            approximate.sort(key=lambda i: scores[i].eqmae)
+            for done, i in enumerate(
+                approximate[:n_recheck], n_candidates + 1
+            ):
+                if deadline is not None:
+                    deadline.check()
+                with stage(stats, "select_threshold.recheck"):
+                    scores[i] = _score_threshold(
+                        top,
+                        thresholds[i],
+                        stats,
+                        trace,
+                        start=scores[i].fit if warm_start else None,
+                        deadline=deadline,
+                    )
+                if progress is not None:
+                    progress(done, total)
+        except DeadlineExceeded:
+            partial = True
+        if (
+            progress is not None
+            and not partial
+            and len(approximate) < n_recheck
+        ):
+            progress(total, total)
+
+    eqmae = np.array([s.eqmae for s in scores])
+    eqmae_error = np.array([s.error for s in scores])
+    exact = np.array([s.exact for s in scores])
+    failed = np.array([s.failed for s in scores])
+    best = int(np.argmin(np.where(np.isnan(eqmae), np.inf, eqmae)))
+    if not np.isfinite(eqmae[best]):
+        best = 0
+        competitive = np.zeros(n_candidates, dtype=bool)
+    else:
+        competitive = (
+            eqmae - eqmae_error <= eqmae[best] + eqmae_error[best]
+        )
+    p_m = float(candidate_percentiles[best])
+    p_m_error = float(
+        np.max(
+            np.abs(candidate_percentiles[competitive] - p_m),
+            initial=0.0,
+        )
+    )
+    return ThresholdSelection(
+        p_m=p_m,
+        percentiles=candidate_percentiles,
+        eqmae=eqmae,
+        eqmae_error=eqmae_error,
+        exact=exact,
+        failed=failed,
+        p_m_error=p_m_error,
+        partial=partial,
+    )
 
-    best_percentile = p_min
-    best_eqmae = float("inf")
 
-    for p in candidate_percentiles:
-        threshold = quantile(data, p)
-        eqmae = _compute_eqmae(data, threshold)
+def _score_concurrently(
+    executor: Executor,
+    top: NDArray[np.floating],
+    chunks: List[Tuple[int, List[float]]],
+    scores: List[_Score],
+    stats: Optional[RunStats],
+    trace: Optional[TraceSink],
+    progress: Optional[ProgressHook],
+    total: int,
+    max_exceedances: Optional[int],
+    warm_start: bool,
+    initial: Optional[Tuple[Tuple[float, float], float]],
+    deadline: Optional[Deadline],
+) -> None:
+    """Score chunks of candidate thresholds on an executor, in place.
 
-        if eqmae < best_eqmae:
-            best_eqmae = eqmae
-            best_percentile = p
+    Results are collected in candidate order, so progress, trace records
+    and the scores fill in as with inline scoring. Pending chunks are
+    cancelled when a chunk raises or is stopped by the deadline.
 
-    return float(best_percentile)
+    Raises:
+        DeadlineExceeded: If the deadline stopped a chunk; the scores of
+            the candidates before it are filled in.
+    """
+    futures = [
+        executor.submit(
+            _score_task,
+            top[np.searchsorted(top, chunk[0], "right"):],
+            chunk,
+            max_exceedances,
+            warm_start,
+            initial if first == 0 else None,
+            deadline,
+            stats is not None,
+            trace is not None,
+        )
+        for first, chunk in chunks
+    ]
+    try:
+        for (first, chunk), future in zip(chunks, futures):
+            with stage(stats, "select_threshold.eqmae"):
+                chunk_scores, worker_stats, records = future.result()
+            if stats is not None and worker_stats is not None:
+                stats.merge(worker_stats)
+            if trace is not None:
+                for record in records:
+                    trace.record(record)
+            for i, score in enumerate(chunk_scores, first):
+                scores[i] = score
+                if progress is not None:
+                    progress(i + 1, total)
+            if len(chunk_scores) < len(chunk):
+                raise DeadlineExceeded()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def select_threshold(
+    data: NDArray[np.floating],
+    n_candidates: int,
+    p_min: float = P_M_MIN,
+    p_max: float = P_M_MAX,
+    stats: Optional[RunStats] = None,
+    trace: Optional[TraceSink] = None,
+    progress: Optional[ProgressHook] = None,
+    max_exceedances: Optional[int] = None,
+    recheck: int = 0,
+    deadline: Optional[Deadline] = None,
+    executor: Optional[Executor] = None,
+) -> float:
+    """Select optimal threshold percentile by minimizing EQMAE.
+
+    This function evaluates candidate thresholds between p_min and p_max
+    percentiles and selects the one that minimizes the Estimated Quantile
+    Mean Absolute Error (EQMAE) when fitting a GP model to the exceedances.
+
+    Based on the approach described in the literature, candidate thresholds
+    are restricted to the 60% to 90% percentile range to:
+    1. Focus the search on the tail region
+    2. Avoid selecting thresholds that are too high
+
+    For very large samples, ``max_exceedances`` scores candidates on a
+    deterministic thinned sample of their sorted exceedances, and
+    ``recheck`` scores the best of them again exactly. Use
+    ``evaluate_thresholds`` to obtain the estimated error of the selection.
+
+    Args:
+        data: Sample data array.
+        n_candidates: Number of candidate thresholds to evaluate.
+        p_min: Minimum percentile for candidate thresholds (default: 0.6).
+        p_max: Maximum percentile for candidate thresholds (default: 0.9).
+        stats: Optional collector for per-stage timings and fit counters.
+            Instrumentation is disabled when None.
+        trace: Optional sink receiving one record per candidate fit.
+        progress: Optional callback invoked as ``progress(done, total)``
+            after each candidate threshold is evaluated. An exception it
+            raises aborts the selection.
+        max_exceedances: Optional number of exceedances above which the
+            EQMAE of a candidate is approximated (default: exact).
+        recheck: Number of the best approximate candidates to score again
+            exactly (default: 0).
+        deadline: Optional deadline. When it passes, the best candidate
+            scored so far is returned; use ``evaluate_thresholds`` to see
+            whether the selection is partial.
+        executor: Optional executor the candidates are scored on.
+
+    Returns:
+        The optimal threshold percentile (p_m) that minimizes EQMAE.
+
+    Raises:
+        ValueError: If p_min >= p_max or if parameters are out of valid range.
+    """
+    return evaluate_thresholds(
+        data,
+        n_candidates,
+        p_min=p_min,
+        p_max=p_max,
+        stats=stats,
+        trace=trace,
+        progress=progress,
+        max_exceedances=max_exceedances,
+        recheck=recheck,
+        deadline=deadline,
+        executor=executor,
+    ).p_m
@@ -0,0 +1,254 @@
+"""Fit-level trace recording for offline analysis of TailID runs.
+
+This module provides ``TraceSink``, which ``tail_id`` and threshold
+selection write one ``FitTrace`` record to for every GPD fit when a sink is
+passed to them. Records are kept in an in-memory ring buffer and can also
+be streamed to an NDJSON file by a background writer thread, so that
+serialization and file I/O stay off the fitting loop.
+"""
+
+import json
+import math
+import queue
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Union
+
+DEFAULT_TRACE_CAPACITY = 100_000
+
+_STOP = object()
+
+
+@dataclass
+class FitTrace:
+    """Record of one GPD fit.
+
+    Attributes:
+        source: Stage that performed the fit (``"tail_id"`` or ``"eqmae"``).
+        prefix_size: Number of exceedances the GPD was fitted to.
+        threshold: Threshold the exceedances were computed over.
+        duration: Wall time of the fit (and scoring, for EQMAE) in seconds.
+        evi: Estimated EVI, or None if the fit failed.
+        ci_lower: Lower bound of the CI the EVI was tested against.
+        ci_upper: Upper bound of the CI the EVI was tested against.
+        accepted: For TailID candidate fits, whether the EVI fell inside the
+            CI (the candidate was not sensitive). None for the TailID
+            baseline fit and for EQMAE fits.
+        candidate: Candidate point added before the fit (TailID only).
+        eqmae: EQMAE of the fitted model (EQMAE only).
+        seq: Sequence number assigned by the sink.
+    """
+
+    source: str
+    prefix_size: int
+    threshold: float
+    duration: float
+    evi: Optional[float] = None
+    ci_lower: Optional[float] = None
+    ci_upper: Optional[float] = None
+    accepted: Optional[bool] = None
+    candidate: Optional[float] = None
+    eqmae: Optional[float] = None
+    seq: int = -1
+
+    def to_json(self) -> str:
+        """Serialize the record as one JSON line.
+
+        Non-finite floats are written as null to keep the output valid
+        JSON.
+        """
+        record: Dict[str, Any] = asdict(self)
+        for key, value in record.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                record[key] = None
+        return json.dumps(record)
+
+
+class TraceSink:
+    """Ring buffer of fit records with an optional NDJSON file writer.
+
+    The sink keeps the most recent ``capacity`` records in memory. When a
+    path is given, every record is also queued to a background thread that
+    appends it to the file as one JSON object per line. Call ``close`` (or
+    use the sink as a context manager) to flush the file.
+
+    Args:
+        capacity: Maximum number of records kept in memory.
+        path: Optional NDJSON output file (overwritten).
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._records: Deque[FitTrace] = deque(maxlen=capacity)
+        self._seq = 0
+        self._queue: Optional["queue.SimpleQueue[Any]"] = None
+        self._writer: Optional[threading.Thread] = None
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self._queue = queue.SimpleQueue()
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._writer = threading.Thread(
+                target=self._write_loop, name="tailid-trace", daemon=True
+            )
+            self._writer.start()
+
+    def record(self, trace: FitTrace) -> None:
+        """Append a fit record to the buffer and queue it for writing.
+
+        Args:
+            trace: The fit record. Its ``seq`` is assigned by the sink.
+        """
+        trace.seq = self._seq
+        self._seq += 1
+        self._records.append(trace)
+        if self._queue is not None:
+            self._queue.put(trace)
+
+    @property
+    def records(self) -> List[FitTrace]:
+        """Records currently held in the ring buffer, oldest first."""
+        return list(self._records)
+
+    def close(self) -> None:
+        """Flush pending records to the file and stop the writer thread."""
+        if self._writer is None or self._queue is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        self._file.close()
+
+    def __enter__(self) -> "TraceSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write_loop(self) -> None:
+        """Write queued records until the stop marker is received."""
+        assert self._queue is not None
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            self._file.write(item.to_json() + "\n")
+
+
+def load_trace(path: Union[str, Path]) -> List[FitTrace]:
+    """Read fit records from an NDJSON trace file.
+
+    Args:
+        path: Path of a file written by ``TraceSink``.
+
+    Returns:
+        The fit records in file order.
+    """
+    names = {f.name for f in fields(FitTrace)}
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                records.append(
+                    FitTrace(**{k: v for k, v in data.items() if k in names})
+                )
+    return records
+
+
+@dataclass
+class TraceSummary:
+    """Summary of a fit trace.
+
+    Attributes:
+        n_fits: Number of fits per source.
+        total_duration: Total fit wall time per source in seconds.
+        slowest: The slowest fits, slowest first.
+        trajectory: TailID fits in candidate order, giving the EVI and CI
+            trajectory across candidates.
+        top: Number of fits listed at each end of the trajectory by
+            ``format``.
+    """
+
+    n_fits: Dict[str, int]
+    total_duration: Dict[str, float]
+    slowest: List[FitTrace]
+    trajectory: List[FitTrace]
+    top: int = 10
+
+    def format(self) -> str:
+        """Format the summary as a human-readable report."""
+        lines = []
+        for source, count in self.n_fits.items():
+            lines.append(
+                f"  {source}: {count} fits, "
+                f"{self.total_duration[source]:.4f} s"
+            )
+        lines.append("  Slowest fits:")
+        for t in self.slowest:
+            lines.append(
+                f"    #{t.seq} {t.source} n={t.prefix_size} "
+                f"threshold={t.threshold:.6g} evi={_fmt(t.evi)} "
+                f"{t.duration:.4f} s"
+            )
+        if self.trajectory:
+            lines.append("  EVI/CI trajectory (candidate, evi, ci, accepted):")
+            omitted = len(self.trajectory) - 2 * self.top
+            if omitted > 0:
+                head = self.trajectory[: self.top]
+                tail = self.trajectory[-self.top:]
+            else:
+                head, tail = self.trajectory, []
+            for t in head:
+                lines.append(_trajectory_line(t))
+            if tail:
+                lines.append(f"    ... {omitted} fits omitted ...")
+            for t in tail:
+                lines.append(_trajectory_line(t))
+        return "\n".join(lines)
+
+
+def _trajectory_line(t: FitTrace) -> str:
+    """Format one TailID fit of the EVI/CI trajectory."""
+    return (
+        f"    {_fmt(t.candidate)} {_fmt(t.evi)} "
+        f"[{_fmt(t.ci_lower)}, {_fmt(t.ci_upper)}] {t.accepted}"
+    )
+
+
+def _fmt(value: Optional[float]) -> str:
+    """Format an optional float for the summary report."""
+    return "-" if value is None else f"{value:.6g}"
+
+
+def summarize_trace(records: Iterable[FitTrace], top: int = 10) -> TraceSummary:
+    """Summarize fit records into the slowest fits and the EVI trajectory.
+
+    Args:
+        records: Fit records, e.g. ``sink.records`` or ``load_trace(path)``.
+        top: Number of slowest fits to report, and of TailID fits shown at
+            each end of the trajectory by ``TraceSummary.format``.
+
+    Returns:
+        TraceSummary of the records.
+    """
+    records = list(records)
+    n_fits: Dict[str, int] = {}
+    total_duration: Dict[str, float] = {}
+    for t in records:
+        n_fits[t.source] = n_fits.get(t.source, 0) + 1
+        total_duration[t.source] = (
+            total_duration.get(t.source, 0.0) + t.duration
+        )
+
+    slowest = sorted(records, key=lambda t: t.duration, reverse=True)[:top]
+    trajectory = sorted(
+        (t for t in records if t.source == "tail_id"), key=lambda t: t.seq
+    )
+    return TraceSummary(n_fits, total_duration, slowest, trajectory, top)
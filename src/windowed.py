@@ -0,0 +1,89 @@
+"""Sliding and tumbling window TailID analysis of time-ordered traces.
+
+This module runs threshold selection and TailID over consecutive windows of
+a trace to locate where in a long run a tail mixture appears. Each window is
+sorted once and the analysis reads its order statistics from the sorted
+array without sorting it again.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.defaults import GAMMA_DEFAULT, MOS_DEFAULT
+from src.pipeline import run_analysis
+from src.tailid import TailIDResult
+
+
+@dataclass
+class WindowResult:
+    """TailID result for one window of a trace.
+
+    Attributes:
+        start: Index of the first sample of the window.
+        stop: Index one past the last sample of the window.
+        p_m: Extreme value percentile selected for the window.
+        result: TailID result for the window.
+    """
+
+    start: int
+    stop: int
+    p_m: float
+    result: TailIDResult
+
+
+def iter_windows(
+    data: NDArray[np.floating],
+    window: int,
+    step: int,
+    p_c1: float,
+    n_candidates: int,
+    gamma: float = GAMMA_DEFAULT,
+    mos: Union[int, str] = MOS_DEFAULT,
+) -> Iterator[WindowResult]:
+    """Run threshold selection and TailID over windows of a trace.
+
+    Windows of ``window`` consecutive samples start every ``step`` samples;
+    ``step < window`` gives sliding windows and ``step >= window`` tumbling
+    windows. Only complete windows are analysed. Results are yielded as
+    soon as each window is analysed, so long traces can be processed as a
+    stream.
+
+    Each window is sorted once with ``np.sort`` and analysed as presorted
+    data, so neither threshold selection nor TailID sorts it again. NumPy's
+    vectorized sort of a window is about as fast as updating the sorted
+    window of the previous slide in place, and its cost is small next to
+    the GPD fits of the analysis.
+
+    Args:
+        data: Time-ordered sample data (may be a memory-mapped array).
+        window: Number of samples per window.
+        step: Number of samples between consecutive window starts.
+        p_c1: Candidate percentile (0 < p_c1 < 1).
+        n_candidates: Number of candidate thresholds for p_m selection.
+        gamma: Confidence level (default: 0.9999).
+        mos: Minimum of Samples threshold (default: 40), or
+            ``"auto"`` to estimate it (see ``tail_id``).
+
+    Yields:
+        WindowResult for each complete window, in trace order.
+
+    Raises:
+        ValueError: If window or step is not positive.
+    """
+    if window < 1:
+        raise ValueError("window must be positive")
+    if step < 1:
+        raise ValueError("step must be positive")
+
+    for start in range(0, len(data) - window + 1, step):
+        stop = start + window
+        values = np.sort(data[start:stop])
+        analysis = run_analysis(
+            values, p_c1, n_candidates, gamma, mos, presorted=True
+        )
+        yield WindowResult(
+            start=start, stop=stop, p_m=analysis.p_m, result=analysis.result
+        )
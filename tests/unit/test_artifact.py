@@ -0,0 +1,151 @@
+"""Unit tests for memory-mapped analysis artifacts."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.artifact import AnalysisArtifact, load_result, write_artifact
+from src.instrumentation import Deadline
+from src.kpss import kpss_test
+from src.pwcet import estimate_pwcet
+from src.tailid import TailIDScenario, combine_with_kpss, tail_id
+from src.threshold_selection import evaluate_thresholds
+from src.tracing import TraceSink
+
+
+def _mixture_data() -> np.ndarray:
+    """Return a trace on which TailID reports Scenario 2."""
+    rng = np.random.default_rng(0)
+    return np.concatenate(
+        [rng.normal(100.0, 5.0, 2000), rng.normal(200.0, 5.0, 300)]
+    )
+
+
+class TestArtifact:
+    """Tests for write_artifact and AnalysisArtifact."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that every section and the result are restored."""
+        data = _mixture_data()
+        trace = TraceSink()
+        selection = evaluate_thresholds(
+            data, n_candidates=5, p_max=0.75, trace=trace
+        )
+        result = tail_id(data, selection.p_m, 0.8, 0.9999, trace=trace)
+        assert result.scenario == TailIDScenario.SCENARIO_2
+        path = tmp_path / "analysis.tailid"
+        write_artifact(
+            path, data, selection.p_m, 0.8, result, selection, trace.records
+        )
+
+        artifact = AnalysisArtifact(path)
+        assert artifact.n_samples == len(data)
+        assert artifact.p_m == selection.p_m
+        assert isinstance(artifact.tail, np.memmap)
+        assert not artifact.tail.flags.writeable
+        threshold = np.quantile(data, selection.p_m)
+        np.testing.assert_array_equal(
+            artifact.tail, np.sort(data[data >= threshold])
+        )
+        np.testing.assert_array_equal(
+            artifact.eqmae["percentile"], selection.percentiles
+        )
+        np.testing.assert_array_equal(
+            artifact.eqmae["eqmae"], selection.eqmae
+        )
+
+        fits = [r for r in trace.records if r.source == "tail_id"]
+        assert len(artifact.evi) == len(fits)
+        assert artifact.evi["accepted"][0] == -1
+        assert np.isnan(artifact.evi["candidate"][0])
+        assert artifact.evi["accepted"][-1] == 0
+        np.testing.assert_array_equal(
+            artifact.evi["evi"], [fit.evi for fit in fits]
+        )
+
+        loaded = artifact.result
+        assert loaded.scenario == result.scenario
+        assert loaded.tail_threshold == result.tail_threshold
+        assert loaded.fit == result.fit
+        assert loaded.message == result.message
+        np.testing.assert_array_equal(
+            loaded.sensitive_points, result.sensitive_points
+        )
+
+    def test_partial_result(self, tmp_path: Path) -> None:
+        """Test that a partial result is stored as undetermined."""
+        data = _mixture_data()
+        result = tail_id(data, 0.7, 0.8, 0.9999, deadline=Deadline.after(0))
+        path = tmp_path / "analysis.tailid"
+        write_artifact(path, data, 0.7, 0.8, result)
+
+        loaded = load_result(path)
+        assert loaded.partial
+        assert loaded.scenario == TailIDScenario.UNDETERMINED
+        assert loaded.candidates_total == result.candidates_total
+
+    def test_sections_are_npy(self, tmp_path: Path) -> None:
+        """Test that sections are aligned and readable with np.load."""
+        data = _mixture_data().astype(np.float32)
+        result = tail_id(data, 0.6, 0.8, 0.9999)
+        path = tmp_path / "analysis.tailid"
+        write_artifact(path, data, 0.6, 0.8, result)
+
+        artifact = AnalysisArtifact(path)
+        assert artifact.tail.dtype == np.float32
+        assert artifact.tail.ctypes.data % 64 == 0
+        assert len(artifact.eqmae) == 0 and len(artifact.evi) == 0
+        with open(path, "rb") as f:
+            f.seek(artifact.index["sections"]["sensitive_points"])
+            np.testing.assert_array_equal(
+                np.load(f), result.sensitive_points
+            )
+
+    def test_load_result_with_kpss(self, tmp_path: Path) -> None:
+        """Test that a combined KPSS verdict survives the round trip."""
+        rng = np.random.default_rng(1)
+        data = rng.normal(100.0, 5.0, 2000)
+        result = combine_with_kpss(
+            tail_id(data, 0.6, 0.9, 0.9999), kpss_test(data)
+        )
+        path = tmp_path / "analysis.tailid"
+        write_artifact(path, data, 0.6, 0.9, result)
+
+        loaded = load_result(path)
+        assert loaded.scenario == result.scenario
+        assert loaded.kpss == result.kpss
+        assert loaded.id_supported == result.id_supported
+        assert loaded.message == result.message
+        np.testing.assert_array_equal(
+            loaded.sensitive_points, result.sensitive_points
+        )
+
+    def test_pwcet_from_tail(self, tmp_path: Path) -> None:
+        """Test that the stored tail stands in for the trace in pWCET."""
+        data = _mixture_data()
+        result = tail_id(data, 0.6, 0.8, 0.9999)
+        path = tmp_path / "analysis.tailid"
+        write_artifact(path, data, 0.6, 0.8, result)
+
+        artifact = AnalysisArtifact(path)
+        curve = estimate_pwcet(
+            artifact.result,
+            artifact.tail,
+            confidence_level=0.9,
+            n_resamples=64,
+            n_samples=artifact.n_samples,
+        )
+        expected = estimate_pwcet(
+            result, np.sort(data), confidence_level=0.9, n_resamples=64
+        )
+        assert curve.fit == expected.fit
+        np.testing.assert_array_equal(curve.pwcet, expected.pwcet)
+        np.testing.assert_array_equal(curve.lower, expected.lower)
+
+    def test_not_an_artifact(self, tmp_path: Path) -> None:
+        """Test that other files raise ValueError."""
+        path = tmp_path / "data.npy"
+        np.save(path, np.arange(10.0))
+        with pytest.raises(ValueError, match="not a TailID artifact"):
+            AnalysisArtifact(path)
@@ -0,0 +1,116 @@
+"""Unit tests for the asyncio-friendly TailID API."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.async_api import Progress, aload_data, aselect_threshold, atail_id
+from src.tailid import tail_id
+from src.threshold_selection import select_threshold
+
+
+class TestAloadData:
+    """Tests for the aload_data function."""
+
+    def test_matches_sync_loading(self, tmp_path: Path) -> None:
+        """Test that the file is loaded like load_data_from_file."""
+        data_file = tmp_path / "data.txt"
+        data_file.write_text("1.0\n2.0\n3.0\n")
+        data = asyncio.run(aload_data(str(data_file)))
+        np.testing.assert_array_equal(data, [1.0, 2.0, 3.0])
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(aload_data(str(tmp_path / "missing.txt")))
+
+
+class TestAselectThreshold:
+    """Tests for the aselect_threshold function."""
+
+    def test_matches_sync_and_reports_progress(self) -> None:
+        """Test the result and one progress record per candidate."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=300)
+
+        async def run() -> List[Progress]:
+            task = aselect_threshold(data, n_candidates=5)
+            records = [p async for p in task]
+            assert await task == select_threshold(data, n_candidates=5)
+            return records
+
+        records = asyncio.run(run())
+        assert [p.done for p in records] == [1, 2, 3, 4, 5]
+        assert all(p.total == 5 for p in records)
+        assert all(p.stage == "select_threshold" for p in records)
+
+
+class TestAtailId:
+    """Tests for the atail_id function."""
+
+    def test_matches_sync(self) -> None:
+        """Test that the result matches tail_id."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=1000)
+        expected = tail_id(data, p_m=0.8, p_c1=0.95, gamma=0.95)
+
+        async def run() -> np.ndarray:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                result = await atail_id(
+                    data, p_m=0.8, p_c1=0.95, gamma=0.95, executor=executor
+                )
+            return result.sensitive_points
+
+        np.testing.assert_array_equal(
+            asyncio.run(run()), expected.sensitive_points
+        )
+
+    def test_concurrent_runs(self) -> None:
+        """Test that several traces can be analysed concurrently."""
+        np.random.seed(0)
+        traces = [np.random.exponential(size=500) for _ in range(3)]
+
+        async def run() -> List[int]:
+            results = await asyncio.gather(
+                *(atail_id(t, p_m=0.8, p_c1=0.95, gamma=0.95) for t in traces)
+            )
+            return [len(r.sensitive_points) for r in results]
+
+        expected = [
+            len(tail_id(t, p_m=0.8, p_c1=0.95, gamma=0.95).sensitive_points)
+            for t in traces
+        ]
+        assert asyncio.run(run()) == expected
+
+    def test_timeout_stops_worker(self) -> None:
+        """Test that a timeout stops the run at the next candidate."""
+        np.random.seed(1)
+        data = np.random.exponential(scale=1.0, size=20000)
+        done: List[int] = []
+        stopped = threading.Event()
+
+        async def run() -> None:
+            task = atail_id(data, p_m=0.8, p_c1=0.99, gamma=0.95, timeout=0.05)
+            with pytest.raises(asyncio.TimeoutError):
+                await task
+            async for progress in task:
+                done.append(progress.done)
+            stopped.set()
+
+        asyncio.run(run())
+        assert stopped.is_set()
+        assert not done or done[-1] < 200
+
+    def test_invalid_parameters(self) -> None:
+        """Test that validation errors are raised when awaited."""
+
+        async def run() -> None:
+            await atail_id(np.arange(10.0), p_m=0.9, p_c1=0.8, gamma=0.95)
+
+        with pytest.raises(ValueError, match="p_m must be less than p_c1"):
+            asyncio.run(run())
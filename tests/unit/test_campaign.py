@@ -0,0 +1,187 @@
+"""Unit tests for the file-based campaign runner."""
+
+import json
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from src.campaign import (
+    _LeaseObserver,
+    merge_campaign,
+    run_worker,
+    submit_campaign,
+)
+from src.pipeline import run_analysis
+
+
+def _write_manifest(tmp_path: Path, jobs: List[Dict[str, Any]]) -> Path:
+    """Write a campaign manifest of the given jobs."""
+    manifest = tmp_path / "manifest.jsonl"
+    with open(manifest, "w") as f:
+        for job in jobs:
+            f.write(json.dumps(job) + "\n")
+    return manifest
+
+
+def _trace_jobs(tmp_path: Path, n_jobs: int) -> List[Dict[str, Any]]:
+    """Write n_jobs traces and return jobs referencing them by relative path."""
+    rng = np.random.default_rng(0)
+    jobs = []
+    for i in range(n_jobs):
+        np.save(tmp_path / f"trace{i}.npy", rng.exponential(size=300))
+        jobs.append(
+            {
+                "id": f"t{i}",
+                "path": f"trace{i}.npy",
+                "p_c1": 0.95,
+                "n_candidates": 5,
+            }
+        )
+    return jobs
+
+
+class TestSubmitCampaign:
+    """Tests for the submit_campaign function."""
+
+    def test_creates_pending_jobs(self, tmp_path: Path) -> None:
+        """Test that each manifest line becomes a pending job file."""
+        manifest = _write_manifest(tmp_path, _trace_jobs(tmp_path, 3))
+        assert submit_campaign(manifest, tmp_path / "queue") == 3
+        pending = sorted((tmp_path / "queue" / "pending").glob("*.json"))
+        assert len(pending) == 3
+        entry = json.loads(pending[0].read_text())
+        assert entry["id"] == "t0"
+        assert entry["job"]["path"] == str(tmp_path / "trace0.npy")
+
+    def test_invalid_manifest(self, tmp_path: Path) -> None:
+        """Test that invalid jobs and reused queues raise ValueError."""
+        manifest = _write_manifest(tmp_path, [{"path": "a.npy"}])
+        with pytest.raises(ValueError, match="line 1"):
+            submit_campaign(manifest, tmp_path / "queue")
+
+        manifest = _write_manifest(tmp_path, _trace_jobs(tmp_path, 1))
+        submit_campaign(manifest, tmp_path / "queue")
+        with pytest.raises(ValueError, match="already holds jobs"):
+            submit_campaign(manifest, tmp_path / "queue")
+
+
+class TestRunWorker:
+    """Tests for the run_worker and merge_campaign functions."""
+
+    def test_runs_all_jobs(self, tmp_path: Path) -> None:
+        """Test that a worker runs every job like run_analysis."""
+        manifest = _write_manifest(tmp_path, _trace_jobs(tmp_path, 3))
+        queue = tmp_path / "queue"
+        submit_campaign(manifest, queue)
+
+        summary = run_worker(queue)
+        assert summary.done == 3
+
+        report = merge_campaign(queue)
+        assert report.complete
+        assert [entry["id"] for entry in report.results] == ["t0", "t1", "t2"]
+        expected = run_analysis(
+            np.load(tmp_path / "trace1.npy"), p_c1=0.95, n_candidates=5
+        )
+        result = report.results[1]["result"]
+        assert result["p_m"] == expected.p_m
+        assert result["scenario"] == expected.result.scenario.name
+
+        report.save(tmp_path / "report.jsonl")
+        lines = (tmp_path / "report.jsonl").read_text().splitlines()
+        assert len(lines) == 3
+
+    def test_retries_then_fails(self, tmp_path: Path) -> None:
+        """Test that a failing job is retried and then moved to failed."""
+        jobs = [
+            {
+                "id": "bad",
+                "path": "missing.npy",
+                "p_c1": 0.95,
+                "n_candidates": 5,
+            }
+        ]
+        queue = tmp_path / "queue"
+        submit_campaign(_write_manifest(tmp_path, jobs), queue)
+
+        summary = run_worker(queue, max_attempts=2)
+        assert (summary.retried, summary.failed) == (1, 1)
+
+        report = merge_campaign(queue)
+        assert report.complete
+        assert report.results == []
+        assert report.failed[0]["attempts"] == 2
+        assert "FileNotFoundError" in report.failed[0]["errors"][-1]
+
+    def test_takes_over_expired_lease(self, tmp_path: Path) -> None:
+        """Test that a job abandoned by a dead worker is run again."""
+        manifest = _write_manifest(tmp_path, _trace_jobs(tmp_path, 1))
+        queue = tmp_path / "queue"
+        submit_campaign(manifest, queue)
+        # Simulate a worker that claimed the job and died.
+        pending = queue / "pending" / "000000.json"
+        claimed = queue / "claimed" / "000000@dead-0.json"
+        os.rename(pending, claimed)
+        (queue / "claimed" / "000000@dead-0.lease").write_text(
+            json.dumps({"worker": "dead", "renewal": 0, "seconds": 0.2})
+        )
+
+        summary = run_worker(queue, lease_seconds=60, poll_interval=0.05)
+        assert (summary.taken_over, summary.done) == (1, 1)
+        assert merge_campaign(queue).results[0]["attempts"] == 1
+        assert not any((queue / "claimed").iterdir())
+
+    def test_renewed_lease_is_not_taken_over(self, tmp_path: Path) -> None:
+        """Test that a lease is timed by its renewals, not by file times."""
+        manifest = _write_manifest(tmp_path, _trace_jobs(tmp_path, 1))
+        queue = tmp_path / "queue"
+        submit_campaign(manifest, queue)
+        claimed = queue / "claimed" / "000000@other-0.json"
+        os.rename(queue / "pending" / "000000.json", claimed)
+        # Modification times far in the past, as under clock skew.
+        lease = queue / "claimed" / "000000@other-0.lease"
+        lease.write_text(json.dumps({"renewal": 0, "seconds": 0.3}))
+        os.utime(claimed, (0, 0))
+        os.utime(lease, (0, 0))
+
+        observer = _LeaseObserver(lease_seconds=60)
+        assert not observer.expired(claimed)
+        for renewal in range(1, 4):
+            time.sleep(0.2)
+            lease.write_text(json.dumps({"renewal": renewal, "seconds": 0.3}))
+            os.utime(lease, (0, 0))
+            assert not observer.expired(claimed)
+        time.sleep(0.4)
+        assert observer.expired(claimed)
+
+    def test_several_processes(self, tmp_path: Path) -> None:
+        """Test that concurrent worker processes run each job once."""
+        manifest = _write_manifest(tmp_path, _trace_jobs(tmp_path, 6))
+        queue = tmp_path / "queue"
+        submit_campaign(manifest, queue)
+
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=run_worker, args=(str(queue),))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=120)
+            assert worker.exitcode == 0
+
+        report = merge_campaign(queue)
+        assert report.complete and not report.failed
+        assert [entry["index"] for entry in report.results] == list(range(6))
+        assert all(entry["attempts"] == 1 for entry in report.results)
+
+    def test_not_a_queue(self, tmp_path: Path) -> None:
+        """Test that a directory without queue layout raises ValueError."""
+        with pytest.raises(ValueError, match="campaign queue"):
+            run_worker(tmp_path)
@@ -0,0 +1,72 @@
+"""Unit tests for the command-line entry point."""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cli import main
+
+EXAMPLE_DATA = Path(__file__).parents[2] / "example_data.txt"
+ANALYSIS_ARGS = ["--p_c1", "0.99", "--n_candidates", "5", "--no-daemon"]
+
+
+class TestMainDispatch:
+    """Tests for how main tells subcommands from data files."""
+
+    @pytest.fixture
+    def data_named_generate(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Path:
+        """Copy the example data to a file named like a subcommand."""
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "generate"
+        shutil.copy(EXAMPLE_DATA, path)
+        return path
+
+    def test_double_dash_analyses_file(
+        self, data_named_generate: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that a leading -- analyses a file named like a subcommand."""
+        assert main(["--", "generate", *ANALYSIS_ARGS]) == 0
+        out = capsys.readouterr().out
+        assert "Loaded 1000 data points from generate" in out
+
+    def test_relative_path_analyses_file(
+        self, data_named_generate: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that ./NAME analyses a file named like a subcommand."""
+        assert main(["./generate", *ANALYSIS_ARGS]) == 0
+        out = capsys.readouterr().out
+        assert "Loaded 1000 data points from ./generate" in out
+
+    def test_subcommand_name_runs_subcommand(
+        self, data_named_generate: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that a plain subcommand name still runs the subcommand."""
+        assert main(["generate", "trace.npy", "--n", "100"]) == 0
+        assert "Wrote 100 samples" in capsys.readouterr().out
+        assert len(np.load("trace.npy")) == 100
+
+
+class TestAnalysisArguments:
+    """Tests for the validation of analysis arguments."""
+
+    def test_pwcet_confidence_requires_pwcet(
+        self, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that --pwcet-confidence without --pwcet is rejected."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(
+                [
+                    str(EXAMPLE_DATA),
+                    *ANALYSIS_ARGS,
+                    "--pwcet-confidence",
+                    "0.9",
+                ]
+            )
+        assert exc_info.value.code == 2
+        assert "--pwcet-confidence requires --pwcet" in (
+            capsys.readouterr().err
+        )
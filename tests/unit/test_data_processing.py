@@ -1,9 +1,12 @@
 """Unit tests for the data processing utilities."""
 
 import numpy as np
+import pytest
 
 from src.data_processing import (
+    excess_dtype,
     excess_set,
+    extract_tail,
     quantile,
     select_candidates,
 )
@@ -60,6 +63,11 @@ class TestSelectCandidates:
         candidates = select_candidates(data, 0.99)
         assert len(candidates) >= 1
 
+    def test_select_candidates_keeps_dtype(self) -> None:
+        """Test that candidates keep the dtype of the data."""
+        data = np.arange(100, dtype=np.uint32)
+        assert select_candidates(data, 0.9).dtype == np.uint32
+
 
 class TestExcessSet:
     """Tests for the excess_set function."""
@@ -94,3 +102,73 @@ class TestExcessSet:
         excesses = excess_set(data, threshold)
         expected = np.array([1.0, 2.0])
         np.testing.assert_array_almost_equal(excesses, expected)
+
+    def test_excess_set_compact_dtypes(self) -> None:
+        """Test that integer and float32 data give float32 exceedances."""
+        cycles = np.array([4_000_000_000, 4_000_000_003], dtype=np.uint32)
+        excesses = excess_set(cycles, 4_000_000_000.0)
+        assert excesses.dtype == np.float32
+        np.testing.assert_array_equal(excesses, [3.0])
+
+        data = np.array([1.0, 2.5, 4.0], dtype=np.float32)
+        assert excess_set(data, 2.0).dtype == np.float32
+        assert excess_set(data.astype(np.float64), 2.0).dtype == np.float64
+
+    def test_excess_dtype(self) -> None:
+        """Test the exceedance dtype of each data dtype."""
+        assert excess_dtype(np.int64) == np.float32
+        assert excess_dtype(np.float16) == np.float32
+        assert excess_dtype(np.float32) == np.float32
+        assert excess_dtype(np.float64) == np.float64
+
+
+class TestExtractTail:
+    """Tests for the extract_tail function."""
+
+    @pytest.mark.parametrize(
+        "dtype", [np.float64, np.float32, np.uint32, np.int64]
+    )
+    def test_matches_quantile_and_sort(self, dtype: type) -> None:
+        """Test the tail against np.quantile and a full sort."""
+        rng = np.random.default_rng(0)
+        for n in (1, 2, 17, 1000):
+            data = rng.exponential(scale=100.0, size=n).astype(dtype)
+            tail = extract_tail(data, 0.63, 0.95)
+            assert tail.n == n
+            assert tail.t_m == quantile(data, 0.63)
+            assert tail.t_c1 == quantile(data, 0.95)
+            np.testing.assert_array_equal(
+                tail.values, np.sort(data[data >= tail.t_m])
+            )
+            np.testing.assert_array_equal(
+                tail.candidates, select_candidates(data, 0.95)
+            )
+            np.testing.assert_array_equal(
+                tail.exceedances, np.sort(data[data > tail.t_m])
+            )
+            assert tail.values.dtype == dtype
+
+    def test_ties(self) -> None:
+        """Test that values tied with the thresholds are kept."""
+        data = np.array([1.0, 2.0, 2.0, 2.0, 2.0, 3.0])
+        tail = extract_tail(data, 0.5, 0.6)
+        assert tail.t_m == tail.t_c1 == 2.0
+        np.testing.assert_array_equal(tail.candidates, [2.0] * 4 + [3.0])
+        np.testing.assert_array_equal(tail.exceedances, [3.0])
+
+    def test_presorted(self) -> None:
+        """Test that sorted data gives the same tail as a view."""
+        rng = np.random.default_rng(1)
+        data = np.sort(rng.integers(0, 50, size=1000))
+        tail = extract_tail(data, 0.63, 0.95, presorted=True)
+        expected = extract_tail(data, 0.63, 0.95)
+        assert (tail.t_m, tail.t_c1) == (expected.t_m, expected.t_c1)
+        np.testing.assert_array_equal(tail.values, expected.values)
+        assert np.shares_memory(tail.values, data)
+
+    def test_invalid_parameters(self) -> None:
+        """Test that invalid parameters raise ValueError."""
+        with pytest.raises(ValueError, match="p_m"):
+            extract_tail(np.arange(10.0), 0.9, 0.5)
+        with pytest.raises(ValueError, match="empty"):
+            extract_tail(np.array([]), 0.5, 0.9)
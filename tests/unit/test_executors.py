@@ -0,0 +1,64 @@
+"""Unit tests for the worker pool backends."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.executors import (
+    AUTO_THREAD_MIN_SAMPLES,
+    create_executor,
+    gil_enabled,
+    resolve_backend,
+)
+
+
+class TestResolveBackend:
+    """Tests for the resolve_backend function."""
+
+    def test_explicit_backends(self) -> None:
+        """Test that explicit backends are kept."""
+        assert resolve_backend("thread", 10) == "thread"
+        assert resolve_backend("process", 10**9) == "process"
+
+    def test_auto_by_input_size(self) -> None:
+        """Test that auto picks threads for large inputs under the GIL."""
+        with patch("src.executors.gil_enabled", return_value=True):
+            assert resolve_backend("auto", 1000) == "process"
+            assert (
+                resolve_backend("auto", AUTO_THREAD_MIN_SAMPLES) == "thread"
+            )
+
+    def test_auto_without_gil(self) -> None:
+        """Test that auto always picks threads on free-threaded builds."""
+        with patch("src.executors.gil_enabled", return_value=False):
+            assert resolve_backend("auto", 1000) == "thread"
+
+    def test_unknown_backend(self) -> None:
+        """Test that unknown backends raise ValueError."""
+        with pytest.raises(ValueError, match="backend"):
+            resolve_backend("gpu", 1000)
+
+
+class TestCreateExecutor:
+    """Tests for the create_executor function."""
+
+    def test_single_worker_runs_inline(self) -> None:
+        """Test that one worker gives no pool."""
+        assert create_executor(1, "process") is None
+
+    def test_backends(self) -> None:
+        """Test the executor type of each backend."""
+        with create_executor(2, "thread") as executor:
+            assert isinstance(executor, ThreadPoolExecutor)
+        with create_executor(2, "process") as executor:
+            assert isinstance(executor, ProcessPoolExecutor)
+
+    def test_invalid_workers(self) -> None:
+        """Test that non-positive worker counts raise ValueError."""
+        with pytest.raises(ValueError, match="workers"):
+            create_executor(0)
+
+    def test_gil_enabled(self) -> None:
+        """Test the GIL detection of this interpreter."""
+        assert isinstance(gil_enabled(), bool)
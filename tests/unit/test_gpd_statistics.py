@@ -1,12 +1,24 @@
 """Unit tests for the GPD fitting and statistical functions."""
 
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import numpy as np
+import pytest
+from scipy.stats import genpareto
 
 from src.gpd_statistics import (
+    bootstrap_gpd_fits,
+    compute_gpd_bootstrap_ci,
     compute_gpd_ci,
+    fit_gpd,
+    fit_gpd_batch,
     fit_gpd_evi,
+    fit_gpd_mle_batch,
     is_in_interval,
+    refit_gpd,
 )
+from src.instrumentation import Deadline, DeadlineExceeded, RunStats
 
 
 class TestFitGPDEVI:
@@ -32,6 +44,23 @@ class TestFitGPDEVI:
         assert -0.5 < result < 0.5
 
 
+class TestFitGPDDeadline:
+    """Tests for fit_gpd with a deadline."""
+
+    def test_expired_deadline_aborts_fit(self) -> None:
+        """Test that an expired deadline raises and is not a failure."""
+        data = np.random.default_rng(0).exponential(size=500)
+        stats = RunStats()
+        with pytest.raises(DeadlineExceeded):
+            fit_gpd(data, stats, deadline=Deadline.after(0))
+        assert stats.n_fits == 0
+
+    def test_ample_deadline(self) -> None:
+        """Test that a deadline that does not pass gives the same fit."""
+        data = np.random.default_rng(0).exponential(size=500)
+        assert fit_gpd(data, deadline=Deadline.after(600)) == fit_gpd(data)
+
+
 class TestComputeGPDCI:
     """Tests for the compute_gpd_ci function."""
 
@@ -85,6 +114,153 @@ class TestComputeGPDCI:
         assert abs(upper - 1.196) < 0.001
 
 
+class TestFitGPDBatch:
+    """Tests for the fit_gpd_batch function."""
+
+    def test_fit_gpd_batch_shapes(self) -> None:
+        """Test that one estimate is returned per row."""
+        rng = np.random.default_rng(0)
+        data = rng.exponential(scale=1.0, size=(7, 100))
+        shape, scale = fit_gpd_batch(data)
+        assert shape.shape == (7,)
+        assert scale.shape == (7,)
+        assert np.all(scale > 0)
+
+    def test_fit_gpd_batch_close_to_mle(self) -> None:
+        """Test that the batched estimates are close to the MLE."""
+        rng = np.random.default_rng(1)
+        data = genpareto.rvs(0.2, scale=2.0, size=(3, 500), random_state=rng)
+        shape, _ = fit_gpd_batch(data)
+        for row, xi in zip(data, shape):
+            assert abs(xi - fit_gpd_evi(row)) < 0.05
+
+    def test_fit_gpd_batch_blocks(self) -> None:
+        """Test that blocking over grid points and columns changes nothing."""
+        rng = np.random.default_rng(5)
+        data = genpareto.rvs(0.2, size=(4, 900), random_state=rng)
+        expected = fit_gpd_batch(data)
+        # One grid point and 125 columns per block.
+        with patch("src.gpd_statistics._BATCH_ELEMENTS", 500):
+            shape, scale = fit_gpd_batch(data)
+        np.testing.assert_allclose(shape, expected[0], rtol=1e-10)
+        np.testing.assert_allclose(scale, expected[1], rtol=1e-10)
+
+
+class TestRefitGPD:
+    """Tests for the refit_gpd function."""
+
+    @pytest.mark.parametrize("xi", [-0.4, 0.0, 0.3])
+    def test_matches_fit_gpd(self, xi: float) -> None:
+        """Test that refitting a longer prefix gives its MLE."""
+        rng = np.random.default_rng(4)
+        data = np.sort(
+            genpareto.rvs(xi, scale=3.0, size=2000, random_state=rng)
+        )
+        previous = fit_gpd(data[:-5])
+        stats = RunStats()
+        shape, scale = refit_gpd(data, previous, stats)
+        expected = fit_gpd(data)
+        assert shape == pytest.approx(expected[0], abs=1e-3)
+        assert scale == pytest.approx(expected[1], rel=1e-3)
+        assert stats.n_fits == 1
+
+    def test_far_previous_fit(self) -> None:
+        """Test that a maximum outside the bracket falls back to fit_gpd."""
+        rng = np.random.default_rng(6)
+        data = genpareto.rvs(0.2, size=300, random_state=rng)
+        shape, scale = refit_gpd(data, (-2.0, 0.5 * data.max()))
+        expected = fit_gpd(data)
+        assert shape == pytest.approx(expected[0], abs=1e-6)
+        assert scale == pytest.approx(expected[1], rel=1e-6)
+
+    def test_expired_deadline_aborts_refit(self) -> None:
+        """Test that an expired deadline raises before the refit."""
+        with pytest.raises(DeadlineExceeded):
+            refit_gpd(np.ones(10), (0.0, 1.0), deadline=Deadline.after(0))
+
+
+class TestFitGPDMLEBatch:
+    """Tests for the fit_gpd_mle_batch function."""
+
+    @pytest.mark.parametrize("xi", [-0.4, 0.0, 0.3])
+    def test_matches_fit_gpd(self, xi: float) -> None:
+        """Test that the batched MLE equals the row-by-row MLE."""
+        rng = np.random.default_rng(2)
+        data = genpareto.rvs(xi, scale=2.0, size=(5, 200), random_state=rng)
+        shape, scale = fit_gpd_mle_batch(data)
+        for row, xi_hat, sigma_hat in zip(data, shape, scale):
+            expected = fit_gpd(row)
+            assert abs(xi_hat - expected[0]) < 1e-3
+            assert abs(sigma_hat / expected[1] - 1) < 1e-3
+
+    def test_likelihood_at_least_that_of_grid(self) -> None:
+        """Test that the golden-section steps never lower the likelihood."""
+        rng = np.random.default_rng(3)
+        data = genpareto.rvs(-0.3, size=(50, 20), random_state=rng)
+        mle = fit_gpd_mle_batch(data)
+        grid = fit_gpd_mle_batch(data, iterations=0)
+        for row, xi, sigma, xi_0, sigma_0 in zip(data, *mle, *grid):
+            assert (
+                genpareto.logpdf(row, xi, 0, sigma).sum()
+                >= genpareto.logpdf(row, xi_0, 0, sigma_0).sum() - 1e-9
+            )
+
+
+class TestComputeGPDBootstrapCI:
+    """Tests for the compute_gpd_bootstrap_ci function."""
+
+    def test_bootstrap_ci_contains_evi(self) -> None:
+        """Test that the bootstrap CI contains the point estimate."""
+        rng = np.random.default_rng(2)
+        data = rng.exponential(scale=1.0, size=300)
+        evi = fit_gpd_evi(data)
+        lower, upper = compute_gpd_bootstrap_ci(data, 0.95, evi)
+        assert lower < evi < upper
+
+    def test_bootstrap_ci_does_not_collapse_near_zero(self) -> None:
+        """Test that the CI keeps its width when the EVI is near 0."""
+        rng = np.random.default_rng(3)
+        data = rng.exponential(scale=1.0, size=300)
+        lower, upper = compute_gpd_bootstrap_ci(data, 0.95, evi=0.0)
+        assert upper - lower > 0.05
+        asym_lower, asym_upper = compute_gpd_ci(0.0, 0.95, 300)
+        assert asym_upper - asym_lower == 0.0
+
+    def test_bootstrap_ci_deterministic_across_executors(self) -> None:
+        """Test that the CI depends on the seed, not on the executor."""
+        rng = np.random.default_rng(4)
+        data = rng.exponential(scale=1.0, size=200)
+        inline = compute_gpd_bootstrap_ci(data, 0.95, n_resamples=150, seed=7)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pooled = compute_gpd_bootstrap_ci(
+                data, 0.95, n_resamples=150, seed=7, executor=executor
+            )
+        assert inline == pooled
+
+    def test_bootstrap_blocks_bounded(self) -> None:
+        """Test that large exceedance sets are resampled in small blocks."""
+        data = np.random.default_rng(6).exponential(size=400)
+        with patch("src.gpd_statistics._BATCH_ELEMENTS", 4000):
+            with patch(
+                "src.gpd_statistics.fit_gpd_batch", wraps=fit_gpd_batch
+            ) as batch:
+                shape, _ = bootstrap_gpd_fits(data, 30, seed=1)
+        assert max(call.args[0].size for call in batch.call_args_list) <= 4000
+        assert shape.shape == (30,)
+        assert np.all(np.isfinite(shape))
+
+    def test_bootstrap_ci_small_sample(self) -> None:
+        """Test the bootstrap CI with a very small sample."""
+        lower, upper = compute_gpd_bootstrap_ci(np.array([1.0]), 0.95)
+        assert lower == float("-inf")
+        assert upper == float("inf")
+
+    def test_bootstrap_ci_invalid_resamples(self) -> None:
+        """Test that fewer than 2 resamples are rejected."""
+        with pytest.raises(ValueError, match="n_resamples must be at least 2"):
+            compute_gpd_bootstrap_ci(np.ones(10), 0.95, n_resamples=1)
+
+
 class TestIsInInterval:
     """Tests for the is_in_interval function."""
 
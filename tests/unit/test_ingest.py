@@ -0,0 +1,102 @@
+"""Unit tests for the grouped multi-column log ingest."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.ingest import Predicate, load_groups
+
+_LOG = """task,core,path,cycles
+a,0,fast,10
+b,1,slow,20
+a,1,slow,30
+b,0,fast,40
+a,0,slow,50
+c,0,fast,60
+"""
+
+
+class TestPredicate:
+    """Tests for the Predicate class."""
+
+    def test_parse(self) -> None:
+        """Test that numbers become numeric and other values strings."""
+        assert Predicate.parse("core>=1") == Predicate("core", ">=", 1.0)
+        assert Predicate.parse("path!=slow") == Predicate(
+            "path", "!=", "slow"
+        )
+        with pytest.raises(ValueError, match="COLUMN OP VALUE"):
+            Predicate.parse("core")
+        with pytest.raises(ValueError, match="op"):
+            Predicate("core", "~", 1.0)
+
+    def test_evaluate(self) -> None:
+        """Test numeric and string comparisons on a column."""
+        column = np.array(["9", "10", "11"])
+        np.testing.assert_array_equal(
+            Predicate("x", "<", 10.0).evaluate(column), [True, False, False]
+        )
+        np.testing.assert_array_equal(
+            Predicate("x", "==", "10").evaluate(column), [False, True, False]
+        )
+
+
+class TestLoadGroups:
+    """Tests for the load_groups function."""
+
+    @pytest.mark.parametrize("chunk_rows", [1, 4, 1000])
+    def test_groups_in_file_order(
+        self, tmp_path: Path, chunk_rows: int
+    ) -> None:
+        """Test grouping and filtering regardless of the chunk size."""
+        path = tmp_path / "log.csv"
+        path.write_text(_LOG)
+        groups = load_groups(
+            path,
+            "cycles",
+            ["task"],
+            [Predicate.parse("path!=fast")],
+            dtype=np.uint32,
+            chunk_rows=chunk_rows,
+        )
+        assert list(groups) == [("a",), ("b",)]
+        np.testing.assert_array_equal(groups[("a",)], [30, 50])
+        np.testing.assert_array_equal(groups[("b",)], [20])
+        assert groups[("a",)].dtype == np.uint32
+
+    def test_composite_keys_and_indices(self, tmp_path: Path) -> None:
+        """Test keys of several columns given by index in a TSV log."""
+        path = tmp_path / "log.tsv"
+        path.write_text(_LOG.replace(",", "\t").split("\n", 1)[1])
+        groups = load_groups(path, 3, [0, 1], header=False)
+        assert list(groups) == [
+            ("a", "0"),
+            ("a", "1"),
+            ("b", "0"),
+            ("b", "1"),
+            ("c", "0"),
+        ]
+        np.testing.assert_array_equal(groups[("a", "0")], [10.0, 50.0])
+
+    def test_single_group(self, tmp_path: Path) -> None:
+        """Test that all rows form one group without key columns."""
+        path = tmp_path / "log.csv"
+        path.write_text(_LOG)
+        groups = load_groups(
+            path, "cycles", where=[Predicate("core", "==", 0.0)]
+        )
+        np.testing.assert_array_equal(groups[()], [10, 40, 50, 60])
+
+    def test_errors(self, tmp_path: Path) -> None:
+        """Test unknown columns, invalid values and missing files."""
+        path = tmp_path / "log.csv"
+        path.write_text(_LOG)
+        with pytest.raises(ValueError, match="no column"):
+            load_groups(path, "duration")
+        with pytest.raises(ValueError, match="Invalid data"):
+            load_groups(path, "path")
+        with pytest.raises(ValueError, match="header"):
+            load_groups(path, "cycles", header=False, key_columns=["task"])
+        with pytest.raises(FileNotFoundError):
+            load_groups(tmp_path / "missing.csv", "cycles")
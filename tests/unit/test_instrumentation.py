@@ -0,0 +1,100 @@
+"""Unit tests for the run instrumentation utilities."""
+
+import numpy as np
+
+from src.gpd_statistics import fit_gpd_evi
+from src.instrumentation import RunStats, stage
+from src.tailid import tail_id
+from src.threshold_selection import select_threshold
+
+
+class TestRunStats:
+    """Tests for the RunStats collector."""
+
+    def test_stage_accumulates_time_and_calls(self) -> None:
+        """Test that repeated stages accumulate calls and time."""
+        stats = RunStats()
+        for _ in range(3):
+            with stats.stage("work"):
+                pass
+        assert stats.stage_calls["work"] == 3
+        assert stats.stage_times["work"] >= 0.0
+
+    def test_hook_called_on_stage_end(self) -> None:
+        """Test that the hook receives the stage name and duration."""
+        calls = []
+        stats = RunStats(hook=lambda name, seconds: calls.append(name))
+        with stats.stage("outer"):
+            with stats.stage("outer.inner"):
+                pass
+        assert calls == ["outer.inner", "outer"]
+
+    def test_breakdown_lists_stages_in_entry_order(self) -> None:
+        """Test that the breakdown lists outer stages before inner ones."""
+        stats = RunStats()
+        with stats.stage("outer"):
+            with stats.stage("outer.inner"):
+                pass
+        lines = stats.format_breakdown().splitlines()
+        assert "outer" in lines[1]
+        assert "outer.inner" in lines[2]
+
+    def test_merge(self) -> None:
+        """Test that merging adds the stages and counters of a worker."""
+        stats, worker = RunStats(), RunStats()
+        with stats.stage("outer"):
+            pass
+        with worker.stage("outer"):
+            pass
+        with worker.stage("inner"):
+            pass
+        worker.record_fit(7, failed=True)
+        stats.merge(worker)
+        assert stats.stage_calls == {"outer": 2, "inner": 1}
+        assert stats.n_fits == 1
+        assert stats.optimizer_iterations == 7
+        assert stats.optimizer_failures == 1
+
+    def test_stage_disabled_is_noop(self) -> None:
+        """Test that stage() without a collector is a no-op."""
+        with stage(None, "anything"):
+            pass
+
+
+class TestInstrumentedRun:
+    """Tests for instrumentation threaded through the algorithm."""
+
+    def test_fit_gpd_evi_counts_fit(self) -> None:
+        """Test that fit_gpd_evi records a fit and its iterations."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=200)
+        stats = RunStats()
+        fit_gpd_evi(data, stats)
+        assert stats.n_fits == 1
+        assert stats.optimizer_iterations > 0
+
+    def test_fit_gpd_evi_unchanged_by_stats(self) -> None:
+        """Test that instrumentation does not change the estimate."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=200)
+        assert fit_gpd_evi(data, RunStats()) == fit_gpd_evi(data)
+
+    def test_tail_id_attaches_stats(self) -> None:
+        """Test that tail_id attaches the collector to its result."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=300)
+        stats = RunStats()
+        p_m = select_threshold(data, n_candidates=5, stats=stats)
+        result = tail_id(data, p_m=p_m, p_c1=0.95, gamma=0.95, stats=stats)
+        assert result.stats is stats
+        assert stats.stage_calls["select_threshold.eqmae"] == 5
+        assert stats.stage_calls["tail_id"] == 1
+        assert stats.n_fits > 5
+        assert stats.bytes_copied > 0
+
+    def test_tail_id_without_stats(self) -> None:
+        """Test that results carry no stats when disabled."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=100)
+        result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
+        assert result.stats is None
@@ -0,0 +1,100 @@
+"""Unit tests for the KPSS stationarity test."""
+
+import numpy as np
+import pytest
+
+from src.kpss import KPSSAccumulator, default_lags, kpss_test
+
+
+def _direct_kpss(x: np.ndarray, regression: str, lags: int) -> float:
+    """Reference KPSS statistic with directly summed autocovariances."""
+    n = len(x)
+    if regression == "c":
+        e = x - x.mean()
+    else:
+        design = np.column_stack([np.ones(n), np.arange(n)])
+        e = x - design @ np.linalg.lstsq(design, x, rcond=None)[0]
+    s = np.cumsum(e)
+    acov = [np.dot(e[k:], e[: n - k]) / n for k in range(lags + 1)]
+    lrv = acov[0] + 2 * sum(
+        (1 - k / (lags + 1)) * acov[k] for k in range(1, lags + 1)
+    )
+    return float(np.dot(s, s) / (n * n * lrv))
+
+
+class TestKPSSTest:
+    """Tests for the kpss_test function."""
+
+    @pytest.mark.parametrize("regression", ["c", "ct"])
+    def test_matches_direct_computation(self, regression: str) -> None:
+        """Test that the FFT statistic equals the direct O(n * lags) one."""
+        rng = np.random.default_rng(0)
+        x = rng.normal(loc=1000.0, scale=20.0, size=3000)
+        result = kpss_test(x, regression=regression, lags=15)
+        expected = _direct_kpss(x, regression, 15)
+        assert result.statistic == pytest.approx(expected, rel=1e-10)
+        assert result.lags == 15
+        assert result.regression == regression
+
+    def test_stationary_noise_not_rejected(self) -> None:
+        """Test that white noise is not rejected as non-stationary."""
+        rng = np.random.default_rng(1)
+        result = kpss_test(rng.normal(size=5000))
+        assert result.stationary()
+        assert result.p_value == pytest.approx(0.10)
+
+    def test_trend_rejected(self) -> None:
+        """Test that a level test rejects a linear trend."""
+        rng = np.random.default_rng(2)
+        x = rng.normal(size=5000) + np.linspace(0.0, 5.0, 5000)
+        result = kpss_test(x)
+        assert not result.stationary()
+        assert result.p_value == pytest.approx(0.01)
+        assert kpss_test(x, regression="ct").stationary()
+
+    def test_default_lags(self) -> None:
+        """Test the default lag truncation."""
+        assert default_lags(100) == 12
+        assert default_lags(5) == 4
+        assert kpss_test(np.arange(200.0) % 7).lags == default_lags(200)
+
+    def test_invalid_parameters(self) -> None:
+        """Test that invalid parameters raise ValueError."""
+        with pytest.raises(ValueError, match="regression"):
+            kpss_test(np.arange(10.0), regression="t")
+        with pytest.raises(ValueError, match="at least 3"):
+            kpss_test(np.arange(2.0))
+        with pytest.raises(ValueError, match="lags"):
+            kpss_test(np.arange(10.0), lags=10)
+
+
+class TestKPSSAccumulator:
+    """Tests for the KPSSAccumulator class."""
+
+    @pytest.mark.parametrize("chunk_size", [7, 250, 5000])
+    def test_matches_kpss_test(self, chunk_size: int) -> None:
+        """Test that chunked accumulation matches the in-memory test."""
+        rng = np.random.default_rng(3)
+        x = rng.normal(loc=1e6, scale=50.0, size=5000)
+        lags = default_lags(len(x))
+        accumulator = KPSSAccumulator(lags)
+        for start in range(0, len(x), chunk_size):
+            accumulator.update(x[start:start + chunk_size])
+
+        expected = kpss_test(x, lags=lags)
+        result = accumulator.result()
+        assert accumulator.n == len(x)
+        assert result.statistic == pytest.approx(expected.statistic, rel=1e-8)
+        assert result.p_value == expected.p_value
+
+    def test_too_few_observations(self) -> None:
+        """Test that a result needs more observations than lags."""
+        accumulator = KPSSAccumulator(lags=5)
+        accumulator.update(np.arange(5.0))
+        with pytest.raises(ValueError, match="observations"):
+            accumulator.result()
+
+    def test_negative_lags(self) -> None:
+        """Test that negative lags raise ValueError."""
+        with pytest.raises(ValueError, match="lags"):
+            KPSSAccumulator(lags=-1)
@@ -0,0 +1,44 @@
+"""Unit tests for the simulation-based MoS estimator."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.mos import estimate_mos, evi_error_quantile
+
+
+class TestEstimateMoS:
+    """Tests for the estimate_mos function."""
+
+    def test_smallest_count_reaching_precision(self) -> None:
+        """Test that the estimate is the first count meeting the target."""
+        mos = estimate_mos(0.0, n_simulations=500)
+        assert 40 <= mos <= 70
+        assert evi_error_quantile(0.0, mos, 0.9, 500, 500) <= 0.25
+        assert evi_error_quantile(0.0, mos - 1, 0.9, 500, 500) > 0.25
+
+    def test_tighter_precision_needs_more_samples(self) -> None:
+        """Test that the MoS grows as the precision target shrinks."""
+        loose = estimate_mos(-0.2, precision=0.3, n_simulations=500)
+        tight = estimate_mos(-0.2, precision=0.15, n_simulations=500)
+        assert tight > loose
+
+    def test_bounds(self) -> None:
+        """Test that the estimate is clamped to the considered counts."""
+        assert estimate_mos(0.0, precision=10.0, min_size=15) == 15
+        assert estimate_mos(0.0, precision=1e-3, max_size=50) == 50
+
+    def test_executor_does_not_change_estimate(self) -> None:
+        """Test that spreading the simulations gives the inline estimate."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pooled = estimate_mos(0.1, executor=executor)
+        assert pooled == estimate_mos(0.1)
+
+    def test_invalid_parameters(self) -> None:
+        """Test that invalid parameters raise ValueError."""
+        with pytest.raises(ValueError, match="precision"):
+            estimate_mos(0.0, precision=0)
+        with pytest.raises(ValueError, match="confidence"):
+            estimate_mos(0.0, confidence=1.0)
+        with pytest.raises(ValueError, match="min_size"):
+            estimate_mos(0.0, min_size=100, max_size=50)
@@ -0,0 +1,119 @@
+"""Unit tests for the end-to-end TailID pipeline."""
+
+import numpy as np
+import pytest
+
+from src.instrumentation import Deadline
+from src.pipeline import (
+    AnalysisResult,
+    detect_components,
+    run_analysis,
+    selection_share,
+)
+from src.tailid import TailIDScenario, tail_id
+from src.threshold_selection import select_threshold
+
+
+class TestRunAnalysis:
+    """Tests for the run_analysis function."""
+
+    def test_run_analysis_matches_stages(self) -> None:
+        """Test that run_analysis chains threshold selection and TailID."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=300)
+        analysis = run_analysis(data, p_c1=0.95, n_candidates=5, gamma=0.95)
+        p_m = select_threshold(data, n_candidates=5)
+        result = tail_id(data, p_m=p_m, p_c1=0.95, gamma=0.95)
+        assert isinstance(analysis, AnalysisResult)
+        assert analysis.p_m == p_m
+        np.testing.assert_array_equal(
+            analysis.result.sensitive_points, result.sensitive_points
+        )
+
+    def test_run_analysis_partial(self) -> None:
+        """Test that an exhausted time budget gives a partial analysis."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=300)
+        analysis = run_analysis(
+            data,
+            p_c1=0.95,
+            n_candidates=5,
+            gamma=0.95,
+            deadline=Deadline.after(0),
+        )
+        assert analysis.partial
+        assert analysis.result.partial
+        assert analysis.result.scenario == TailIDScenario.UNDETERMINED
+
+    def test_selection_share(self) -> None:
+        """Test that the budget split follows the number of fits."""
+        assert selection_share(10_000_000, 31, 0.99) == 0.25
+        assert selection_share(100, 31, 0.99) == 0.75
+        assert selection_share(1000, 11, 0.99) == pytest.approx(0.5)
+
+
+def _two_component_data() -> np.ndarray:
+    """Return a trace with two tail components above the bulk."""
+    rng = np.random.default_rng(0)
+    data = np.concatenate(
+        [
+            rng.normal(100.0, 5.0, 2000),
+            rng.normal(150.0, 3.0, 150),
+            rng.normal(200.0, 3.0, 100),
+        ]
+    )
+    rng.shuffle(data)
+    return data
+
+
+class TestDetectComponents:
+    """Tests for the detect_components function."""
+
+    def test_levels_match_independent_runs(self) -> None:
+        """Test that each level is the analysis of the truncated data."""
+        data = _two_component_data()
+        analysis = detect_components(data, p_c1=0.95, n_candidates=5)
+        assert len(analysis.thresholds) >= 2
+        assert analysis.thresholds == sorted(analysis.thresholds)[::-1]
+        assert not analysis.partial
+        last = analysis.levels[-1].result.scenario
+        assert last != TailIDScenario.SCENARIO_2
+
+        truncated = data
+        for level, size in zip(analysis.levels, analysis.sizes):
+            assert len(truncated) == size
+            expected = run_analysis(truncated, p_c1=0.95, n_candidates=5)
+            assert level.p_m == expected.p_m
+            assert level.result.scenario == expected.result.scenario
+            np.testing.assert_array_equal(
+                level.result.sensitive_points,
+                np.sort(expected.result.sensitive_points),
+            )
+            if level.result.tail_threshold is not None:
+                truncated = truncated[
+                    truncated < level.result.tail_threshold
+                ]
+
+    def test_max_levels(self) -> None:
+        """Test that the recursion stops after max_levels levels."""
+        data = _two_component_data()
+        analysis = detect_components(
+            data, p_c1=0.95, n_candidates=5, max_levels=1
+        )
+        assert len(analysis.levels) == 1
+        assert analysis.sizes == [len(data)]
+        with pytest.raises(ValueError, match="max_levels"):
+            detect_components(data, 0.95, 5, max_levels=0)
+
+    def test_deadline_ends_recursion(self) -> None:
+        """Test that a partial level is the last one."""
+        analysis = detect_components(
+            _two_component_data(), 0.95, 5, deadline=Deadline.after(0)
+        )
+        assert len(analysis.levels) == 1
+        assert analysis.partial
+        assert analysis.thresholds == []
+        assert (
+            analysis.levels[-1].result.scenario
+            == TailIDScenario.UNDETERMINED
+        )
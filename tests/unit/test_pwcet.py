@@ -0,0 +1,126 @@
+"""Unit tests for pWCET estimation."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy.stats import genpareto
+
+from src.gpd_statistics import GPDFit
+from src.pwcet import (
+    DEFAULT_EXCEEDANCE_PROBABILITIES,
+    estimate_pwcet,
+    gpd_quantiles,
+    pwcet_curves,
+)
+from src.tailid import TailIDResult, TailIDScenario, tail_id
+
+
+def _scenario_1_data() -> np.ndarray:
+    """Return a normal trace on which TailID reports Scenario 1."""
+    np.random.seed(0)
+    return np.random.normal(loc=100.0, scale=5.0, size=2000)
+
+
+class TestGPDQuantiles:
+    """Tests for the gpd_quantiles and pwcet_curves functions."""
+
+    @pytest.mark.parametrize("shape", [-0.2, 0.0, 1e-14, 0.3])
+    def test_matches_scipy(self, shape: float) -> None:
+        """Test the quantiles against scipy's genpareto.isf."""
+        p = np.array([1e-3, 1e-6, 1e-9])
+        result = gpd_quantiles(10.0, shape, 2.0, 0.1, p)
+        expected = 10.0 + genpareto.isf(p / 0.1, shape, scale=2.0)
+        np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+    def test_outside_tail_is_nan(self) -> None:
+        """Test that probabilities not below the rate give NaN."""
+        result = gpd_quantiles(10.0, 0.1, 2.0, 0.1, np.array([0.5, 0.1]))
+        assert np.all(np.isnan(result))
+
+    def test_many_tasks(self) -> None:
+        """Test that curves of many tasks match the per-task curves."""
+        fits = [
+            GPDFit(10.0, -0.1, 2.0, 100, 1000),
+            GPDFit(50.0, 0.2, 5.0, 50, 1000),
+        ]
+        curves = pwcet_curves(fits)
+        assert curves.shape == (2, len(DEFAULT_EXCEEDANCE_PROBABILITIES))
+        for fit, curve in zip(fits, curves):
+            np.testing.assert_allclose(
+                curve,
+                fit.threshold
+                + genpareto.isf(
+                    DEFAULT_EXCEEDANCE_PROBABILITIES / fit.exceedance_rate,
+                    fit.shape,
+                    scale=fit.scale,
+                ),
+            )
+            assert np.all(np.diff(curve) > 0)
+
+
+class TestEstimatePWCET:
+    """Tests for the estimate_pwcet function."""
+
+    def test_scenario_1_reuses_fit(self) -> None:
+        """Test that Scenario 1 uses the fit produced by tail_id."""
+        data = _scenario_1_data()
+        result = tail_id(data, p_m=0.8, p_c1=0.99, gamma=0.9999)
+        assert result.scenario == TailIDScenario.SCENARIO_1
+        curve = estimate_pwcet(result)
+        assert curve.fit is result.fit
+        np.testing.assert_array_equal(
+            curve.pwcet, pwcet_curves([result.fit])[0]
+        )
+
+    def test_bootstrap_bands(self, tmp_path: Path) -> None:
+        """Test that the bands enclose the curve and are saved."""
+        data = _scenario_1_data()
+        result = tail_id(data, p_m=0.8, p_c1=0.99, gamma=0.9999)
+        curve = estimate_pwcet(
+            result, data, confidence_level=0.9, n_resamples=100
+        )
+        assert curve.lower is not None and curve.upper is not None
+        assert np.all(curve.lower <= curve.pwcet)
+        assert np.all(curve.pwcet <= curve.upper)
+
+        path = tmp_path / "pwcet.npz"
+        curve.save(path)
+        saved = np.load(path)
+        np.testing.assert_array_equal(saved["pwcet"], curve.pwcet)
+        np.testing.assert_array_equal(saved["upper"], curve.upper)
+
+    def test_scenario_2_fits_over_tail_threshold(self) -> None:
+        """Test that Scenario 2 fits the exceedances of the threshold."""
+        np.random.seed(0)
+        data = np.random.exponential(scale=1.0, size=2000)
+        result = TailIDResult(
+            sensitive_points=[4.0],
+            scenario=TailIDScenario.SCENARIO_2,
+            message="",
+            tail_threshold=4.0,
+        )
+        curve = estimate_pwcet(result, data)
+        assert curve.fit.threshold == 4.0
+        assert curve.fit.n_exceedances == int(np.sum(data > 4.0))
+        with pytest.raises(ValueError, match="requires the data"):
+            estimate_pwcet(result)
+
+    def test_scenario_3_rejected(self) -> None:
+        """Test that Scenario 3 raises ValueError."""
+        result = TailIDResult([1.0], TailIDScenario.SCENARIO_3, "")
+        with pytest.raises(ValueError, match="Scenario 3"):
+            estimate_pwcet(result)
+
+    def test_undetermined_raises(self) -> None:
+        """Test that a partial result raises ValueError."""
+        result = TailIDResult([], TailIDScenario.UNDETERMINED, partial=True)
+        with pytest.raises(ValueError, match="complete"):
+            estimate_pwcet(result)
+
+    def test_bands_require_data(self) -> None:
+        """Test that confidence bands need the data."""
+        data = _scenario_1_data()
+        result = tail_id(data, p_m=0.8, p_c1=0.99, gamma=0.9999)
+        with pytest.raises(ValueError, match="require the data"):
+            estimate_pwcet(result, confidence_level=0.9)
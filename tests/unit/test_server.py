@@ -0,0 +1,168 @@
+"""Unit tests for the TailID analysis daemon and its client."""
+
+import asyncio
+import base64
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import numpy as np
+import pytest
+
+from src.client import request, server_available
+from src.pipeline import run_analysis
+from src.server import TailIDServer, result_from_dict, result_to_dict
+from src.tailid import TailIDScenario
+
+
+@pytest.fixture
+def server() -> Iterator[Tuple[TailIDServer, Path]]:
+    """Run a daemon on a temporary socket in a background thread."""
+    # Unix socket paths are limited to ~100 bytes, so avoid tmp_path.
+    directory = Path(tempfile.mkdtemp(prefix="tailid"))
+    socket_path = directory / "d.sock"
+    instance = TailIDServer(socket_path, workers=2, queue_size=4)
+
+    async def serve() -> None:
+        try:
+            await instance.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(serve())
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(task,), daemon=True
+    )
+    thread.start()
+    for _ in range(200):
+        if server_available(socket_path):
+            break
+        time.sleep(0.01)
+    yield instance, socket_path
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(timeout=5)
+    loop.close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class TestTailIDServer:
+    """Tests for the TailIDServer class."""
+
+    def test_ping(self, server: Tuple[TailIDServer, Path]) -> None:
+        """Test that a running daemon is detected."""
+        _, socket_path = server
+        assert server_available(socket_path)
+        assert request({"op": "ping"}, socket_path) == {"ok": True}
+
+    def test_inline_data_matches_run_analysis(
+        self, server: Tuple[TailIDServer, Path]
+    ) -> None:
+        """Test that inline data gives the same result as run_analysis."""
+        _, socket_path = server
+        np.random.seed(0)
+        data = np.random.exponential(scale=1.0, size=300)
+        response = request(
+            {"data": data.tolist(), "p_c1": 0.95, "n_candidates": 5},
+            socket_path,
+        )
+        expected = run_analysis(data, p_c1=0.95, n_candidates=5)
+        assert response["ok"]
+        assert response["n_samples"] == 300
+        assert response["p_m"] == expected.p_m
+        assert response["sensitive_points"] == (
+            expected.result.sensitive_points.tolist()
+        )
+        assert response["scenario"] == expected.result.scenario.name
+
+    def test_base64_data(self, server: Tuple[TailIDServer, Path]) -> None:
+        """Test that base64-encoded raw arrays are decoded."""
+        _, socket_path = server
+        np.random.seed(1)
+        data = np.random.exponential(scale=1.0, size=200).astype(np.float32)
+        response = request(
+            {
+                "data_b64": base64.b64encode(data.tobytes()).decode(),
+                "dtype": "float32",
+                "p_c1": 0.95,
+                "n_candidates": 5,
+            },
+            socket_path,
+        )
+        assert response["ok"]
+        assert response["n_samples"] == 200
+
+    def test_file_results_are_cached(
+        self, server: Tuple[TailIDServer, Path], tmp_path: Path
+    ) -> None:
+        """Test that repeated requests for a file hit the caches."""
+        instance, socket_path = server
+        np.random.seed(2)
+        data_file = tmp_path / "data.txt"
+        np.savetxt(data_file, np.random.exponential(scale=1.0, size=200))
+        payload = {"path": str(data_file), "p_c1": 0.95, "n_candidates": 5}
+
+        first = request(payload, socket_path)
+        second = request(payload, socket_path)
+        assert first == second
+        assert instance.result_cache.hits == 1
+
+    def test_errors_are_reported(
+        self, server: Tuple[TailIDServer, Path]
+    ) -> None:
+        """Test that invalid requests get an error response."""
+        _, socket_path = server
+        missing = request({"data": [1.0, 2.0]}, socket_path)
+        assert not missing["ok"]
+        assert "p_c1" in missing["error"]
+
+        invalid = request(
+            {"data": [1.0, 2.0, 3.0], "p_c1": 2.0, "n_candidates": 5},
+            socket_path,
+        )
+        assert not invalid["ok"]
+
+    def test_duplicate_daemon_is_rejected(
+        self, server: Tuple[TailIDServer, Path]
+    ) -> None:
+        """Test that a second daemon on the same socket fails to start."""
+        _, socket_path = server
+        with pytest.raises(RuntimeError, match="already running"):
+            asyncio.run(TailIDServer(socket_path).serve_forever())
+
+    def test_invalid_parameters(self) -> None:
+        """Test that invalid pool sizes raise ValueError."""
+        with pytest.raises(ValueError, match="workers"):
+            TailIDServer("unused.sock", workers=0)
+        with pytest.raises(ValueError, match="queue_size"):
+            TailIDServer("unused.sock", queue_size=0)
+
+
+class TestResultConversion:
+    """Tests for the result_to_dict and result_from_dict functions."""
+
+    def test_round_trip(self) -> None:
+        """Test that a result survives conversion to a response."""
+        np.random.seed(3)
+        data = np.random.exponential(scale=1.0, size=300)
+        analysis = run_analysis(data, p_c1=0.95, n_candidates=5)
+        p_m, result = result_from_dict(
+            result_to_dict(analysis.p_m, analysis.result, len(data))
+        )
+        assert p_m == analysis.p_m
+        np.testing.assert_array_equal(
+            result.sensitive_points, analysis.result.sensitive_points
+        )
+        assert isinstance(result.scenario, TailIDScenario)
+        assert result.message == analysis.result.message
+
+
+class TestServerAvailable:
+    """Tests for the server_available function."""
+
+    def test_missing_socket(self, tmp_path: Path) -> None:
+        """Test that a missing socket is reported as unavailable."""
+        assert not server_available(tmp_path / "none.sock")
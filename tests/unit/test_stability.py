@@ -0,0 +1,144 @@
+"""Unit tests for the resampling stability report."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.pipeline import run_analysis
+from src.stability import stability_report
+from src.tailid import TailIDScenario
+
+
+def _mixture_data() -> np.ndarray:
+    """Return a time-ordered trace with a small second tail component."""
+    rng = np.random.default_rng(0)
+    data = np.concatenate(
+        [rng.normal(100.0, 5.0, 570), rng.normal(130.0, 3.0, 30)]
+    )
+    rng.shuffle(data)
+    return data
+
+
+class TestStabilityReport:
+    """Tests for the stability_report function."""
+
+    def test_subsample_report(self, tmp_path: Path) -> None:
+        """Test the per-resample outcomes and their summary."""
+        report = stability_report(
+            _mixture_data(), p_c1=0.95, n_candidates=5, n_resamples=6
+        )
+        assert report.n_resamples == 6
+        assert report.resample_size == 300
+        assert set(report.scenario.tolist()) <= {1, 2, 3}
+        assert sum(report.scenario_frequencies.values()) == pytest.approx(1)
+        scenario_2 = report.scenario == TailIDScenario.SCENARIO_2.value
+        assert np.all(np.isnan(report.tail_threshold[~scenario_2]))
+        assert np.all(report.n_sensitive[report.scenario == 1] == 0)
+        assert "Scenario frequencies" in report.format()
+
+        report.save(tmp_path / "stability.npz")
+        with np.load(tmp_path / "stability.npz") as saved:
+            np.testing.assert_array_equal(saved["scenario"], report.scenario)
+
+    def test_matches_single_analysis(self) -> None:
+        """Test that a full-size exact subsample reproduces the analysis."""
+        data = _mixture_data()
+        report = stability_report(
+            data,
+            p_c1=0.95,
+            n_candidates=5,
+            n_resamples=1,
+            fraction=1.0,
+            max_exceedances=None,
+            warm_start=False,
+        )
+        analysis = run_analysis(data, p_c1=0.95, n_candidates=5)
+        assert report.p_m[0] == analysis.p_m
+        assert report.n_sensitive[0] == len(analysis.result.sensitive_points)
+        assert report.scenario[0] == analysis.result.scenario.value
+
+    def test_workers_do_not_change_report(self) -> None:
+        """Test that the shared-memory pool gives the inline report."""
+        data = _mixture_data()
+        for method in ("subsample", "block"):
+            inline = stability_report(
+                data, 0.95, 5, n_resamples=10, method=method
+            )
+            pooled = stability_report(
+                data, 0.95, 5, n_resamples=10, method=method, workers=2
+            )
+            np.testing.assert_array_equal(pooled.p_m, inline.p_m)
+            np.testing.assert_array_equal(
+                pooled.n_sensitive, inline.n_sensitive
+            )
+
+    def test_concurrent_reports(self) -> None:
+        """Test that concurrent reports each resample their own trace."""
+        first = _mixture_data()
+        second = np.random.default_rng(1).normal(50.0, 2.0, 400)
+        calls = [
+            (first, "subsample", 1),
+            (second, "block", 1),
+            (first, "block", 2),
+            (second, "subsample", 2),
+        ]
+
+        def run(call: tuple) -> object:
+            data, method, workers = call
+            return stability_report(
+                data,
+                0.95,
+                5,
+                n_resamples=6,
+                method=method,
+                workers=workers,
+                backend="process",
+            )
+
+        serial = [run(call) for call in calls]
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            concurrent = list(executor.map(run, calls))
+        for got, expected in zip(concurrent, serial):
+            np.testing.assert_array_equal(got.p_m, expected.p_m)
+            np.testing.assert_array_equal(
+                got.n_sensitive, expected.n_sensitive
+            )
+            np.testing.assert_array_equal(got.scenario, expected.scenario)
+
+    def test_thread_backend(self) -> None:
+        """Test that worker threads give the inline report."""
+        data = _mixture_data()
+        inline = stability_report(data, 0.95, 5, n_resamples=6)
+        threaded = stability_report(
+            data, 0.95, 5, n_resamples=6, workers=2, backend="thread"
+        )
+        np.testing.assert_array_equal(threaded.p_m, inline.p_m)
+        np.testing.assert_array_equal(threaded.scenario, inline.scenario)
+
+    def test_block_size_rounding(self) -> None:
+        """Test that block resamples hold whole blocks."""
+        report = stability_report(
+            _mixture_data(),
+            0.95,
+            5,
+            n_resamples=2,
+            method="block",
+            block_size=7,
+        )
+        assert report.resample_size == 294
+
+    def test_invalid_parameters(self) -> None:
+        """Test that invalid parameters raise ValueError."""
+        data = _mixture_data()
+        with pytest.raises(ValueError, match="p_c1"):
+            stability_report(data, 0.9, 5)
+        with pytest.raises(ValueError, match="method"):
+            stability_report(data, 0.95, 5, method="jackknife")
+        with pytest.raises(ValueError, match="fraction"):
+            stability_report(data, 0.95, 5, fraction=0)
+        with pytest.raises(ValueError, match="block_size"):
+            stability_report(data, 0.95, 5, method="block", block_size=0)
+        with pytest.raises(ValueError, match="backend"):
+            stability_report(data, 0.95, 5, backend="gpu")
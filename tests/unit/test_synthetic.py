@@ -0,0 +1,120 @@
+"""Unit tests for the synthetic mixture generator."""
+
+import numpy as np
+import pytest
+
+from src.synthetic import (
+    GPDComponent,
+    MixtureSpec,
+    generate_mixture,
+    iter_mixture_chunks,
+    write_mixture,
+)
+
+
+def _spec(**kwargs) -> MixtureSpec:
+    """Build a mixture spec with one tail component."""
+    params = {
+        "bulk": "exponential",
+        "bulk_params": {"scale": 1.0},
+        "components": (GPDComponent(loc=20.0, scale=5.0, weight=0.05),),
+    }
+    params.update(kwargs)
+    return MixtureSpec(**params)
+
+
+class TestMixtureSpec:
+    """Tests for the MixtureSpec validation."""
+
+    def test_bulk_weight(self) -> None:
+        """Test that the bulk receives the remaining weight."""
+        spec = _spec()
+        assert spec.bulk_weight == pytest.approx(0.95)
+        np.testing.assert_allclose(spec.weights, [0.95, 0.05])
+
+    def test_invalid_bulk(self) -> None:
+        """Test that an unknown bulk family is rejected."""
+        with pytest.raises(ValueError, match="bulk must be one of"):
+            _spec(bulk="cauchy")
+
+    def test_invalid_weights(self) -> None:
+        """Test that component weights summing to 1 are rejected."""
+        components = (
+            GPDComponent(loc=1.0, scale=1.0, weight=0.6),
+            GPDComponent(loc=2.0, scale=1.0, weight=0.4),
+        )
+        with pytest.raises(ValueError, match="sum to less than 1"):
+            _spec(components=components)
+
+    def test_invalid_scale(self) -> None:
+        """Test that a non-positive component scale is rejected."""
+        with pytest.raises(ValueError, match="scale must be positive"):
+            _spec(components=(GPDComponent(loc=1.0, scale=0.0),))
+
+
+class TestGenerateMixture:
+    """Tests for the chunked mixture generation."""
+
+    def test_deterministic(self) -> None:
+        """Test that the same seed produces identical samples."""
+        first = generate_mixture(_spec(), 10_000, seed=3, chunk_size=1000)
+        second = generate_mixture(_spec(), 10_000, seed=3, chunk_size=1000)
+        np.testing.assert_array_equal(first, second)
+
+    def test_different_seeds(self) -> None:
+        """Test that different seeds produce different samples."""
+        first = generate_mixture(_spec(), 1000, seed=1)
+        second = generate_mixture(_spec(), 1000, seed=2)
+        assert not np.array_equal(first, second)
+
+    def test_chunks_match_generate(self) -> None:
+        """Test that the chunk iterator matches the in-memory result."""
+        chunks = list(iter_mixture_chunks(_spec(), 2500, chunk_size=1000))
+        assert [len(c) for c in chunks] == [1000, 1000, 500]
+        np.testing.assert_array_equal(
+            np.concatenate(chunks),
+            generate_mixture(_spec(), 2500, chunk_size=1000),
+        )
+
+    def test_tail_component_proportion(self) -> None:
+        """Test that the tail component has its mixture weight."""
+        data = generate_mixture(_spec(), 100_000, seed=0)
+        assert np.mean(data >= 20.0) == pytest.approx(0.05, abs=0.005)
+
+    def test_integer_quantization(self) -> None:
+        """Test that integer dtypes round and keep the dtype."""
+        spec = _spec(
+            bulk="normal",
+            bulk_params={"loc": 1000.0, "scale": 10.0},
+            components=(GPDComponent(loc=1100.0, scale=5.0, weight=0.01),),
+            dtype="uint32",
+        )
+        data = generate_mixture(spec, 5000)
+        assert data.dtype == np.uint32
+        assert data.min() > 900
+
+
+class TestWriteMixture:
+    """Tests for streaming mixture samples to files."""
+
+    def test_write_npy(self, tmp_path) -> None:
+        """Test that .npy output matches the in-memory samples."""
+        path = write_mixture(
+            tmp_path / "trace.npy", _spec(), 3000, seed=5, chunk_size=1024
+        )
+        expected = generate_mixture(_spec(), 3000, seed=5, chunk_size=1024)
+        np.testing.assert_array_equal(np.load(path), expected)
+
+    def test_write_raw(self, tmp_path) -> None:
+        """Test that raw output matches the in-memory samples."""
+        spec = _spec(dtype="float32")
+        path = write_mixture(tmp_path / "trace.bin", spec, 3000, seed=5)
+        expected = generate_mixture(spec, 3000, seed=5)
+        np.testing.assert_array_equal(
+            np.fromfile(path, dtype=np.float32), expected
+        )
+
+    def test_invalid_format(self, tmp_path) -> None:
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError, match="fmt must be"):
+            write_mixture(tmp_path / "trace.csv", _spec(), 10, fmt="csv")
@@ -1,12 +1,19 @@
 """Unit tests for the main TailID algorithm."""
 
+import time
+
 import numpy as np
 import pytest
 
+from src.data_processing import select_candidates
+from src.instrumentation import Deadline
+from src.kpss import KPSSResult
+from src.mos import estimate_mos
 from src.tailid import (
     MOS_DEFAULT,
     TailIDResult,
     TailIDScenario,
+    combine_with_kpss,
     tail_id,
 )
 
@@ -21,12 +28,20 @@ class TestTailID:
         result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
         assert isinstance(result, TailIDResult)
 
-    def test_tail_id_result_has_sensitive_points_list(self) -> None:
-        """Test that TailIDResult contains a list of sensitive points."""
+    def test_tail_id_results_compare_by_value(self) -> None:
+        """Test that equal runs give equal results."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=300)
+        result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
+        assert result == tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
+        assert result != tail_id(data, p_m=0.7, p_c1=0.95, gamma=0.95)
+
+    def test_tail_id_result_has_sensitive_points_array(self) -> None:
+        """Test that TailIDResult contains an array of sensitive points."""
         np.random.seed(42)
         data = np.random.exponential(scale=1.0, size=100)
         result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
-        assert isinstance(result.sensitive_points, list)
+        assert isinstance(result.sensitive_points, np.ndarray)
 
     def test_tail_id_result_has_scenario(self) -> None:
         """Test that TailIDResult contains a scenario classification."""
@@ -73,12 +88,32 @@ class TestTailID:
         with pytest.raises(ValueError, match="p_m must be less than p_c1"):
             tail_id(data, p_m=0.95, p_c1=0.9, gamma=0.95)
 
+    def test_tail_id_invalid_ci_method(self) -> None:
+        """Test that tail_id raises error for an unknown CI method."""
+        data = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        with pytest.raises(ValueError, match="ci_method must be one of"):
+            tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95, ci_method="exact")
+
+    def test_tail_id_bootstrap_ci(self) -> None:
+        """Test tail_id with bootstrap confidence intervals."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=200)
+        result = tail_id(
+            data,
+            p_m=0.7,
+            p_c1=0.95,
+            gamma=0.95,
+            ci_method="bootstrap",
+            n_resamples=50,
+        )
+        assert isinstance(result, TailIDResult)
+
     def test_tail_id_homogeneous_data(self) -> None:
         """Test tail_id with homogeneous exponential data (no mixture)."""
         np.random.seed(42)
         data = np.random.exponential(scale=1.0, size=500)
         result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
-        assert isinstance(result.sensitive_points, list)
+        assert isinstance(result.sensitive_points, np.ndarray)
 
     def test_tail_id_mixture_data(self) -> None:
         """Test tail_id with mixture data (should detect sensitive points)."""
@@ -87,7 +122,7 @@ class TestTailID:
         tail_component = np.random.exponential(scale=10.0, size=100) + 10
         data = np.concatenate([main_component, tail_component])
         result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
-        assert isinstance(result.sensitive_points, list)
+        assert isinstance(result.sensitive_points, np.ndarray)
 
     def test_tail_id_sensitive_points_are_floats(self) -> None:
         """Test that all sensitive points are floats."""
@@ -107,6 +142,144 @@ class TestTailID:
         for point in result.sensitive_points:
             assert point in data
 
+    def test_tail_id_keeps_last_accepted_fit(self) -> None:
+        """Test that the result carries the last accepted GPD fit."""
+        np.random.seed(0)
+        data = np.random.normal(loc=100.0, scale=5.0, size=2000)
+        result = tail_id(data, p_m=0.8, p_c1=0.99, gamma=0.9999)
+        assert result.scenario == TailIDScenario.SCENARIO_1
+        assert result.fit is not None
+        assert result.fit.n_samples == len(data)
+        assert result.fit.n_exceedances == int(
+            np.sum(data > result.fit.threshold)
+        )
+
+    def test_tail_id_warm_start(self) -> None:
+        """Test that warm-started loop fits give the cold-start result."""
+        rng = np.random.default_rng(3)
+        data = np.concatenate(
+            [rng.exponential(1.0, 5000), rng.exponential(3.0, 200) + 4]
+        )
+        cold = tail_id(data, p_m=0.8, p_c1=0.97, gamma=0.9999)
+        warm = tail_id(
+            data, p_m=0.8, p_c1=0.97, gamma=0.9999, warm_start=True
+        )
+        np.testing.assert_array_equal(
+            warm.sensitive_points, cold.sensitive_points
+        )
+        assert warm.scenario == cold.scenario
+        assert warm.fit is not None and cold.fit is not None
+        assert warm.fit.shape == pytest.approx(cold.fit.shape, abs=1e-3)
+
+    def test_tail_id_progress_callback(self) -> None:
+        """Test that progress increases and ends at the candidate count."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=1000)
+        calls = []
+        tail_id(
+            data,
+            p_m=0.8,
+            p_c1=0.95,
+            gamma=0.95,
+            progress=lambda done, total: calls.append((done, total)),
+        )
+        total = len(select_candidates(data, 0.95))
+        done = [d for d, _ in calls]
+        assert done == sorted(set(done))
+        assert all(t == total for _, t in calls)
+        assert calls[-1] == (total, total)
+
+    def test_tail_id_keeps_compact_dtype(self) -> None:
+        """Test that integer and float32 data give points in their dtype."""
+        np.random.seed(42)
+        main_component = np.random.exponential(scale=1000.0, size=900)
+        tail_component = np.random.exponential(scale=10000.0, size=100)
+        data = np.concatenate([main_component, tail_component + 10000])
+        expected = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
+        for dtype in (np.uint32, np.float32):
+            result = tail_id(
+                data.astype(dtype), p_m=0.7, p_c1=0.9, gamma=0.95
+            )
+            assert result.sensitive_points.dtype == dtype
+            assert result.scenario == expected.scenario
+
+
+class TestTailIDDeadline:
+    """Tests for deadline-bounded TailID runs."""
+
+    def test_expired_deadline(self) -> None:
+        """Test that an expired deadline gives an empty partial result."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=1000)
+        result = tail_id(
+            data, p_m=0.8, p_c1=0.95, gamma=0.95, deadline=Deadline.after(0)
+        )
+        assert result.partial
+        assert result.candidates_processed == 0
+        assert result.candidates_total == len(select_candidates(data, 0.95))
+        assert len(result.sensitive_points) == 0
+        assert result.fit is None
+        assert result.scenario == TailIDScenario.UNDETERMINED
+        assert result.tail_threshold is None
+        assert result.message.startswith("Partial result")
+        assert "Undetermined" in result.message
+
+    def test_partial_mixture_is_not_scenario_1(self) -> None:
+        """Test that a stopped run on a mixture gives no Scenario 1 pass."""
+        np.random.seed(42)
+        main_component = np.random.exponential(scale=1.0, size=900)
+        tail_component = np.random.exponential(scale=10.0, size=100)
+        data = np.concatenate([main_component, tail_component + 10])
+        assert (
+            tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95).scenario
+            != TailIDScenario.SCENARIO_1
+        )
+        result = tail_id(
+            data, p_m=0.7, p_c1=0.9, gamma=0.95, deadline=Deadline.after(0)
+        )
+        assert result.partial
+        assert result.scenario == TailIDScenario.UNDETERMINED
+
+    def test_stops_between_candidates(self) -> None:
+        """Test that the result covers the candidates processed in time."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=1000)
+
+        def slow_progress(done: int, total: int) -> None:
+            if done == 3:
+                time.sleep(0.6)
+
+        result = tail_id(
+            data,
+            p_m=0.8,
+            p_c1=0.95,
+            gamma=0.95,
+            progress=slow_progress,
+            deadline=Deadline.after(0.5),
+        )
+        assert result.partial
+        assert result.candidates_processed == 3
+        assert result.scenario == TailIDScenario.UNDETERMINED
+        assert result.fit is not None
+
+    def test_ample_deadline(self) -> None:
+        """Test that a deadline that does not pass changes nothing."""
+        np.random.seed(42)
+        main_component = np.random.exponential(scale=1.0, size=900)
+        tail_component = np.random.exponential(scale=10.0, size=100)
+        data = np.concatenate([main_component, tail_component + 10])
+        expected = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95)
+        result = tail_id(
+            data, p_m=0.7, p_c1=0.9, gamma=0.95, deadline=Deadline.after(600)
+        )
+        assert not result.partial
+        assert result.scenario == expected.scenario
+        assert result.candidates_total == len(select_candidates(data, 0.9))
+        np.testing.assert_array_equal(
+            result.sensitive_points, expected.sensitive_points
+        )
+        assert result.message == expected.message
+
 
 class TestTailIDScenarios:
     """Tests for the TailID scenario classification."""
@@ -177,3 +350,62 @@ class TestTailIDScenarios:
                 assert result_default.scenario == TailIDScenario.SCENARIO_2
             if len(result_high_mos.sensitive_points) <= 1000:
                 assert result_high_mos.scenario == TailIDScenario.SCENARIO_3
+
+    def test_estimated_mos(self) -> None:
+        """Test that mos="auto" classifies with the estimate of the fit."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=1000)
+        result = tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95, mos="auto")
+        assert result.fit is not None
+        assert result.mos == estimate_mos(result.fit.shape)
+        with pytest.raises(ValueError, match="mos"):
+            tail_id(data, p_m=0.7, p_c1=0.9, gamma=0.95, mos="high")
+
+    def test_message_built_lazily(self) -> None:
+        """Test that the message is built on access and can be replaced."""
+        result = TailIDResult(
+            np.array([5.0, 6.0]), TailIDScenario.SCENARIO_2, mos=1
+        )
+        assert "|S| = 2 > MoS = 1" in result.message
+        result.message = "replaced"
+        assert result.message == "replaced"
+        assert not hasattr(result, "__dict__")
+
+
+class TestCombineWithKPSS:
+    """Tests for the combine_with_kpss function."""
+
+    def _kpss(self, p_value: float) -> KPSSResult:
+        """Return a level KPSS result with the given p-value."""
+        return KPSSResult(
+            statistic=0.1, p_value=p_value, lags=10, regression="c"
+        )
+
+    def test_scenario_1_and_stationary(self) -> None:
+        """Test that Scenario 1 with stationarity supports ID."""
+        result = TailIDResult([], TailIDScenario.SCENARIO_1, "Scenario 1.")
+        combined = combine_with_kpss(result, self._kpss(0.1))
+        assert combined.id_supported is True
+        assert combined.kpss is not None
+        assert "supported by both TailID and KPSS" in combined.message
+
+    def test_scenario_1_and_not_stationary(self) -> None:
+        """Test that a KPSS rejection overrides Scenario 1."""
+        result = TailIDResult([], TailIDScenario.SCENARIO_1, "Scenario 1.")
+        combined = combine_with_kpss(result, self._kpss(0.01))
+        assert combined.id_supported is False
+        assert "not supported" in combined.message
+
+    def test_other_scenarios(self) -> None:
+        """Test that Scenarios 2 and 3 never support ID."""
+        result = TailIDResult([1.0], TailIDScenario.SCENARIO_3, "Scenario 3.")
+        combined = combine_with_kpss(result, self._kpss(0.1))
+        assert combined.id_supported is False
+
+    def test_without_kpss(self) -> None:
+        """Test that the verdict is unset without a KPSS test."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=500)
+        result = tail_id(data, p_m=0.8, p_c1=0.95, gamma=0.95)
+        assert result.kpss is None
+        assert result.id_supported is None
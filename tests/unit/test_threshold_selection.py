@@ -1,12 +1,20 @@
 """Unit tests for threshold selection module."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import numpy as np
 import pytest
 
+from src.instrumentation import Deadline, RunStats
+from src.tracing import TraceSink
 from src.threshold_selection import (
     P_M_MAX,
     P_M_MIN,
+    _approximate_eqmae,
     _compute_eqmae,
+    evaluate_thresholds,
     select_threshold,
 )
 
@@ -112,3 +120,232 @@ class TestSelectThreshold:
         result1 = select_threshold(data, n_candidates=31)
         result2 = select_threshold(data, n_candidates=31)
         assert result1 == result2
+
+
+class TestApproximateEQMAE:
+    """Tests for the approximate (thinned) EQMAE mode."""
+
+    def test_small_sets_are_exact(self):
+        """Test that sets within max_exceedances are scored exactly."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=200)
+        threshold = np.quantile(data, 0.7)
+        eqmae, error = _approximate_eqmae(data, threshold, 100)
+        assert eqmae == _compute_eqmae(data, threshold)
+        assert error == 0.0
+
+    def test_close_to_exact(self):
+        """Test that the thinned EQMAE approximates the exact one."""
+        rng = np.random.default_rng(0)
+        data = rng.exponential(scale=1.0, size=50000)
+        threshold = np.quantile(data, 0.6)
+        exact = _compute_eqmae(data, threshold)
+        eqmae, error = _approximate_eqmae(data, threshold, 2000)
+        assert error > 0
+        assert abs(eqmae - exact) < 10 * error + 0.05
+
+    def test_evaluate_thresholds_exact_by_default(self):
+        """Test that the default selection is exact and matches."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=500)
+        selection = evaluate_thresholds(data, n_candidates=11)
+        assert selection.exact.all()
+        assert selection.p_m_error == 0.0
+        assert selection.p_m == select_threshold(data, n_candidates=11)
+        assert selection.eqmae[
+            list(selection.percentiles).index(selection.p_m)
+        ] == selection.eqmae.min()
+
+    def test_recheck_scores_best_candidates_exactly(self):
+        """Test that rechecked candidates carry their exact EQMAE."""
+        rng = np.random.default_rng(1)
+        data = rng.exponential(scale=1.0, size=20000)
+        approximate = evaluate_thresholds(
+            data, n_candidates=6, max_exceedances=500
+        )
+        assert not approximate.exact.any()
+
+        rechecked = evaluate_thresholds(
+            data, n_candidates=6, max_exceedances=500, recheck=2
+        )
+        assert rechecked.exact.sum() == 2
+        for i in np.flatnonzero(rechecked.exact):
+            threshold = np.quantile(data, rechecked.percentiles[i])
+            # The recheck fit is warm-started, so it agrees with a cold
+            # fit up to the optimizer tolerance.
+            assert rechecked.eqmae[i] == pytest.approx(
+                _compute_eqmae(data, threshold), abs=1e-4
+            )
+            assert rechecked.eqmae_error[i] == 0.0
+
+    def test_p_m_error_covers_competitive_candidates(self):
+        """Test that the estimated error spans candidates within errors."""
+        rng = np.random.default_rng(2)
+        data = rng.exponential(scale=1.0, size=20000)
+        selection = evaluate_thresholds(
+            data, n_candidates=6, max_exceedances=500
+        )
+        best = selection.eqmae.min() + selection.eqmae_error[
+            np.argmin(selection.eqmae)
+        ]
+        competitive = selection.eqmae - selection.eqmae_error <= best
+        assert selection.p_m_error == pytest.approx(
+            np.abs(selection.percentiles[competitive] - selection.p_m).max()
+        )
+
+    def test_invalid_parameters(self):
+        """Test that invalid approximation parameters raise ValueError."""
+        data = np.random.exponential(scale=1.0, size=100)
+        with pytest.raises(ValueError, match="max_exceedances"):
+            select_threshold(data, n_candidates=5, max_exceedances=2)
+        with pytest.raises(ValueError, match="recheck"):
+            select_threshold(data, n_candidates=5, recheck=-1)
+
+
+class TestWarmStart:
+    """Tests for the warm-started threshold sweep."""
+
+    def test_matches_cold_fits(self):
+        """Test that warm starts reproduce the cold-start selection."""
+        rng = np.random.default_rng(3)
+        data = rng.exponential(scale=1.0, size=5000) * rng.choice(
+            [1.0, 2.0], size=5000
+        )
+        warm = evaluate_thresholds(data, n_candidates=16)
+        cold = evaluate_thresholds(data, n_candidates=16, warm_start=False)
+        assert warm.p_m == cold.p_m
+        np.testing.assert_allclose(warm.eqmae, cold.eqmae, rtol=1e-3)
+
+    def test_fewer_optimizer_iterations(self):
+        """Test that warm starts reduce the optimizer iterations."""
+        rng = np.random.default_rng(4)
+        data = rng.exponential(scale=1.0, size=5000)
+        warm_stats, cold_stats = RunStats(), RunStats()
+        evaluate_thresholds(data, n_candidates=16, stats=warm_stats)
+        evaluate_thresholds(
+            data, n_candidates=16, stats=cold_stats, warm_start=False
+        )
+        assert warm_stats.n_fits == cold_stats.n_fits == 16
+        assert (
+            warm_stats.optimizer_iterations < cold_stats.optimizer_iterations
+        )
+
+    def test_failures_are_counted(self):
+        """Test that failed fits are reported and never selected."""
+        data = np.concatenate([np.zeros(80), np.arange(1.0, 21.0)])
+        with patch(
+            "src.threshold_selection.fit_gpd",
+            side_effect=RuntimeError("no convergence"),
+        ):
+            selection = evaluate_thresholds(data, n_candidates=5)
+        assert selection.n_failures == 5
+        assert selection.failed.all()
+        assert np.isinf(selection.eqmae).all()
+
+    def test_non_positive_scale_is_traced(self):
+        """Test that fits with a non-positive scale reach the trace."""
+        data = np.random.default_rng(3).exponential(size=200)
+        sink = TraceSink()
+        with patch(
+            "src.threshold_selection.fit_gpd", return_value=(0.1, 0.0)
+        ):
+            selection = evaluate_thresholds(data, n_candidates=4, trace=sink)
+        assert selection.n_failures == 4
+        assert len(sink.records) == 4
+        assert all(r.eqmae is None for r in sink.records)
+
+
+class TestDeadline:
+    """Tests for deadline-bounded threshold selection."""
+
+    def test_expired_deadline(self):
+        """Test that an expired deadline gives a partial selection."""
+        data = np.random.default_rng(5).exponential(size=2000)
+        selection = evaluate_thresholds(
+            data, n_candidates=8, deadline=Deadline.after(0)
+        )
+        assert selection.partial
+        assert selection.n_scored == 0
+        assert selection.p_m == selection.percentiles[0]
+        assert np.isnan(selection.eqmae).all()
+
+    def test_stops_between_candidates(self):
+        """Test that the best candidate scored in time is selected."""
+        data = np.random.default_rng(5).exponential(size=2000)
+        full = evaluate_thresholds(data, n_candidates=8)
+
+        def slow_progress(done, total):
+            if done == 3:
+                time.sleep(0.6)
+
+        selection = evaluate_thresholds(
+            data,
+            n_candidates=8,
+            progress=slow_progress,
+            deadline=Deadline.after(0.5),
+        )
+        assert selection.partial
+        assert selection.n_scored == 3
+        np.testing.assert_array_equal(selection.eqmae[:3], full.eqmae[:3])
+        assert selection.p_m == full.percentiles[np.argmin(full.eqmae[:3])]
+
+    def test_ample_deadline(self):
+        """Test that a deadline that does not pass changes nothing."""
+        data = np.random.default_rng(5).exponential(size=2000)
+        selection = evaluate_thresholds(
+            data, n_candidates=8, deadline=Deadline.after(600)
+        )
+        full = evaluate_thresholds(data, n_candidates=8)
+        assert not selection.partial
+        assert selection.n_scored == 8
+        np.testing.assert_array_equal(selection.eqmae, full.eqmae)
+
+
+class TestExecutor:
+    """Tests for threshold selection on an executor."""
+
+    def test_matches_inline_sweep(self):
+        """Test that concurrent scoring gives the inline selection."""
+        data = np.random.default_rng(6).exponential(size=3000)
+        inline = evaluate_thresholds(data, n_candidates=10)
+        for workers in (1, 2, 3):
+            stats, trace = RunStats(), TraceSink()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                selection = evaluate_thresholds(
+                    data,
+                    n_candidates=10,
+                    stats=stats,
+                    trace=trace,
+                    executor=executor,
+                )
+            assert selection.p_m == inline.p_m
+            np.testing.assert_array_equal(selection.eqmae, inline.eqmae)
+            assert stats.n_fits == 10
+            assert [r.seq for r in trace.records] == list(range(10))
+            np.testing.assert_array_equal(
+                [r.eqmae for r in trace.records], inline.eqmae
+            )
+
+    def test_one_task_per_chunk(self):
+        """Test that each chunk of candidates is submitted once."""
+        data = np.random.default_rng(7).exponential(size=2000)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with patch.object(
+                executor, "submit", wraps=executor.submit
+            ) as submit:
+                evaluate_thresholds(data, n_candidates=10, executor=executor)
+        # Chunks of 4, 4 and 2 candidates.
+        assert submit.call_count == 3
+
+    def test_expired_deadline(self):
+        """Test that an expired deadline cancels the pending candidates."""
+        data = np.random.default_rng(5).exponential(size=2000)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            selection = evaluate_thresholds(
+                data,
+                n_candidates=8,
+                deadline=Deadline.after(0),
+                executor=executor,
+            )
+        assert selection.partial
+        assert selection.n_scored == 0
@@ -0,0 +1,94 @@
+"""Unit tests for the fit trace sink and summarizer."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.tailid import tail_id
+from src.threshold_selection import select_threshold
+from src.tracing import FitTrace, TraceSink, load_trace, summarize_trace
+
+
+def _record(duration: float, **kwargs) -> FitTrace:
+    """Build a tail_id fit record with the given duration."""
+    return FitTrace(
+        source="tail_id",
+        prefix_size=10,
+        threshold=1.0,
+        duration=duration,
+        **kwargs,
+    )
+
+
+class TestTraceSink:
+    """Tests for the TraceSink ring buffer and writer."""
+
+    def test_ring_buffer_keeps_latest(self) -> None:
+        """Test that the buffer keeps only the latest records."""
+        sink = TraceSink(capacity=3)
+        for i in range(5):
+            sink.record(_record(float(i)))
+        assert [t.seq for t in sink.records] == [2, 3, 4]
+
+    def test_invalid_capacity(self) -> None:
+        """Test that a non-positive capacity is rejected."""
+        with pytest.raises(ValueError, match="capacity must be positive"):
+            TraceSink(capacity=0)
+
+    def test_ndjson_round_trip(self, tmp_path) -> None:
+        """Test that records written to NDJSON can be loaded back."""
+        path = tmp_path / "trace.ndjson"
+        with TraceSink(capacity=2, path=path) as sink:
+            for i in range(4):
+                sink.record(_record(0.1 * i, evi=0.5, accepted=True))
+        records = load_trace(path)
+        assert [t.seq for t in records] == [0, 1, 2, 3]
+        assert records[1].evi == 0.5
+        assert records[1].accepted is True
+
+    def test_non_finite_written_as_null(self, tmp_path) -> None:
+        """Test that infinite CI bounds are written as valid JSON."""
+        path = tmp_path / "trace.ndjson"
+        with TraceSink(path=path) as sink:
+            sink.record(_record(0.1, ci_lower=float("-inf")))
+        line = path.read_text().strip()
+        assert json.loads(line)["ci_lower"] is None
+
+
+class TestSummarizeTrace:
+    """Tests for the trace summarizer."""
+
+    def test_slowest_first(self) -> None:
+        """Test that the slowest fits are listed first."""
+        sink = TraceSink()
+        for duration in [0.1, 0.5, 0.3]:
+            sink.record(_record(duration))
+        summary = summarize_trace(sink.records, top=2)
+        assert [t.duration for t in summary.slowest] == [0.5, 0.3]
+        assert summary.n_fits == {"tail_id": 3}
+
+    def test_trajectory_is_bounded(self) -> None:
+        """Test that long trajectories show only their first and last fits."""
+        sink = TraceSink()
+        for _ in range(30):
+            sink.record(_record(0.1))
+        lines = summarize_trace(sink.records, top=3).format().splitlines()
+        gap = lines.index("    ... 24 fits omitted ...")
+        assert lines[gap - 4].startswith("  EVI/CI trajectory")
+        assert len(lines) == gap + 4
+        short = summarize_trace(sink.records, top=20).format()
+        assert "omitted" not in short
+
+    def test_traced_run(self) -> None:
+        """Test tracing a full threshold selection and TailID run."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=300)
+        sink = TraceSink()
+        p_m = select_threshold(data, n_candidates=4, trace=sink)
+        tail_id(data, p_m=p_m, p_c1=0.95, gamma=0.95, trace=sink)
+        summary = summarize_trace(sink.records)
+        assert summary.n_fits["eqmae"] == 4
+        assert summary.trajectory[0].candidate is None
+        assert all(t.candidate is not None for t in summary.trajectory[1:])
+        assert "Slowest fits" in summary.format()
@@ -0,0 +1,70 @@
+"""Unit tests for the windowed TailID analysis."""
+
+import numpy as np
+import pytest
+
+from src.pipeline import run_analysis
+from src.windowed import iter_windows
+
+
+class TestIterWindows:
+    """Tests for the iter_windows generator."""
+
+    def test_sliding_window_bounds(self) -> None:
+        """Test that sliding windows cover the trace in order."""
+        np.random.seed(42)
+        data = np.random.exponential(scale=1.0, size=500)
+        results = list(
+            iter_windows(
+                data, window=300, step=100, p_c1=0.95, n_candidates=3,
+                gamma=0.95,
+            )
+        )
+        assert [(w.start, w.stop) for w in results] == [
+            (0, 300),
+            (100, 400),
+            (200, 500),
+        ]
+
+    def test_sliding_matches_independent_runs(self) -> None:
+        """Test that sliding windows match analysing each slice."""
+        np.random.seed(1)
+        data = np.random.exponential(scale=1.0, size=400)
+        sliding = list(
+            iter_windows(
+                data, window=300, step=50, p_c1=0.95, n_candidates=3,
+                gamma=0.95,
+            )
+        )
+        tumbling = list(
+            iter_windows(
+                data[100:400], window=300, step=300, p_c1=0.95,
+                n_candidates=3, gamma=0.95,
+            )
+        )
+        assert sliding[2].p_m == tumbling[0].p_m
+        np.testing.assert_array_equal(
+            sliding[2].result.sensitive_points,
+            tumbling[0].result.sensitive_points,
+        )
+        analysis = run_analysis(data[100:400], 0.95, 3, 0.95)
+        assert sliding[2].p_m == analysis.p_m
+        assert sliding[2].result.scenario == analysis.result.scenario
+
+    def test_invalid_window(self) -> None:
+        """Test that a non-positive window is rejected."""
+        with pytest.raises(ValueError, match="window must be positive"):
+            list(
+                iter_windows(
+                    np.ones(10), window=0, step=1, p_c1=0.9, n_candidates=3
+                )
+            )
+
+    def test_invalid_step(self) -> None:
+        """Test that a non-positive step is rejected."""
+        with pytest.raises(ValueError, match="step must be positive"):
+            list(
+                iter_windows(
+                    np.ones(10), window=5, step=0, p_c1=0.9, n_candidates=3
+                )
+            )